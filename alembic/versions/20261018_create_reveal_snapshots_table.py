@@ -0,0 +1,31 @@
+"""create reveal_snapshots table
+
+Revision ID: 20261018_create_reveal_snapshots
+Revises: 20250917_enable_rls
+Create Date: 2026-10-18 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261018_create_reveal_snapshots'
+down_revision = '20250917_enable_rls'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'reveal_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('week_id', sa.Integer(), sa.ForeignKey('weeks.id'), nullable=False, index=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.UniqueConstraint('week_id', 'version', name='uq_reveal_snapshots_week_version'),
+    )
+
+
+def downgrade():
+    op.drop_table('reveal_snapshots')
@@ -0,0 +1,46 @@
+"""create history_matrix_rows table
+
+Revision ID: 20261019_create_history_matrix_rows
+Revises: 20261018_create_reveal_snapshots
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261019_create_history_matrix_rows'
+down_revision = '20261018_create_reveal_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'history_matrix_rows',
+        sa.Column('entry_id', sa.Integer(), sa.ForeignKey('entries.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('season_year', sa.Integer(), nullable=False, index=True),
+        sa.Column('entry_name', sa.String(), nullable=False),
+        sa.Column('picks', sa.JSON(), nullable=False),
+        sa.Column('pick_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    # Backfill one row per existing entry; reads never fall back to `picks`. Later repairs go
+    # through scripts/rebuild_history_matrix.py
+    if op.get_bind().dialect.name == 'postgresql':
+        picks_agg, empty = "json_object_agg(week_id::text, team_id)", "'{}'::json"
+    else:
+        picks_agg, empty = "json_group_object(CAST(week_id AS TEXT), team_id)", "'{}'"
+    op.execute(
+        f"""
+        INSERT INTO history_matrix_rows (entry_id, season_year, entry_name, picks, pick_count, version)
+        SELECT e.id, e.season_year, e.name, COALESCE(agg.picks, {empty}), COALESCE(agg.pick_count, 0), 0
+        FROM entries e LEFT JOIN (
+            SELECT entry_id, {picks_agg} AS picks, COUNT(*) AS pick_count
+            FROM picks GROUP BY entry_id
+        ) agg ON agg.entry_id = e.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('history_matrix_rows')
@@ -0,0 +1,44 @@
+"""create used_teams table
+
+Revision ID: 20261020_create_used_teams
+Revises: 20261019_create_history_matrix_rows
+Create Date: 2026-10-20 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261020_create_used_teams'
+down_revision = '20261019_create_history_matrix_rows'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'used_teams',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('season_year', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), sa.ForeignKey('teams.id'), nullable=False),
+        sa.Column('pick_id', sa.Integer(), sa.ForeignKey('picks.id', ondelete='CASCADE'), nullable=False, unique=True),
+        sa.Column('entry_id', sa.Integer(), sa.ForeignKey('entries.id', ondelete='CASCADE'), nullable=False, index=True),
+        sa.Column('week_id', sa.Integer(), sa.ForeignKey('weeks.id'), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'season_year', 'team_id', name='pk_used_teams'),
+    )
+    # Backfill from existing picks; if legacy data repeats a team, the earliest pick holds it
+    op.execute(
+        """
+        INSERT INTO used_teams (user_id, season_year, team_id, pick_id, entry_id, week_id)
+        SELECT e.user_id, e.season_year, p.team_id, p.id, p.entry_id, p.week_id
+        FROM picks p JOIN entries e ON e.id = p.entry_id
+        WHERE p.id IN (
+            SELECT MIN(p2.id) FROM picks p2 JOIN entries e2 ON e2.id = p2.entry_id
+            WHERE p2.team_id IS NOT NULL
+            GROUP BY e2.user_id, e2.season_year, p2.team_id
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('used_teams')
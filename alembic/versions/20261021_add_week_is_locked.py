@@ -0,0 +1,24 @@
+"""add weeks.is_locked
+
+Revision ID: 20261021_add_week_is_locked
+Revises: 20261020_create_used_teams
+Create Date: 2026-10-21 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261021_add_week_is_locked'
+down_revision = '20261020_create_used_teams'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('weeks', sa.Column('is_locked', sa.Boolean(), nullable=False, server_default=sa.false()))
+    # Weeks already past their lock time are locked; the cutover picks up the rest as they pass
+    op.execute("UPDATE weeks SET is_locked = true WHERE lock_time IS NOT NULL AND lock_time <= CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    op.drop_column('weeks', 'is_locked')
@@ -0,0 +1,42 @@
+"""create import_files / import_chunks ledger tables
+
+Revision ID: 20261022_create_import_ledger
+Revises: 20261021_add_week_is_locked
+Create Date: 2026-10-22 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261022_create_import_ledger'
+down_revision = '20261021_add_week_is_locked'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'import_files',
+        sa.Column('source', sa.String(), primary_key=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(), nullable=True),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='running'),
+        sa.Column('records', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+    )
+    op.create_table(
+        'import_chunks',
+        sa.Column('source', sa.String(), sa.ForeignKey('import_files.source', ondelete='CASCADE'), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False),
+        sa.Column('chunk_hash', sa.String(), nullable=False),
+        sa.Column('records', sa.Integer(), nullable=False),
+        sa.Column('applied_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('source', 'chunk_index', name='pk_import_chunks'),
+    )
+
+
+def downgrade():
+    op.drop_table('import_chunks')
+    op.drop_table('import_files')
@@ -0,0 +1,38 @@
+"""create history_matrix_clock and index history_matrix_rows (season_year, version)
+
+Revision ID: 20261023_history_matrix_clock
+Revises: 20261022_create_import_ledger
+Create Date: 2026-10-23 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '20261023_history_matrix_clock'
+down_revision = '20261022_create_import_ledger'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'history_matrix_clock',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+    # Row versions used to be pick timestamps (microseconds); continue above them so versions
+    # clients already hold stay ordered before every new change. Only SQLite uses the clock
+    op.execute(
+        "INSERT INTO history_matrix_clock (id, version) "
+        "SELECT 1, COALESCE(MAX(version), 0) FROM history_matrix_rows"
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        # Postgres stamps transaction ids, far below those timestamps. Clients holding one are
+        # ahead of the new watermark, which makes their next delta a full resend
+        op.execute("UPDATE history_matrix_rows SET version = 0")
+    op.create_index('ix_history_matrix_rows_season_version', 'history_matrix_rows', ['season_year', 'version'])
+
+
+def downgrade():
+    op.drop_index('ix_history_matrix_rows_season_version', table_name='history_matrix_rows')
+    op.drop_table('history_matrix_clock')
@@ -6,6 +6,21 @@ from pydantic import ConfigDict
 class Settings(BaseSettings):
     ENV: str = "development"
     DATABASE_URL: Optional[str] = None
+    # Optional read replica for public read endpoints (see get_read_db in app/db.py); unset reads the primary
+    DATABASE_READ_URL: Optional[str] = None
+    # Engine / connection pool (see app/db.py). Pool sizing doesn't apply to in-memory SQLite.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # wait for a free connection before raising
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # replace connections older than this; -1 disables
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout so server-side drops don't surface as errors
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres statement_timeout per connection; 0 keeps the server default
+    DB_SQLITE_JOURNAL_MODE: str = "WAL"  # file databases only; "" leaves the file's mode alone
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Async routes run services on an aiosqlite/asyncpg AsyncSession; False serves them from sync
+    # sessions in the threadpool instead
+    ASYNC_DB_ENABLED: bool = True
     SUPABASE_URL: Optional[str] = None
     SUPABASE_SERVICE_KEY: Optional[str] = None
     JWT_SECRET: str = "change-me"
@@ -21,6 +36,32 @@ class Settings(BaseSettings):
     MAIL_FROM: Optional[str] = None
     # Reply-To header for broadcasts
     BROADCAST_REPLY_TO: Optional[str] = None
+    # Authenticated user resolution (see app/services/principals.py)
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0  # 0 disables the principal cache
+    AUTH_TOKEN_CLAIMS: bool = False  # embed email/is_active/is_admin in tokens for stateless checks
+    # Shared cache backend (see app/services/cache.py): "memory", "sqlite" (CACHE_URL = file path)
+    # or "redis" (CACHE_URL = redis://...). Use sqlite/redis to share invalidations across workers.
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: Optional[str] = None
+    CURRENT_WEEK_CACHE_TTL_SECONDS: float = 300.0
+    # Per-user /api/dashboard cache (see app/services/dashboard.py); 0 disables it
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30.0
+    # Password hashing (see app/services/password_hashing.py)
+    BCRYPT_ROUNDS: int = 12  # changing this rehashes passwords on next successful login
+    PASSWORD_HASH_EXECUTOR: str = "process"  # "process" or "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # jobs admitted at once; beyond this requests get 429
+    # Background ESPN polling of the current week (see app/services/sync_scheduler.py)
+    ESPN_POLL_ENABLED: bool = False
+    ESPN_POLL_FAST_SECONDS: int = 30  # while a game window is open
+    ESPN_POLL_SLOW_SECONDS: int = 900  # between game windows (weekdays)
+    ESPN_POLL_IDLE_SECONDS: int = 3600  # once every game of the week is final
+    ESPN_POLL_MAX_BACKOFF_SECONDS: int = 900
+    # Processes transforming ESPN payloads for /internal/sync-games/backfill (see app/services/backfill.py)
+    BACKFILL_TRANSFORM_WORKERS: int = 2
+    # Lock-time cutover (see app/services/lock_cutover.py)
+    LOCK_CUTOVER_ENABLED: bool = True
+    LOCK_CUTOVER_MAX_SLEEP_SECONDS: float = 60.0  # upper bound on noticing lock times edited elsewhere
 
     # Use ConfigDict for pydantic v2 settings; ignore extra env vars and load .env
     model_config = ConfigDict(env_file=".env", extra="ignore")
@@ -1,33 +1,166 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from app.core.config import settings
+import inspect
+from contextlib import asynccontextmanager
 import os
-from typing import Generator
+import threading
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, Generator, Optional, TypeVar
 
 
 # Lazy engine/session handling: tests may set DATABASE_URL at runtime via environment vars.
 # We keep a proxy engine object and recreate the real engine + sessionmaker when the
-# configured DATABASE_URL changes.
+# configured DATABASE_URL changes. The URL is resolved once per value of the DATABASE_URL
+# environment variable (the settings/.env fallback is read once), so the per-session check is a
+# single dict lookup.
+#
+# Pool and connection tuning comes from the DB_* settings:
+# - QueuePool sizing, pre-ping and recycle for every file/server database (in-memory SQLite
+#   keeps SQLAlchemy's single-connection pool),
+# - Postgres: per-connection statement_timeout,
+# - SQLite: journal_mode / synchronous / busy_timeout pragmas on each new connection.
+#
+# Async routes use `get_async_db`, which yields an `AsyncDB`: the same sync service functions,
+# run with `AsyncSession.run_sync` on an aiosqlite/asyncpg engine built from the same URL and
+# settings, so they never occupy a threadpool worker.
+#
+# DATABASE_READ_URL optionally points at a read replica. Public read endpoints take
+# `get_async_read_db` / `get_read_db`, which serve them from the replica (same pool settings,
+# connections opened read-only) and fall back to the primary when it isn't configured. Replica
+# sessions carry `info["read_only"]`; service paths that would have to write (building a missing
+# reveal snapshot) call `require_primary`, and the AsyncDB handle re-runs them on the primary.
 
 _engine = None
 _engine_url = None
 _SessionLocal = None
+_env_url: Optional[str] = None
+_lock = threading.Lock()
+
+_DEFAULT_URL = "sqlite:///./dev.db"
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    path = database_url.split("///", 1)[1] if "///" in database_url else ""
+    return database_url.startswith("sqlite") and (path in ("", ":memory:") or "mode=memory" in path)
+
+
+def _engine_kwargs(database_url: str) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if database_url.startswith("sqlite"):
+        kwargs["connect_args"] = {"check_same_thread": False}
+        if _is_memory_sqlite(database_url):
+            return kwargs
+    kwargs.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    return kwargs
+
+
+T = TypeVar("T")
+
+
+class _PoolStats:
+    """Checkout/checkin counters fed by pool events; read through `pool_stats()`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0, "checked_out": 0, "peak_checked_out": 0}
+
+    def bump(self, key: str, delta: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += delta
+            if key == "checkouts":
+                self.counts["checked_out"] += delta
+                self.counts["peak_checked_out"] = max(self.counts["peak_checked_out"], self.counts["checked_out"])
+            elif key == "checkins":
+                self.counts["checked_out"] -= delta
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+_pool_stats = _PoolStats()
+_async_pool_stats = _PoolStats()
+
+
+def _install_listeners(eng, database_url: str, stats: _PoolStats = _pool_stats, read_only: bool = False) -> None:
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_conn, _record):
+        stats.bump("connects")
+        cur = dbapi_conn.cursor()
+        try:
+            if database_url.startswith("sqlite"):
+                if not _is_memory_sqlite(database_url) and settings.DB_SQLITE_JOURNAL_MODE:
+                    cur.execute(f"PRAGMA journal_mode={settings.DB_SQLITE_JOURNAL_MODE}")
+                if settings.DB_SQLITE_SYNCHRONOUS:
+                    cur.execute(f"PRAGMA synchronous={settings.DB_SQLITE_SYNCHRONOUS}")
+                cur.execute(f"PRAGMA busy_timeout={int(settings.DB_SQLITE_BUSY_TIMEOUT_MS)}")
+                if read_only:
+                    cur.execute("PRAGMA query_only=1")
+            elif database_url.startswith("postgres"):
+                if settings.DB_STATEMENT_TIMEOUT_MS:
+                    cur.execute(f"SET statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}")
+                if read_only:
+                    cur.execute("SET default_transaction_read_only = on")
+        finally:
+            cur.close()
+
+    @event.listens_for(eng, "checkout")
+    def _on_checkout(*_args):
+        stats.bump("checkouts")
+
+    @event.listens_for(eng, "checkin")
+    def _on_checkin(*_args):
+        stats.bump("checkins")
+
+    @event.listens_for(eng, "invalidate")
+    def _on_invalidate(*_args):
+        stats.bump("invalidations")
 
 
 def _create_engine_and_session(database_url: str):
-    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-    eng = create_engine(database_url, connect_args=connect_args)
+    eng = create_engine(database_url, **_engine_kwargs(database_url))
+    _install_listeners(eng, database_url)
     Sess = sessionmaker(autocommit=False, autoflush=False, bind=eng)
     return eng, Sess
 
 
-def _ensure_engine():
-    global _engine, _engine_url, _SessionLocal
+def _resolve_url(env_url: Optional[str]) -> str:
     # Prefer environment variable if present, otherwise use settings (which reads .env)
-    configured = os.environ.get("DATABASE_URL") or settings.DATABASE_URL or f"sqlite:///./dev.db"
-    if _engine is None or configured != _engine_url:
-        _engine, _SessionLocal = _create_engine_and_session(configured)
-        _engine_url = configured
+    return env_url or settings.DATABASE_URL or _DEFAULT_URL
+
+
+def _ensure_engine():
+    global _engine, _engine_url, _SessionLocal, _env_url
+    env_url = os.environ.get("DATABASE_URL")
+    if _engine is not None and env_url == _env_url:
+        return
+    with _lock:
+        configured = _resolve_url(env_url)
+        if _engine is None or configured != _engine_url:
+            old = _engine
+            _engine, _SessionLocal = _create_engine_and_session(configured)
+            _engine_url = configured
+            if old is not None:
+                # Sessions still holding the old engine's connections return them on close
+                old.dispose(close=False)
+        _env_url = env_url
+
+
+def init_engine() -> None:
+    """Resolve the URL and build the engine now (app startup) instead of on the first request."""
+    _ensure_engine()
 
 
 class _EngineProxy:
@@ -53,3 +186,245 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# -- read replica ----------------------------------------------------------------------------
+
+_read_engine = None
+_read_engine_url: Optional[str] = None
+_ReadSessionLocal = None
+_read_env_url: Optional[str] = None
+_read_resolved = False
+_read_pool_stats = _PoolStats()
+
+
+class PrimaryRequired(RuntimeError):
+    """A read-only (replica) session reached a path that has to write; retry it on the primary."""
+
+
+def require_primary(db, reason: str) -> None:
+    """Raise `PrimaryRequired` if `db` is a replica session, before the caller writes."""
+    if db.info.get("read_only"):
+        raise PrimaryRequired(reason)
+
+
+def _ensure_read_engine() -> bool:
+    """Build the replica engine for DATABASE_READ_URL; returns False when none is configured."""
+    global _read_engine, _read_engine_url, _ReadSessionLocal, _read_env_url, _read_resolved
+    env_url = os.environ.get("DATABASE_READ_URL")
+    if _read_resolved and env_url == _read_env_url:
+        return _read_engine is not None
+    with _lock:
+        configured = env_url or settings.DATABASE_READ_URL or None
+        if configured != _read_engine_url:
+            old = _read_engine
+            _read_engine, _ReadSessionLocal = None, None
+            if configured:
+                _read_engine = create_engine(configured, **_engine_kwargs(configured))
+                _install_listeners(_read_engine, configured, _read_pool_stats, read_only=True)
+                _ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_read_engine, info={"read_only": True})
+            _read_engine_url = configured
+            if old is not None:
+                old.dispose(close=False)
+        _read_env_url, _read_resolved = env_url, True
+    return _read_engine is not None
+
+
+def read_replica_configured() -> bool:
+    return _ensure_read_engine()
+
+
+def get_read_db() -> Generator:
+    """Session for read-only endpoints: the replica if DATABASE_READ_URL is set, else the primary.
+
+    Replica sessions raise `PrimaryRequired` where a service would write; sync callers retry
+    those with `get_db` (`get_async_read_db` does it for them).
+    """
+    if not _ensure_read_engine():
+        yield from get_db()
+        return
+    db = _ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _describe_pool(eng, counters: _PoolStats) -> Dict[str, Any]:
+    pool = eng.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__, "dialect": eng.dialect.name, **counters.snapshot()}
+    # QueuePool exposes live occupancy; the single-connection pools used for in-memory SQLite don't
+    for name in ("size", "checkedin", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            stats[f"pool_{name}"] = fn()
+    if hasattr(pool, "_max_overflow"):
+        stats["max_overflow"] = pool._max_overflow
+    return stats
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Pool configuration and checkout counters for the internal metrics endpoint."""
+    _ensure_engine()
+    stats = _describe_pool(_engine, _pool_stats)
+    if _async_engine is not None:
+        stats["async"] = _describe_pool(_async_engine.sync_engine, _async_pool_stats)
+    if _ensure_read_engine():
+        stats["read"] = _describe_pool(_read_engine, _read_pool_stats)
+        if _async_read_engine is not None:
+            stats["read_async"] = _describe_pool(_async_read_engine.sync_engine, _async_read_pool_stats)
+    return stats
+
+
+# -- async sessions --------------------------------------------------------------------------
+
+_async_engine = None
+_async_engine_url = None
+_AsyncSessionLocal = None
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_database_url(database_url: str) -> str:
+    """Swap the driver of a sync URL for its async counterpart (aiosqlite / asyncpg)."""
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _build_async_engine(database_url: str, stats: _PoolStats, read_only: bool = False):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    kwargs = _engine_kwargs(database_url)
+    if database_url.startswith("sqlite"):
+        kwargs.pop("connect_args", None)
+    eng = create_async_engine(async_database_url(database_url), **kwargs)
+    _install_listeners(eng.sync_engine, database_url, stats, read_only=read_only)
+    # expire_on_commit=False: services return ORM rows that outlive their commit
+    return eng, async_sessionmaker(eng, autoflush=False, expire_on_commit=False, info={"read_only": read_only})
+
+
+def _ensure_async_engine():
+    global _async_engine, _async_engine_url, _AsyncSessionLocal
+    _ensure_engine()
+    if _async_engine is not None and _async_engine_url == _engine_url:
+        return
+    with _lock:
+        if _async_engine is None or _async_engine_url != _engine_url:
+            _async_engine, _AsyncSessionLocal = _build_async_engine(_engine_url, _async_pool_stats)
+            _async_engine_url = _engine_url
+
+
+_async_read_engine = None
+_async_read_engine_url = None
+_AsyncReadSessionLocal = None
+_async_read_pool_stats = _PoolStats()
+
+
+def _ensure_async_read_engine():
+    global _async_read_engine, _async_read_engine_url, _AsyncReadSessionLocal
+    _ensure_read_engine()
+    if _async_read_engine is not None and _async_read_engine_url == _read_engine_url:
+        return
+    with _lock:
+        if _async_read_engine is None or _async_read_engine_url != _read_engine_url:
+            _async_read_engine, _AsyncReadSessionLocal = _build_async_engine(_read_engine_url, _async_read_pool_stats, read_only=True)
+            _async_read_engine_url = _read_engine_url
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_engine_url, _async_read_engine, _async_read_engine_url
+    engines = (_async_engine, _async_read_engine)
+    _async_engine, _async_engine_url, _async_read_engine, _async_read_engine_url = None, None, None, None
+    for eng in engines:
+        if eng is not None:
+            await eng.dispose()
+
+
+class AsyncDB:
+    """Database handle for async routes: `await db.run(service_fn, *args)`.
+
+    Backed by an `AsyncSession` (the function runs on its greenlet-adapted sync session, in the
+    event loop) or, when `get_db` is overridden or `ASYNC_DB_ENABLED` is off, by a plain sync
+    `Session` (the function runs in the threadpool, as sync routes do). Replica handles carry the
+    `primary` handle that calls raising `PrimaryRequired` are re-run on.
+    """
+
+    def __init__(self, async_session=None, sync_session=None, primary: Optional["AsyncDB"] = None):
+        self.async_session = async_session
+        self.sync_session = sync_session
+        self.primary = primary
+
+    @property
+    def bind_key(self) -> str:
+        """URL of the sync engine this handle reads, as services key per-database caches."""
+        if self.sync_session is not None:
+            return str(self.sync_session.get_bind().url)
+        if self.async_session.sync_session.info.get("read_only"):
+            return str(_read_engine.url)
+        return str(_engine.url)
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self.async_session is not None:
+            return await self.async_session.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        try:
+            return await self._run(fn, *args, **kwargs)
+        except PrimaryRequired:
+            if self.primary is None:
+                raise
+        if self.async_session is not None:
+            await self.async_session.rollback()
+        else:
+            await run_in_threadpool(self.sync_session.rollback)
+        return await self.primary.run(fn, *args, **kwargs)
+
+
+@asynccontextmanager
+async def _sync_handle(factory: Callable) -> AsyncIterator[AsyncDB]:
+    source = factory()
+    session = next(source) if inspect.isgenerator(source) else source
+    try:
+        yield AsyncDB(sync_session=session)
+    finally:
+        if inspect.isgenerator(source):
+            await run_in_threadpool(source.close)
+
+
+@asynccontextmanager
+async def _primary_handle(request: Request) -> AsyncIterator[AsyncDB]:
+    override = request.app.dependency_overrides.get(get_db)
+    if override is not None or not settings.ASYNC_DB_ENABLED:
+        # Tests bind get_db to their own engine; serve async routes from the same session
+        async with _sync_handle(override or get_db) as db:
+            yield db
+        return
+    _ensure_async_engine()
+    async with _AsyncSessionLocal() as session:
+        yield AsyncDB(async_session=session)
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncDB, None]:
+    async with _primary_handle(request) as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncDB, None]:
+    """`get_async_db` for read-only endpoints: served from the replica when one is configured
+    (or `get_read_db` is overridden), falling back to the primary per call and when there is none."""
+    read_override = request.app.dependency_overrides.get(get_read_db)
+    async with _primary_handle(request) as primary:
+        if read_override is None and not _ensure_read_engine():
+            yield primary
+        elif read_override is not None or primary.async_session is None:
+            async with _sync_handle(read_override or get_read_db) as replica:
+                replica.primary = primary
+                yield replica
+        else:
+            _ensure_async_read_engine()
+            async with _AsyncReadSessionLocal() as session:
+                yield AsyncDB(async_session=session, primary=primary)
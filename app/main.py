@@ -1,5 +1,10 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.core.config import settings
+from app.db import dispose_async_engine, engine, init_engine
+
 from app.routes import auth as auth_router
 from app.routes import password_reset as password_reset_router
 from app.routes import weeks as weeks_router
@@ -11,9 +16,32 @@ from app.routes import public as public_router
 from app.routes import dashboard as dashboard_router
 from app.routes import admin as admin_router
 from app.routes import history as history_router
+from app.routes import internal_metrics as internal_metrics_router
+from app.services.sync_scheduler import espn_poll_scheduler
+from app.services.lock_cutover import lock_cutover_scheduler
+from app.services.password_hashing import shutdown_password_pool
+from app.services.backfill import shutdown_transform_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve DATABASE_URL and build the pool up front so misconfiguration fails at startup
+    init_engine()
+    # Background ESPN polling is opt-in so tests and one-off processes never hit the network
+    if settings.ESPN_POLL_ENABLED:
+        espn_poll_scheduler.start()
+    if settings.LOCK_CUTOVER_ENABLED:
+        lock_cutover_scheduler.start()
+    yield
+    await lock_cutover_scheduler.stop()
+    await espn_poll_scheduler.stop()
+    shutdown_password_pool()
+    shutdown_transform_pool()
+    await dispose_async_engine()
+    engine.dispose()
 
 
-app = FastAPI(title="Tears 2025 API")
+app = FastAPI(title="Tears 2025 API", lifespan=lifespan)
 
 
 @app.get("/api/health")
@@ -33,6 +61,7 @@ app.include_router(public_router.router)
 app.include_router(dashboard_router.router)
 app.include_router(admin_router.router)
 app.include_router(history_router.router)
+app.include_router(internal_metrics_router.router)
 
 
 if __name__ == "__main__":
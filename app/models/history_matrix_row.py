@@ -0,0 +1,42 @@
+from sqlalchemy import DDL, BigInteger, Column, Index, Integer, String, ForeignKey, JSON, event
+from app.models.base import Base
+
+
+class HistoryMatrixRow(Base):
+    """Maintained copy of one entry's row in the season history matrix.
+
+    Written by the pick/entry services (see app/services/history_matrix.py) so the history
+    endpoints read one row per entry instead of aggregating `picks` on every request.
+    """
+
+    __tablename__ = "history_matrix_rows"
+
+    entry_id = Column(Integer, ForeignKey("entries.id", ondelete="CASCADE"), primary_key=True)
+    season_year = Column(Integer, nullable=False, index=True)
+    entry_name = Column(String, nullable=False)
+    # {str(week_id): team_id}; JSON object keys are strings
+    picks = Column(JSON, nullable=False, default=dict)
+    # number of pick rows folded in (including picks with no team)
+    pick_count = Column(Integer, nullable=False, default=0)
+    # `next_version` of the last transaction that changed this row's picks
+    version = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_history_matrix_rows_season_version", "season_year", "version"),)
+
+
+class HistoryMatrixClock(Base):
+    """Single-row counter behind the history matrix `version` on SQLite.
+
+    Writers bump it inside their own transaction. SQLite already serializes writers, so a later
+    version always commits after every earlier one. Postgres uses transaction ids instead and
+    never touches this row (see app/services/history_matrix.py).
+    """
+
+    __tablename__ = "history_matrix_clock"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# The migration seeds the row too; this covers schemas built with metadata.create_all
+event.listen(HistoryMatrixClock.__table__, "after_create", DDL("INSERT INTO history_matrix_clock (id, version) VALUES (1, 0)"))
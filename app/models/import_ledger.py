@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, PrimaryKeyConstraint
+from app.models.base import Base
+import datetime as _dt
+
+
+class ImportFile(Base):
+    """Ledger row per legacy export source (`gs://...`, `file://...` or blob name).
+
+    `fingerprint` is the content hash of the last fully imported version; a re-run that sees the
+    same fingerprint skips the file without reading it. See app/services/import_ledger.py.
+    """
+
+    __tablename__ = "import_files"
+
+    source = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    # set only once every chunk has been applied
+    fingerprint = Column(String, nullable=True)
+    # chunk hashes are only comparable between runs with the same chunk size
+    chunk_size = Column(Integer, nullable=False)
+    # running | completed | incomplete (finished with unresolved references; imported again next run)
+    status = Column(String, nullable=False, default="running")
+    records = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, default=lambda: _dt.datetime.now(_dt.timezone.utc))
+    completed_at = Column(DateTime, nullable=True)
+
+
+class ImportChunk(Base):
+    """One applied chunk of an import file, committed in the same transaction as its rows."""
+
+    __tablename__ = "import_chunks"
+    __table_args__ = (PrimaryKeyConstraint("source", "chunk_index", name="pk_import_chunks"),)
+
+    source = Column(String, ForeignKey("import_files.source", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    chunk_hash = Column(String, nullable=False)
+    records = Column(Integer, nullable=False)
+    applied_at = Column(DateTime, default=lambda: _dt.datetime.now(_dt.timezone.utc))
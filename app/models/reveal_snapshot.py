@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, JSON, UniqueConstraint
+from app.models.base import Base
+import datetime as _dt
+
+
+class RevealSnapshot(Base):
+    __tablename__ = "reveal_snapshots"
+    # One row per materialized version of a week's reveal payload
+    __table_args__ = (UniqueConstraint('week_id', 'version', name='uq_reveal_snapshots_week_version'),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False, index=True)
+    # monotonically increasing per week; a new version is written only when the payload changes
+    version = Column(Integer, nullable=False)
+    # content hash of the payload, served as the HTTP ETag
+    etag = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: _dt.datetime.now(_dt.timezone.utc))
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, PrimaryKeyConstraint
+from app.models.base import Base
+
+
+class UsedTeam(Base):
+    """One row per team a user has already picked in a season.
+
+    The primary key is the season-repeat rule itself, so eligibility is a key lookup and a
+    concurrent double-use fails at insert. Maintained by the pick services (see
+    app/services/used_teams.py).
+    """
+
+    __tablename__ = "used_teams"
+    __table_args__ = (PrimaryKeyConstraint("user_id", "season_year", "team_id", name="pk_used_teams"),)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    season_year = Column(Integer, nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    # the pick holding the team, so re-pointing or deleting it releases the row
+    pick_id = Column(Integer, ForeignKey("picks.id", ondelete="CASCADE"), nullable=False, unique=True)
+    entry_id = Column(Integer, ForeignKey("entries.id", ondelete="CASCADE"), nullable=False, index=True)
+    week_id = Column(Integer, ForeignKey("weeks.id"), nullable=False)
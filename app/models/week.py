@@ -12,6 +12,8 @@ class Week(Base):
     week_number = Column(Integer, nullable=False)
     is_current = Column(Boolean, default=False)
     lock_time = Column(DateTime, nullable=True)
+    # set by the lock cutover once lock_time passes (see app/services/lock_cutover.py)
+    is_locked = Column(Boolean, nullable=False, default=False)
     # Use JSON column so SQLAlchemy maps to Python lists/dicts automatically
     ineligible_teams = Column(JSON, nullable=True)
     locked_games = Column(JSON, nullable=True)
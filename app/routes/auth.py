@@ -1,37 +1,89 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.schemas.auth import UserCreate, UserOut, Token
 from app.models.user import User
-from app.db import get_db
+from app.db import AsyncDB, get_async_db, get_db
 from app.utils import security
+from app.core.config import settings
+from app.services import principals
+from app.services import password_hashing
 from pydantic import EmailStr
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=UserOut)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    # simple uniqueness check
-    exists = db.query(User).filter(User.email == user_in.email).first()
-    if exists:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    user = User(email=user_in.email, hashed_password=security.get_password_hash(user_in.password))
+def hashing_busy_error() -> HTTPException:
+    """429 returned when the password hashing pool sheds load."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _create_user(db: Session, email: str, hashed_password: str) -> User:
+    user = User(email=email, hashed_password=hashed_password)
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
 
+def _store_rehash(db: Session, user: User, new_hash: str) -> None:
+    user.hashed_password = new_hash
+    db.commit()
+
+
+# Auth routes are async so bcrypt runs on the bounded hashing pool rather than tying up a
+# request thread; their short DB calls still go through the threadpool.
+@router.post("/register", response_model=UserOut)
+async def register(user_in: UserCreate, db: Session = Depends(get_db)):
+    # simple uniqueness check
+    exists = await run_in_threadpool(lambda: db.query(User).filter(User.email == user_in.email).first())
+    if exists:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    try:
+        hashed = await password_hashing.hash_password(user_in.password)
+    except password_hashing.PasswordHashBusyError:
+        raise hashing_busy_error()
+    return await run_in_threadpool(_create_user, db, user_in.email, hashed)
+
+
 @router.post("/login", response_model=Token)
-def login(form_data: UserCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.email).first()
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login(form_data: UserCreate, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == form_data.email).first())
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    token = security.create_access_token(subject=str(user.id))
+    try:
+        valid, new_hash = await password_hashing.verify_and_update_password(form_data.password, user.hashed_password)
+    except password_hashing.PasswordHashBusyError:
+        raise hashing_busy_error()
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash used a different bcrypt cost than BCRYPT_ROUNDS; migrate it transparently
+        await run_in_threadpool(_store_rehash, db, user, new_hash)
+    claims = principals.token_claims(user) if settings.AUTH_TOKEN_CLAIMS else None
+    token = security.create_access_token(subject=str(user.id), claims=claims)
     return {"access_token": token, "token_type": "bearer"}
 
 
-def get_current_user(credentials: "HTTPAuthorizationCredentials" = Depends(__import__("fastapi").security.HTTPBearer()), db: Session = Depends(get_db)):
+def _resolve_principal(db: Session, db_key: str, user_id: int):
+    # Runs through db.run so shared-cache I/O stays off the event loop; the session is lazy,
+    # so a cache hit never checks out a connection
+    principal = principals.get_cached_principal(db_key, user_id)
+    if principal is not None:
+        return principal
+    user = db.get(User, user_id)
+    if user is None:
+        return None
+    principal = principals.principal_from_user(user)
+    principals.cache_principal(db_key, principal)
+    return principal
+
+
+async def get_current_user(credentials: "HTTPAuthorizationCredentials" = Depends(__import__("fastapi").security.HTTPBearer()), db: AsyncDB = Depends(get_async_db)):
     # credentials is provided by HTTPBearer() dependency and contains the token in `.credentials`
     from fastapi.security import HTTPAuthorizationCredentials
 
@@ -41,10 +93,13 @@ def get_current_user(credentials: "HTTPAuthorizationCredentials" = Depends(__imp
     payload = security.decode_token(creds.credentials)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = db.get(User, int(payload["sub"]))
-    if not user:
+    principal = principals.principal_from_claims(payload)
+    if principal is not None:
+        return principal
+    principal = await db.run(_resolve_principal, db.bind_key, int(payload["sub"]))
+    if principal is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    return principal
 
 
 @router.get("/me", response_model=UserOut)
@@ -1,35 +1,27 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from typing import List
 
-from app.db import get_db
+from app.db import AsyncDB, get_async_db
 from app.routes.auth import get_current_user
-from app.services.dashboard import get_entries_for_user, get_current_week_info, get_picks_for_entries
+from app.services.dashboard import get_dashboard_data
 from app.schemas.dashboard import DashboardResponse, EntrySummary, EntryPick, CurrentWeekInfo
 
 router = APIRouter(prefix="/api", tags=["dashboard"])
 
 
 @router.get("/dashboard", response_model=DashboardResponse)
-def get_dashboard(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def get_dashboard(db: AsyncDB = Depends(get_async_db), current_user=Depends(get_current_user)):
     user = current_user
     user_id = getattr(user, "id")
 
-    entries = get_entries_for_user(db, user_id)
-    entry_ids = [e["id"] for e in entries]
-
-    week_info = get_current_week_info(db)
-    picks_map = {}
-    if week_info and week_info.get("week_id"):
-        picks_map = get_picks_for_entries(db, entry_ids, week_info["week_id"]) if entry_ids else {}
+    data = await db.run(get_dashboard_data, user_id)
+    week_info = data["current_week"]
 
     # Build EntrySummary objects
     entries_out: List[EntrySummary] = []
-    for e in entries:
-        pick = None
-        if picks_map and e["id"] in picks_map and picks_map[e["id"]] is not None:
-            p = picks_map[e["id"]]
-            pick = EntryPick(team_id=p.get("team_id"), team_abbr=p.get("team_abbr"), team_name=p.get("team_name"))
+    for e in data["entries"]:
+        p = e["current_pick"]
+        pick = EntryPick(team_id=p["team_id"], team_abbr=p["team_abbr"], team_name=p["team_name"]) if p else None
         entries_out.append(EntrySummary(id=e["id"], name=e["name"], is_eliminated=e["is_eliminated"], current_pick=pick))
 
     current_week_obj = None
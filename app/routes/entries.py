@@ -3,6 +3,7 @@ from typing import Any
 from app.db import get_db
 from sqlalchemy.orm import Session
 from app.services.entries import create_entry, get_entries_for_user, update_entry, delete_entry, EntryNameConflict
+from app.services.used_teams import get_entry_eligibility
 from app.routes.auth import get_current_user
 from pydantic import BaseModel
 
@@ -37,6 +38,15 @@ def list_user_entries(user_id: int, db: Session = Depends(get_db)):
     return [{"id": e.id, "week_id": e.week_id, "picks": e.picks} for e in entries]
 
 
+@router.get("/api/entries/{entry_id}/eligibility")
+def entry_eligibility(entry_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    """Every team with `eligible` / `reason` for this entry's week, for rendering the pick grid."""
+    result = get_entry_eligibility(db, current_user.id, entry_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return result
+
+
 @router.patch("/api/entries/{entry_id}")
 def patch_entry(entry_id: int, payload: EntryUpdateSchema, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     try:
@@ -1,14 +1,43 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.services.history import get_history_matrix
-from app.schemas.history_matrix import HistoryMatrixResponse
+from typing import Literal, Optional, Union
+
+from fastapi import APIRouter, Depends, Query
+from app.db import AsyncDB, get_async_read_db
+from app.services.history import MAX_PAGE_SIZE, get_history_delta, get_history_matrix, get_history_page
+from app.schemas.history_matrix import (
+    HistoryMatrixColumnar,
+    HistoryMatrixDelta,
+    HistoryMatrixPage,
+    HistoryMatrixResponse,
+)
 
 router = APIRouter()
 
 
-@router.get("/api/history/matrix", response_model=HistoryMatrixResponse)
-def history_matrix(season_year: int | None = None, db: Session = Depends(get_db)):
-    """Return the season history matrix. Optional query param `season_year` to scope results."""
-    data = get_history_matrix(db, season_year=season_year)
+@router.get(
+    "/api/history/matrix",
+    response_model=Union[HistoryMatrixDelta, HistoryMatrixColumnar, HistoryMatrixPage, HistoryMatrixResponse],
+)
+async def history_matrix(
+    season_year: int | None = None,
+    format: Literal["rows", "columnar"] = "rows",
+    after_entry_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    since_version: Optional[int] = Query(None, ge=0),
+    db: AsyncDB = Depends(get_async_read_db),
+):
+    """Return the season history matrix. Optional query param `season_year` to scope results.
+
+    - `after_entry_id` / `limit`: page through entries by id (`next_after_entry_id` in the response).
+    - `format=columnar`: parallel entry arrays plus a flat team-id grid instead of per-entry rows.
+    - `since_version`: only the cells of entries changed since a previous response's `version`.
+
+    Without any of these the response is the full matrix in the original row format.
+    """
+    if since_version is not None:
+        return await db.run(get_history_delta, since_version, season_year=season_year)
+    if format == "columnar" or after_entry_id is not None or limit is not None:
+        return await db.run(
+            get_history_page, season_year=season_year, after_entry_id=after_entry_id, limit=limit, columnar=format == "columnar"
+        )
+    data = await db.run(get_history_matrix, season_year=season_year)
     return data
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from app.db import pool_stats
+from app.routes.internal_sync import require_sync_token
+from app.services.principals import principal_cache_stats
+from app.services.password_hashing import password_hash_stats
+from app.services.dashboard import dashboard_cache_stats
+from app.services.lock_cutover import lock_cutover_scheduler
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/metrics")
+def get_metrics(_auth=Depends(require_sync_token)):
+    """In-process metrics (cache hit rates, hashing queue depth, lock cutover state, DB pool). Protected like the sync endpoints."""
+    return {
+        "user_principal_cache": principal_cache_stats(),
+        "dashboard_cache": dashboard_cache_stats(),
+        "password_hashing": password_hash_stats(),
+        "lock_cutover": lock_cutover_scheduler.status(),
+        "db_pool": pool_stats(),
+    }
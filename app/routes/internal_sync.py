@@ -2,6 +2,8 @@ from fastapi import APIRouter, Depends, Header, HTTPException, status
 from typing import Optional
 from app.services.espn_client import fetch_games_for_week
 from app.services.sync import transform_and_sync_games
+from app.services.backfill import DEFAULT_CONCURRENCY, backfill_weeks, get_transform_pool
+from app.services.sync_scheduler import espn_poll_scheduler
 from app.core.config import settings
 from app.db import get_db
 
@@ -26,3 +28,28 @@ def sync_games_espn(year: int, week: int, db=Depends(get_db), _auth=Depends(requ
     # Transform and persist
     transform_and_sync_games(raw, year=year, week=week, db=db)
     return {"status": "ok"}
+
+
+@router.post("/sync-games/backfill")
+async def sync_games_backfill(
+    year: int,
+    start_week: int = 1,
+    end_week: int = 18,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    _auth=Depends(require_sync_token),
+):
+    """Sync ESPN games for weeks `start_week..end_week` of `year` with bounded concurrency.
+
+    Returns per-week counts and timings; weeks that fail are reported without aborting the rest.
+    Payloads are transformed in the shared process pool, off this worker's event loop.
+    """
+    if start_week > end_week or not 1 <= concurrency <= 16:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid week range or concurrency")
+    pairs = [(year, w) for w in range(start_week, end_week + 1)]
+    return await backfill_weeks(pairs, concurrency=concurrency, executor=get_transform_pool())
+
+
+@router.get("/sync-games/status")
+def sync_games_status(_auth=Depends(require_sync_token)):
+    """Report the background ESPN poller state: mode, cadence, last run/error and next run time."""
+    return espn_poll_scheduler.status()
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 import secrets
@@ -8,8 +9,10 @@ from ..db import get_db
 from ..models.user import User
 from ..models.password_reset import PasswordResetToken
 from ..utils.email import send_email
-from ..utils.security import get_password_hash
+from ..services.password_hashing import PasswordHashBusyError, hash_password
+from ..services.principals import invalidate_user
 from ..schemas.auth import Token
+from .auth import hashing_busy_error
 
 router = APIRouter(prefix="/api/password-reset", tags=["password-reset"])
 
@@ -45,8 +48,7 @@ def request_password_reset(email: str, db: Session = Depends(get_db)):
     return {"ok": True}
 
 
-@router.post("/submit")
-def submit_password_reset(token: str, new_password: str, db: Session = Depends(get_db)):
+def _load_reset(db: Session, token: str):
     token_hash = _hash_token(token)
     pr = (
         db.query(PasswordResetToken)
@@ -66,9 +68,23 @@ def submit_password_reset(token: str, new_password: str, db: Session = Depends(g
     user = db.query(User).filter(User.id == pr.user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token")
+    return pr, user
+
 
-    user.hashed_password = get_password_hash(new_password)
+def _store_new_password(db: Session, pr: PasswordResetToken, user: User, hashed: str) -> None:
+    user.hashed_password = hashed
     db.delete(pr)
     db.commit()
+    invalidate_user(user.id)
+
+
+@router.post("/submit")
+async def submit_password_reset(token: str, new_password: str, db: Session = Depends(get_db)):
+    pr, user = await run_in_threadpool(_load_reset, db, token)
+    try:
+        hashed = await hash_password(new_password)
+    except PasswordHashBusyError:
+        raise hashing_busy_error()
+    await run_in_threadpool(_store_new_password, db, pr, user, hashed)
 
     return {"ok": True}
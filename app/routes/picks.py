@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from app.db import get_db
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field
+from typing import List
+from app.db import AsyncDB, get_async_db
 from app.routes.auth import get_current_user
-from app.services.picks import create_pick, update_pick, PickConflict, WeekLockedError
+from app.services.picks import create_pick, update_pick, submit_picks, PickConflict, WeekLockedError, MAX_BATCH_PICKS
 
 router = APIRouter()
 
@@ -18,10 +18,14 @@ class PickUpdateSchema(BaseModel):
     team_id: int
 
 
+class PickBatchSchema(BaseModel):
+    picks: List[PickCreateSchema] = Field(..., min_length=1, max_length=MAX_BATCH_PICKS)
+
+
 @router.post("/api/picks", status_code=201)
-def post_pick(payload: PickCreateSchema, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def post_pick(payload: PickCreateSchema, db: AsyncDB = Depends(get_async_db), current_user=Depends(get_current_user)):
     try:
-        pick = create_pick(db, current_user.id, payload.entry_id, payload.week_id, payload.team_id)
+        pick = await db.run(create_pick, current_user.id, payload.entry_id, payload.week_id, payload.team_id)
         return {"id": pick.id}
     except PickConflict as e:
         raise HTTPException(status_code=409, detail=str(e))
@@ -32,10 +36,21 @@ def post_pick(payload: PickCreateSchema, db: Session = Depends(get_db), current_
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/api/picks/batch")
+async def post_picks_batch(payload: PickBatchSchema, db: AsyncDB = Depends(get_async_db), current_user=Depends(get_current_user)):
+    """Create or update many picks in one transaction; each item gets its own status/code."""
+    try:
+        return await db.run(submit_picks, current_user.id, [(p.entry_id, p.week_id, p.team_id) for p in payload.picks])
+    except PickConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.patch("/api/picks/{pick_id}")
-def patch_pick(pick_id: int, payload: PickUpdateSchema, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def patch_pick(pick_id: int, payload: PickUpdateSchema, db: AsyncDB = Depends(get_async_db), current_user=Depends(get_current_user)):
     try:
-        updated = update_pick(db, current_user.id, pick_id, payload.team_id)
+        updated = await db.run(update_pick, current_user.id, pick_id, payload.team_id)
         if not updated:
             raise HTTPException(status_code=404, detail="Pick not found")
         return {"id": updated.id}
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
+from typing import Optional
 
-from ..db import get_db
+from ..db import AsyncDB, get_async_read_db
 from ..models.week import Week
 from ..models.game import Game
-from app.services.reveal import get_reveal_snapshot
+from app.services.reveal import get_reveal_snapshot_with_etag
+from app.services.week_lock import is_week_locked
 
 router = APIRouter(prefix="/api/public", tags=["public"])
 
@@ -18,8 +20,12 @@ def site_time():
 
 
 @router.get("/pre-reveal/{week_id}")
-def pre_reveal(week_id: int, db: Session = Depends(get_db)):
+async def pre_reveal(week_id: int, db: AsyncDB = Depends(get_async_read_db)):
     """Return a minimal pre-reveal view for a week: scheduled games (ids and team abbrs) and whether week is locked."""
+    return await db.run(_pre_reveal, week_id)
+
+
+def _pre_reveal(db: Session, week_id: int):
     week = db.query(Week).filter(Week.id == week_id).one_or_none()
     if not week:
         return {"week_id": week_id, "exists": False}
@@ -42,22 +48,32 @@ def pre_reveal(week_id: int, db: Session = Depends(get_db)):
         for g in games
     ]
 
-    # Treat naive lock_time as UTC for compatibility
-    locked = False
-    if week.lock_time:
-        lock = week.lock_time
-        if lock.tzinfo is None:
-            lock = lock.replace(tzinfo=timezone.utc)
-        locked = datetime.now(timezone.utc) >= lock
+    return {"week_id": week_id, "exists": True, "locked": is_week_locked(week), "games": games_out}
+
 
-    return {"week_id": week_id, "exists": True, "locked": locked, "games": games_out}
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak comparison (RFC 9110 13.1.2): ignore a W/ prefix on the client's validators
+    return "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates)
 
 
 @router.get("/weeks/{week_id}/reveal-snapshot")
-def reveal_snapshot(week_id: int, db: Session = Depends(get_db)):
+async def reveal_snapshot(
+    week_id: int,
+    response: Response,
+    db: AsyncDB = Depends(get_async_read_db),
+    if_none_match: Optional[str] = Header(None),
+):
     """Return aggregated reveal snapshot for a week once lock_time has passed. Publicly accessible.
 
     If the week doesn't exist, return 404-like payload `{"exists": False}`.
+    Responses carry an ETag; clients revalidating with `If-None-Match` get a bodyless 304.
     """
-    snapshot = get_reveal_snapshot(db, week_id)
+    snapshot, etag = await db.run(get_reveal_snapshot_with_etag, week_id)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return snapshot
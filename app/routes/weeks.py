@@ -6,6 +6,10 @@ from app.db import get_db
 from app.models.week import Week
 from app.schemas.weeks import WeekCreate, WeekOut, WeekUpdate
 from app.routes.auth import require_admin
+from app.services.current_week import invalidate_current_week
+from app.services.lock_cutover import lock_cutover_scheduler
+from app.services.reveal import discard_reveal_snapshots, refresh_reveal_snapshot
+from app.services.week_lock import is_week_locked, lock_time_passed
 
 router = APIRouter(prefix="/api/weeks", tags=["weeks"])
 
@@ -18,6 +22,7 @@ def create_week(week_in: WeekCreate, db: Session = Depends(get_db), _admin=Depen
     week.lock_time = week_in.lock_time
     db.add(week)
     db.commit()
+    lock_cutover_scheduler.wake()
     db.refresh(week)
     # SQLAlchemy JSON columns already provide Python lists; return directly
     return {
@@ -57,6 +62,14 @@ def update_week(week_id: int, payload: WeekUpdate, db: Session = Depends(get_db)
         raise HTTPException(status_code=404, detail="Week not found")
     if payload.lock_time is not None:
         week.lock_time = payload.lock_time
+        # Moving the lock into the future reopens the week; a past lock is applied by the cutover
+        if week.is_locked and not lock_time_passed(week.lock_time):
+            week.is_locked = False
+        # A reopened week must not keep serving the snapshot taken at its previous lock
+        if is_week_locked(week):
+            refresh_reveal_snapshot(db, week.id)
+        else:
+            discard_reveal_snapshots(db, week.id)
     if payload.ineligible_teams is not None:
         week.set_ineligible_teams(payload.ineligible_teams)
     if payload.locked_games is not None:
@@ -65,6 +78,9 @@ def update_week(week_id: int, payload: WeekUpdate, db: Session = Depends(get_db)
         week.is_current = payload.is_current
     db.add(week)
     db.commit()
+    invalidate_current_week(db)
+    if payload.lock_time is not None:
+        lock_cutover_scheduler.wake()
     db.refresh(week)
     return {
         "id": week.id,
@@ -106,4 +122,5 @@ def set_current_week(week_id: int, db: Session = Depends(get_db), _admin=Depends
         week.is_current = True
         db.add(week)
         db.commit()
+    invalidate_current_week(db)
     return None
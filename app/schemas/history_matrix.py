@@ -24,3 +24,31 @@ class EntryRow(BaseModel):
 class HistoryMatrixResponse(BaseModel):
     weeks: List[int]  # list of week_number in order
     entries: List[EntryRow]
+
+
+class HistoryMatrixPage(HistoryMatrixResponse):
+    version: int  # pass back as `since_version` to fetch only later changes
+    next_after_entry_id: Optional[int]  # None on the last page
+
+
+class HistoryMatrixColumnar(BaseModel):
+    weeks: List[int]
+    entry_ids: List[int]
+    entry_names: List[str]
+    team_ids: List[Optional[int]]  # row-major: team_ids[row * len(weeks) + week_index]
+    version: int
+    next_after_entry_id: Optional[int]
+
+
+class HistoryMatrixChanges(BaseModel):
+    entry_ids: List[int]
+    entry_names: List[str]
+    week_indexes: List[int]
+    team_ids: List[Optional[int]]
+
+
+class HistoryMatrixDelta(BaseModel):
+    weeks: List[int]
+    since_version: int
+    version: int
+    changes: HistoryMatrixChanges
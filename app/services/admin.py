@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.entry import Entry
 from app.utils import email as email_utils
+from app.services.reveal import refresh_reveal_snapshot
+from app.services.principals import invalidate_user
+from app.services.dashboard import invalidate_dashboard
 
 
 def list_users(db: Session) -> List[User]:
@@ -19,6 +22,7 @@ def patch_user(db: Session, user_id: int, *, is_active: Optional[bool] = None, i
         user.is_admin = is_admin
     db.add(user)
     db.commit()
+    invalidate_user(user_id)
     db.refresh(user)
     return user
 
@@ -49,7 +53,9 @@ def patch_entry_elimination(db: Session, entry_id: int, is_eliminated: bool) ->
         return None
     entry.is_eliminated = is_eliminated
     db.add(entry)
+    refresh_reveal_snapshot(db, entry.week_id)
     db.commit()
+    invalidate_dashboard(entry.user_id)
     db.refresh(entry)
     return entry
 
@@ -0,0 +1,126 @@
+"""Bulk ESPN sync for a range of (year, week) pairs.
+
+Backfilling a season one `/internal/sync-games/espn` call at a time is dominated by network
+latency. `backfill_weeks` overlaps the fetches (bounded by `concurrency`) and persists each week
+through `sync_games` in its own transaction. Writes are serialized so SQLite never sees
+concurrent writers; Postgres simply gets short transactions.
+
+The transform is CPU-bound Python, so threads would only contend for the GIL: it runs inline
+unless a `ProcessPoolExecutor` is passed as `executor` (payloads and results are plain
+JSON-like data, so they pickle cheaply). The API endpoint passes `get_transform_pool()`, a
+shared pool of `BACKFILL_TRANSFORM_WORKERS` processes, so a large backfill never stalls the
+event loop of the worker serving it.
+
+CLI: `python scripts/backfill_games.py --year 2025 --weeks 1-18 --concurrency 6 --transform-processes 4`
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.services.espn_client import AsyncEspnClient
+from app.services.sync import sync_games
+from app.services.transformer import transform_espn_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+
+_transform_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+def get_transform_pool() -> Executor:
+    """Process pool for transforms started from the API; created on first use."""
+    global _transform_pool
+    with _pool_lock:
+        if _transform_pool is None:
+            _transform_pool = ProcessPoolExecutor(max_workers=settings.BACKFILL_TRANSFORM_WORKERS)
+        return _transform_pool
+
+
+def shutdown_transform_pool() -> None:
+    global _transform_pool
+    with _pool_lock:
+        pool, _transform_pool = _transform_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _sync_week(session_factory: Callable[[], Any], games: List[dict], year: int, week: int, resolve_results: bool):
+    db = session_factory()
+    try:
+        return sync_games(games, year=year, week=week, db=db, resolve_results=resolve_results)
+    finally:
+        db.close()
+
+
+async def backfill_weeks(
+    pairs: Iterable[Tuple[int, int]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: Optional[Any] = None,
+    session_factory: Callable[[], Any] = SessionLocal,
+    executor: Optional[Executor] = None,
+    resolve_results: bool = True,
+) -> Dict[str, Any]:
+    """Fetch, transform and sync every `(year, week)` in `pairs`.
+
+    A failure in one week (HTTP error, unknown week, ...) is reported in that week's entry and
+    does not abort the others. Returns `{"weeks": [...], "ok", "failed", "elapsed_ms"}` where each
+    week entry carries its sync counts and `fetch_ms` / `transform_ms` / `sync_ms` timings.
+    `executor`, if given, should be a process pool; transforms otherwise run inline.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    pairs = list(dict.fromkeys(pairs))
+    owns_client = client is None
+    if client is None:
+        client = AsyncEspnClient(max_connections=concurrency)
+
+    loop = asyncio.get_running_loop()
+    fetch_slots = asyncio.Semaphore(concurrency)
+    write_lock = asyncio.Lock()
+    started = time.perf_counter()
+
+    async def run_one(year: int, week: int) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"year": year, "week": week}
+        try:
+            t0 = time.perf_counter()
+            async with fetch_slots:
+                fetched = await client.fetch_week(year, week)
+            report["fetch_ms"] = _elapsed_ms(t0)
+
+            t0 = time.perf_counter()
+            if executor is None:
+                games = transform_espn_response(fetched.payload)
+            else:
+                games = await loop.run_in_executor(executor, transform_espn_response, fetched.payload)
+            report["transform_ms"] = _elapsed_ms(t0)
+
+            async with write_lock:
+                t0 = time.perf_counter()
+                result = await asyncio.to_thread(_sync_week, session_factory, games, year, week, resolve_results)
+                report["sync_ms"] = _elapsed_ms(t0)
+            report.update(result)
+            report["status"] = "ok"
+        except Exception as exc:
+            logger.warning("Backfill of %d week %d failed: %s", year, week, exc)
+            report.update(status="error", error=str(exc))
+        return report
+
+    try:
+        weeks = await asyncio.gather(*(run_one(year, week) for year, week in pairs))
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    ok = sum(1 for w in weeks if w["status"] == "ok")
+    return {"weeks": weeks, "ok": ok, "failed": len(weeks) - ok, "elapsed_ms": _elapsed_ms(started)}
@@ -0,0 +1,208 @@
+"""Pluggable key/value cache shared by services.
+
+Backends (selected with `CACHE_BACKEND`, location in `CACHE_URL`):
+
+- `memory`: per-process dict. Fine for a single worker and for tests.
+- `sqlite`: a local SQLite file (`CACHE_URL`, default `./cache.db`) shared by every worker on
+  the host, so an invalidation in one uvicorn worker is seen by all of them.
+- `redis`: any Redis-compatible server (`CACHE_URL`, e.g. `redis://localhost:6379/0`), for
+  multi-host deployments or a local stand-in. Requires the optional `redis` package.
+
+Values must be JSON-serializable; every entry carries a TTL in seconds.
+
+Async routes call services through `AsyncSession.run_sync`, which runs them on the event loop.
+The sqlite and redis backends notice that and hand each call to a worker thread (see
+`_off_loop`), so their I/O never blocks the loop; elsewhere they run inline.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """Interface every backend implements; a subclass missing a method can't be instantiated."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under `key`, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a JSON-serializable `value` under `key` for `ttl` seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Drop `key` if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry this backend owns."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.time():
+                del self._data[key]
+                return None
+        # Store serialized so callers can't mutate the cached value, same as the shared backends
+        return json.loads(item[1])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.time() + ttl, json.dumps(value))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _off_loop(fn, *args):
+    # Inside run_sync the caller is a greenlet on the event loop; await the call in a thread
+    if in_greenlet():
+        return await_only(asyncio.to_thread(fn, *args))
+    return fn(*args)
+
+
+class _BlockingCacheBackend(CacheBackend):
+    """Base for backends that do I/O: subclasses implement the underscored methods."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return _off_loop(self._get, key)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        _off_loop(self._set, key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        _off_loop(self._delete, key)
+
+    def clear(self) -> None:
+        _off_loop(self._clear)
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Any]:
+        """Backend read behind `get`."""
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        """Backend write behind `set`."""
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        """Backend delete behind `delete`."""
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Backend wipe behind `clear`."""
+
+
+class SQLiteCacheBackend(_BlockingCacheBackend):
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit; WAL lets readers in other workers proceed during writes
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        self._conn().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, json.dumps(value), time.time() + ttl),
+        )
+
+    def _delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _clear(self) -> None:
+        self._conn().execute("DELETE FROM cache_entries")
+
+
+class RedisCacheBackend(_BlockingCacheBackend):
+    def __init__(self, url: str, prefix: str = "tears:"):
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - depends on optional package
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def _get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def _set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(self.prefix + key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    def _delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def _clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_cache_backend(kind: str, url: Optional[str] = None) -> CacheBackend:
+    if kind == "memory":
+        return MemoryCacheBackend()
+    if kind == "sqlite":
+        return SQLiteCacheBackend(url or "./cache.db")
+    if kind == "redis":
+        return RedisCacheBackend(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown CACHE_BACKEND {kind!r}")
+
+
+def get_cache() -> CacheBackend:
+    """Return the process-wide backend configured by `CACHE_BACKEND` / `CACHE_URL`."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_cache_backend(settings.CACHE_BACKEND, settings.CACHE_URL)
+        return _backend
+
+
+def set_cache(backend: Optional[CacheBackend]) -> None:
+    """Replace the process-wide backend (None re-reads settings on next use)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
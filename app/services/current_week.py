@@ -0,0 +1,62 @@
+"""Cached lookup of the current week.
+
+The cache stores the week row itself (id, season, number, lock_time), never anything derived
+from the clock; callers compute countdowns per request. Entries live in the shared cache
+backend (`app.services.cache`) so that `invalidate_current_week`, called by the week admin
+routes, takes effect in every worker. `CURRENT_WEEK_CACHE_TTL_SECONDS` only bounds staleness
+for changes made outside those routes (scripts, direct SQL).
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.week import Week
+from app.services.cache import get_cache
+
+_KEY_PREFIX = "current_week:"
+
+
+def _cache_key(db: Session) -> str:
+    # Scope by database so processes (or tests) pointed at different databases never mix rows
+    url = str(db.get_bind().url)
+    return _KEY_PREFIX + hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _load(db: Session) -> Optional[Dict[str, Any]]:
+    w = db.query(Week).filter(Week.is_current == True).order_by(Week.id).first()  # noqa: E712
+    if not w:
+        return None
+    lock_time = w.lock_time
+    if lock_time is not None and lock_time.tzinfo is None:
+        lock_time = lock_time.replace(tzinfo=timezone.utc)
+    return {
+        "week_id": w.id,
+        "season_year": w.season_year,
+        "week_number": w.week_number,
+        "lock_time": lock_time.isoformat() if lock_time else None,
+    }
+
+
+def get_current_week(db: Session) -> Optional[Dict[str, Any]]:
+    """Return the current week row as `{week_id, season_year, week_number, lock_time}` or None.
+
+    `lock_time` is a timezone-aware datetime. "No current week" is cached too.
+    """
+    cache = get_cache()
+    key = _cache_key(db)
+    cached = cache.get(key)
+    if cached is None:
+        cached = {"week": _load(db)}
+        cache.set(key, cached, settings.CURRENT_WEEK_CACHE_TTL_SECONDS)
+    week = cached["week"]
+    if week is None:
+        return None
+    lock_time = week["lock_time"]
+    return {**week, "lock_time": datetime.fromisoformat(lock_time) if lock_time else None}
+
+
+def invalidate_current_week(db: Session) -> None:
+    get_cache().delete(_cache_key(db))
@@ -1,17 +1,15 @@
 from typing import List, Dict, Any, Optional
+from sqlalchemy import and_, false, select
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.entry import Entry
-from app.models.week import Week
 from app.models.pick import Pick
 from app.models.team import Team
 from datetime import datetime, timezone
-import time
-
-# Simple in-memory TTL cache for current week info to avoid repeated DB hits during
-# a short window. Tests and production calls will tolerate a small TTL.
-_WEEK_INFO_CACHE: Optional[Dict[str, Any]] = None
-_WEEK_INFO_CACHE_EXPIRY: float = 0.0
-_WEEK_INFO_TTL_SECONDS = 1.0  # low TTL to keep tests predictable
+import threading
+import uuid
+from app.services.cache import get_cache
+from app.services.current_week import get_current_week
 
 
 def get_entries_for_user(db: Session, user_id: int) -> List[Dict[str, Any]]:
@@ -33,38 +31,19 @@ def get_entries_for_user(db: Session, user_id: int) -> List[Dict[str, Any]]:
 def get_current_week_info(db: Session) -> Optional[Dict[str, Any]]:
     """Return the current week info (id, number, lock_time, countdown_seconds) or None.
 
-    countdown_seconds is computed relative to UTC now.
+    The week row comes from the shared current-week cache; countdown_seconds is computed
+    relative to UTC now on every call.
     """
-    # Check cache first
-    global _WEEK_INFO_CACHE, _WEEK_INFO_CACHE_EXPIRY
-    now_ts = time.time()
-    if _WEEK_INFO_CACHE is not None and now_ts < _WEEK_INFO_CACHE_EXPIRY:
-        return _WEEK_INFO_CACHE
-
-    w = db.query(Week).filter(Week.is_current == True).first()
-    if not w:
+    week = get_current_week(db)
+    if not week:
         return None
-    lock_time = w.lock_time
-    now = datetime.now(timezone.utc)
-    if lock_time is None:
-        countdown = None
-    else:
-        # Ensure timezone-aware comparison
-        if lock_time.tzinfo is None:
-            lock_time = lock_time.replace(tzinfo=timezone.utc)
-        countdown = int((lock_time - now).total_seconds())
-    ret = {
-        "week_id": w.id,
-        "week_number": w.week_number,
-        "lock_time": lock_time,
-        "countdown_seconds": countdown,
+    return {
+        "week_id": week["week_id"],
+        "week_number": week["week_number"],
+        "lock_time": week["lock_time"],
+        "countdown_seconds": countdown_seconds(week["lock_time"]),
     }
 
-    # populate cache
-    _WEEK_INFO_CACHE = ret
-    _WEEK_INFO_CACHE_EXPIRY = time.time() + _WEEK_INFO_TTL_SECONDS
-    return ret
-
 
 def get_picks_for_entries(db: Session, entry_ids: List[int], week_id: int) -> Dict[int, Optional[Dict[str, Any]]]:
     """Return a mapping of entry_id -> pick info for the specified week.
@@ -94,3 +73,98 @@ def get_picks_for_entries(db: Session, entry_ids: List[int], week_id: int) -> Di
         }
 
     return result
+
+
+# Per-user cache of the dashboard entries, kept in the shared cache backend (`app.services.cache`)
+# so an invalidation in one worker is seen by every worker. Each user's value is tagged with the
+# database URL, the current week id and the global generation: pick/entry writes drop one user's
+# key (`invalidate_dashboard`), result resolution stores a new generation token
+# (`invalidate_all_dashboards`) and a change of current week misses naturally. The week itself
+# comes from the current-week cache and the countdown is computed per request, so cached data
+# never goes stale with the clock.
+_KEY_PREFIX = "dashboard:"
+_GENERATION_KEY = _KEY_PREFIX + "generation"
+# Must outlive every entry TTL: a generation expiring back to None could revive older entries
+_GENERATION_TTL_SECONDS = 7 * 24 * 3600
+_DASHBOARD_LOCK = threading.Lock()
+_DASHBOARD_STATS = {"hits": 0, "misses": 0}
+
+
+def _user_key(user_id: int) -> str:
+    return f"{_KEY_PREFIX}user:{user_id}"
+
+
+def invalidate_dashboard(user_id: int) -> None:
+    get_cache().delete(_user_key(user_id))
+
+
+def invalidate_all_dashboards() -> None:
+    get_cache().set(_GENERATION_KEY, uuid.uuid4().hex, _GENERATION_TTL_SECONDS)
+
+
+def dashboard_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of this worker against the shared dashboard cache."""
+    with _DASHBOARD_LOCK:
+        stats = dict(_DASHBOARD_STATS)
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        **stats,
+        "generation": get_cache().get(_GENERATION_KEY),
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else None,
+        "ttl_seconds": settings.DASHBOARD_CACHE_TTL_SECONDS,
+    }
+
+
+def _count(outcome: str) -> None:
+    with _DASHBOARD_LOCK:
+        _DASHBOARD_STATS[outcome] += 1
+
+
+def countdown_seconds(lock_time: Optional[datetime]) -> Optional[int]:
+    if lock_time is None:
+        return None
+    return int((lock_time - datetime.now(timezone.utc)).total_seconds())
+
+
+def _load_dashboard_entries(db: Session, user_id: int, week_id: Optional[int]) -> List[Dict[str, Any]]:
+    """Fetch the user's entries with each entry's pick (and team) for `week_id` in one statement."""
+    pick_join = and_(Pick.entry_id == Entry.id, Pick.week_id == week_id) if week_id is not None else false()
+    stmt = (
+        select(Entry.id, Entry.name, Entry.is_eliminated, Team.id, Team.abbreviation, Team.name)
+        .outerjoin(Pick, pick_join)
+        .outerjoin(Team, Team.id == Pick.team_id)
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.id)
+    )
+    entries: Dict[int, Dict[str, Any]] = {}
+    for entry_id, name, is_eliminated, team_id, abbr, team_name in db.execute(stmt):
+        if entry_id in entries:
+            continue
+        pick = {"team_id": team_id, "team_abbr": abbr, "team_name": team_name} if team_id is not None else None
+        entries[entry_id] = {"id": entry_id, "name": name, "is_eliminated": bool(is_eliminated), "current_pick": pick}
+    return list(entries.values())
+
+
+def get_dashboard_data(db: Session, user_id: int) -> Dict[str, Any]:
+    """Return `{"entries": [...], "current_week": {...} | None}` for the dashboard.
+
+    With the current week cached, a fresh per-user entry cache means zero queries and a miss
+    is one statement. `current_week.countdown_seconds` is always computed for this call.
+    """
+    week = get_current_week_info(db)
+    week_id = week["week_id"] if week else None
+    tag = [str(db.get_bind().url), week_id]
+    cache = get_cache()
+    generation = cache.get(_GENERATION_KEY)
+    cached = cache.get(_user_key(user_id))
+    if cached is not None and cached["tag"] == tag and cached["generation"] == generation:
+        _count("hits")
+        return {"entries": cached["entries"], "current_week": week}
+
+    _count("misses")
+    entries = _load_dashboard_entries(db, user_id, week_id)
+    ttl = settings.DASHBOARD_CACHE_TTL_SECONDS
+    # Skip the store if an invalidate-all raced with the load
+    if ttl > 0 and cache.get(_GENERATION_KEY) == generation:
+        cache.set(_user_key(user_id), {"tag": tag, "generation": generation, "entries": entries}, ttl)
+    return {"entries": entries, "current_week": week}
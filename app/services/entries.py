@@ -6,6 +6,10 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from sqlalchemy import delete
 from typing import Optional
+from app.services.dashboard import invalidate_dashboard
+from app.services.history_matrix import record_entry, remove_entry
+from app.services.used_teams import release_entry
+from app.services.week_lock import is_week_locked
 
 
 class EntryNameConflict(ValueError):
@@ -36,12 +40,16 @@ def create_entry(db: Session, user_id: int, week_id: int, picks: Any, name: str
         existing.picks = picks
         db.add(existing)
         db.commit()
+        invalidate_dashboard(user_id)
         db.refresh(existing)
         return existing
 
     entry = Entry(user_id=user_id, week_id=week_id, name=name, season_year=season, picks=picks, created_at=datetime.now(timezone.utc))
     db.add(entry)
+    db.flush()
+    record_entry(db, entry)
     db.commit()
+    invalidate_dashboard(user_id)
     db.refresh(entry)
     return entry
 
@@ -50,22 +58,12 @@ def get_entries_for_user(db: Session, user_id: int) -> List[Entry]:
     return db.query(Entry).filter(Entry.user_id == user_id).all()
 
 
-def _is_week_locked(week: Week) -> bool:
-    if not week.lock_time:
-        return False
-    # Compare aware times; treat naive lock_time as UTC for backward compatibility
-    lock = week.lock_time
-    if lock.tzinfo is None:
-        lock = lock.replace(tzinfo=timezone.utc)
-    return datetime.now(timezone.utc) >= lock
-
-
 def update_entry(db: Session, entry_id: int, user_id: int, picks: Any = None, name: str = None) -> Optional[Entry]:
     entry = db.query(Entry).filter(Entry.id == entry_id, Entry.user_id == user_id).one_or_none()
     if not entry:
         return None
     week = db.query(Week).filter(Week.id == entry.week_id).one_or_none()
-    if _is_week_locked(week):
+    if is_week_locked(week):
         raise ValueError("Week is locked - cannot modify entries")
 
     # handle rename: must ensure uniqueness per user/season
@@ -79,7 +77,9 @@ def update_entry(db: Session, entry_id: int, user_id: int, picks: Any = None, na
         entry.picks = picks
 
     db.add(entry)
+    record_entry(db, entry)
     db.commit()
+    invalidate_dashboard(user_id)
     db.refresh(entry)
     return entry
 
@@ -89,8 +89,11 @@ def delete_entry(db: Session, entry_id: int, user_id: int) -> bool:
     if not entry:
         return False
     week = db.query(Week).filter(Week.id == entry.week_id).one_or_none()
-    if _is_week_locked(week):
+    if is_week_locked(week):
         raise ValueError("Week is locked - cannot delete entries")
+    remove_entry(db, entry.id)
+    release_entry(db, entry.id)
     db.delete(entry)
     db.commit()
+    invalidate_dashboard(user_id)
     return True
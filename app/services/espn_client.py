@@ -1,6 +1,8 @@
+import hashlib
 import logging
 import os
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +38,23 @@ def requests_session_with_retries(
     return session
 
 
-def fetch_games_for_week(year: int, week: int, session: Optional[Any] = None) -> Any:
+_SESSION: Optional[Any] = None
+
+
+def _shared_session():
+    """Return a process-wide retrying session so repeated fetches reuse pooled connections."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests_session_with_retries()
+    return _SESSION
+
+
+def fetch_games_for_week(year: int, week: int, session: Optional[Any] = None) -> bytes:
     """Fetch raw ESPN game data for a specific year and week.
 
+    Returns the undecoded response body; `transform_espn_response` parses it one event at a
+    time, so the full scoreboard is never built as a dict.
+
     Parameters:
       - year, week: ints to add to the scoreboard query
       - session: optional `requests.Session` to use (useful for testing/mocking)
@@ -47,11 +63,119 @@ def fetch_games_for_week(year: int, week: int, session: Optional[Any] = None) ->
     or by setting `core.config.ESPN_BASE_URL` in your application config.
     """
     if session is None:
-        session = requests_session_with_retries()
+        session = _shared_session()
 
     base = os.environ.get("ESPN_BASE_URL") or DEFAULT_BASE_URL
     url = f"{base}?week={week}&year={year}"
     logger.debug("Fetching ESPN scoreboard: %s", url)
     resp = session.get(url, timeout=DEFAULT_TIMEOUT)
     resp.raise_for_status()
-    return resp.json()
+    return resp.content
+
+
+@dataclass
+class ScoreboardFetch:
+    """Result of `AsyncEspnClient.fetch_week`.
+
+    `payload` is the undecoded response body, for `transform_espn_response` to stream. `changed`
+    is False when ESPN answered 304 or returned a body identical to the last one committed for
+    the same week; callers can then skip transforming and syncing entirely.
+    A changed fetch only becomes the baseline once the caller passes it to
+    `AsyncEspnClient.commit` after its sync succeeded.
+    """
+
+    payload: bytes
+    changed: bool
+    status_code: int
+    payload_hash: str
+    key: Optional[Tuple[int, int]] = None
+    _entry: Optional["_CacheEntry"] = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class _CacheEntry:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload_hash: str
+    payload: bytes
+
+
+class AsyncEspnClient:
+    """Long-lived async scoreboard client.
+
+    A single pooled `httpx.AsyncClient` (keep-alive, gzip) is reused across polls, and per-week
+    validators (ETag / Last-Modified) plus a hash of the last committed body are remembered so
+    unchanged scoreboards are detected without re-parsing or re-syncing. Validators are only
+    stored by `commit`, so a sync that fails is retried on the next poll instead of being
+    answered with a 304.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        max_connections: int = 4,
+        client: Optional[Any] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.max_connections = max_connections
+        self._client = client
+        self._cache: Dict[Tuple[int, int], _CacheEntry] = {}
+
+    def _get_client(self):
+        if self._client is None:
+            # Imported lazily like `requests` above so the module stays importable without httpx
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"Accept": "application/json", "Accept-Encoding": "gzip"},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                transport=httpx.AsyncHTTPTransport(retries=self.retries),
+            )
+        return self._client
+
+    async def fetch_week(self, year: int, week: int) -> ScoreboardFetch:
+        base = self.base_url or os.environ.get("ESPN_BASE_URL") or DEFAULT_BASE_URL
+        key = (year, week)
+        cached = self._cache.get(key)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        logger.debug("Fetching ESPN scoreboard: %s week=%s year=%s", base, week, year)
+        resp = await self._get_client().get(base, params={"week": week, "year": year}, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            return ScoreboardFetch(cached.payload, False, 304, cached.payload_hash)
+        resp.raise_for_status()
+
+        body = resp.content
+        payload_hash = hashlib.sha256(body).hexdigest()
+        if cached is not None and cached.payload_hash == payload_hash:
+            cached.etag = resp.headers.get("ETag") or cached.etag
+            cached.last_modified = resp.headers.get("Last-Modified") or cached.last_modified
+            return ScoreboardFetch(cached.payload, False, resp.status_code, payload_hash)
+
+        entry = _CacheEntry(
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            payload_hash=payload_hash,
+            payload=body,
+        )
+        return ScoreboardFetch(body, True, resp.status_code, payload_hash, key, entry)
+
+    def commit(self, fetched: ScoreboardFetch) -> None:
+        """Make a changed fetch the baseline for its week once the caller has synced it."""
+        if fetched.changed and fetched._entry is not None:
+            self._cache[fetched.key] = fetched._entry
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
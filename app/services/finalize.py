@@ -1,4 +1,5 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
+from sqlalchemy import select, update, func, or_, true
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -7,19 +8,28 @@ from app.models.pick import Pick
 from app.models.entry import Entry
 from app.models.week import Week
 from app.models.team import Team
+from app.services.reveal import refresh_reveal_snapshot
+from app.services.dashboard import invalidate_all_dashboards
 
 
 class FinalizeError(Exception):
     pass
 
 
-def _apply_game_updates(db: Session, games_payload: list) -> None:
-    """Apply final score updates to Game rows. Raises FinalizeError on validation failures."""
+def _apply_game_updates(db: Session, games_payload: list) -> List[Game]:
+    """Apply final score updates to Game rows. Raises FinalizeError on validation failures.
+
+    All referenced games are loaded with a single IN query; returns them in payload order.
+    """
+    ids = [g.get("game_id") for g in games_payload]
+    if any(gid is None for gid in ids):
+        raise FinalizeError("game_id is required for each game")
+    games_by_id = {g.id: g for g in db.execute(select(Game).where(Game.id.in_(ids))).scalars()} if ids else {}
+
+    updated: List[Game] = []
     for g in games_payload:
         game_id = g.get("game_id")
-        if game_id is None:
-            raise FinalizeError("game_id is required for each game")
-        game = db.get(Game, game_id)
+        game = games_by_id.get(game_id)
         if not game:
             raise FinalizeError(f"Game not found: {game_id}")
         # Expect explicit integer scores
@@ -31,21 +41,113 @@ def _apply_game_updates(db: Session, games_payload: list) -> None:
         # mark final
         setattr(game, "is_final", True)
         db.add(game)
+        updated.append(game)
+    return updated
+
+
+def _team_ids_by_abbr(db: Session, games: Iterable[Game]) -> Dict[str, int]:
+    """Resolve every team abbreviation used by `games` to a team id in one query."""
+    abbrs = {a for g in games for a in (g.home_team_abbr, g.away_team_abbr) if a}
+    if not abbrs:
+        return {}
+    return dict(db.execute(select(Team.abbreviation, Team.id).where(Team.abbreviation.in_(abbrs))).all())
 
 
-def _compute_game_winner(db: Session, game: Game):
-    """Return winning team id for a game or None for tie/unknown."""
+def _compute_game_winner(db: Session, game: Game, team_ids_by_abbr: Optional[Dict[str, int]] = None):
+    """Return winning team id for a game or None for tie/unknown.
+
+    Prefers the canonical `home_team_id`/`away_team_id`; falls back to the abbreviation
+    snapshot via `team_ids_by_abbr` (or a Team lookup when no map is supplied).
+    """
     if game.home_score is None or game.away_score is None:
         return None
     if game.home_score > game.away_score:
-        # lookup team by abbreviation
-        team = db.query(Team).filter(Team.abbreviation == game.home_team_abbr).first()
-        return team.id if team else None
-    if game.away_score > game.home_score:
-        team = db.query(Team).filter(Team.abbreviation == game.away_team_abbr).first()
-        return team.id if team else None
-    # tie
-    return None
+        team_id, abbr = game.home_team_id, game.home_team_abbr
+    elif game.away_score > game.home_score:
+        team_id, abbr = game.away_team_id, game.away_team_abbr
+    else:
+        # tie
+        return None
+    if team_id is not None:
+        return team_id
+    if team_ids_by_abbr is not None:
+        return team_ids_by_abbr.get(abbr)
+    team = db.query(Team).filter(Team.abbreviation == abbr).first()
+    return team.id if team else None
+
+
+def _expire_loaded(db: Session, *models) -> None:
+    """Expire already-loaded instances of `models` after bulk UPDATEs so callers re-read fresh values."""
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, models):
+            db.expire(obj)
+
+
+def _apply_pick_results(db: Session, week_id: int, is_win, is_loss) -> int:
+    """Write pick results for a week with bulk UPDATEs and eliminate entries holding a loss.
+
+    `is_win`/`is_loss` are column predicates selecting the picks to mark (either may be None).
+    Only rows whose result actually changes are written. Returns the number of picks updated.
+    """
+    changed = 0
+    for predicate, result in ((is_win, "win"), (is_loss, "loss")):
+        if predicate is None:
+            continue
+        changed += db.execute(
+            update(Pick)
+            .where(Pick.week_id == week_id, predicate, or_(Pick.result.is_(None), Pick.result != result))
+            .values(result=result)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    # UPDATE entries ... FROM picks: eliminate every entry holding a losing pick this week
+    db.execute(
+        update(Entry)
+        .where(
+            Entry.id == Pick.entry_id,
+            Pick.week_id == week_id,
+            Pick.result == "loss",
+            Entry.is_eliminated == False,  # noqa: E712
+        )
+        .values(is_eliminated=True)
+        .execution_options(synchronize_session=False)
+    )
+    _expire_loaded(db, Pick, Entry)
+    return changed
+
+
+def resolve_final_games(db: Session, week_id: int, games: Iterable[Game]) -> Dict[str, Any]:
+    """Resolve only the picks on teams that played in `games` (games that just went final).
+
+    Used by the ESPN sync to update results game-by-game without a whole-week recomputation.
+    Winners' picks become 'win'; picks on the other side (or both sides of a tie, as in
+    `finalize_week_scores`) become 'loss' and their entries are eliminated. The caller owns
+    the transaction.
+    """
+    games = [g for g in games if g.home_score is not None and g.away_score is not None]
+    if not games:
+        return {"finalized_games": 0, "resolved_picks": 0}
+
+    team_ids = _team_ids_by_abbr(db, games)
+    winners = set()
+    losers = set()
+    for game in games:
+        winner = _compute_game_winner(db, game, team_ids)
+        for team_id in (
+            game.home_team_id or team_ids.get(game.home_team_abbr),
+            game.away_team_id or team_ids.get(game.away_team_abbr),
+        ):
+            if team_id is None:
+                continue
+            (winners if team_id == winner else losers).add(team_id)
+
+    db.flush()
+    resolved = _apply_pick_results(
+        db,
+        week_id,
+        Pick.team_id.in_(winners) if winners else None,
+        Pick.team_id.in_(losers) if losers else None,
+    )
+    return {"finalized_games": len(games), "resolved_picks": resolved}
 
 
 def finalize_week_scores(db: Session, week_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -53,6 +155,8 @@ def finalize_week_scores(db: Session, week_id: int, payload: Dict[str, Any]) ->
 
     This function performs updates in a transaction: updates games, computes winning teams,
     updates picks.result to 'win'|'loss', and marks entries eliminated when they lose.
+    Pick results and eliminations are applied set-wise with bulk UPDATE statements, so the
+    cost does not grow with one ORM round trip per pick.
     """
     games_payload = payload.get("games") or []
     if not isinstance(games_payload, list):
@@ -72,42 +176,33 @@ def finalize_week_scores(db: Session, week_id: int, payload: Dict[str, Any]) ->
             if not week:
                 raise FinalizeError("Week not found")
 
-            _apply_game_updates(db, games_payload)
-
-            # Re-load updated games from DB and compute winners per game
-            game_winners = {}
-            for g in games_payload:
-                gid = g.get("game_id")
-                game = db.get(Game, gid)
-                if not game:
-                    raise FinalizeError(f"Game not found after update: {gid}")
-                winner = _compute_game_winner(db, game)
-                game_winners[gid] = winner
-
-            # Query picks for the week
-            picks = db.query(Pick).filter(Pick.week_id == week_id).all()
-            for p in picks:
-                # determine if the pick corresponds to a winning team in any game
-                is_win = False
-                for gid, winner in game_winners.items():
-                    if winner is not None and winner == p.team_id:
-                        is_win = True
-                        break
-                # update pick result only if changed
-                new_result = "win" if is_win else "loss"
-                if p.result != new_result:
-                    p.result = new_result
-                    db.add(p)
-                processed_picks += 1
-
-                if not is_win:
-                    # mark the entry eliminated if not already
-                    entry = db.get(Entry, p.entry_id)
-                    if entry and not getattr(entry, "is_eliminated", False):
-                        entry.is_eliminated = True
-                        db.add(entry)
+            games = _apply_game_updates(db, games_payload)
+
+            # Compute winners per game against one preloaded abbreviation map
+            team_ids = _team_ids_by_abbr(db, games)
+            winners = set()
+            for game in games:
+                winner = _compute_game_winner(db, game, team_ids)
+                if winner is not None:
+                    winners.add(winner)
+
+            db.flush()
+            processed_picks = db.execute(
+                select(func.count()).select_from(Pick).where(Pick.week_id == week_id)
+            ).scalar_one()
+
+            # A pick wins when its team won any finalized game; everything else (ties, teams that
+            # did not play, unknown teams) is a loss.
+            is_win = Pick.team_id.in_(winners) if winners else None
+            is_loss = or_(Pick.team_id.is_(None), Pick.team_id.not_in(winners)) if winners else true()
+            _apply_pick_results(db, week_id, is_win, is_loss)
+
+            # Results changed: rebuild the stored reveal snapshot in the same transaction
+            refresh_reveal_snapshot(db, week_id)
 
     except SQLAlchemyError as e:
         raise FinalizeError(str(e))
 
+    # Pick results and eliminations changed for every entry in the week
+    invalidate_all_dashboards()
     return {"status": "ok", "processed_games": len(games_payload), "processed_picks": processed_picks}
@@ -1,60 +1,121 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from app.models.week import Week
 from app.models.entry import Entry
 from app.models.pick import Pick
 from sqlalchemy import select
 from typing import Tuple
+from app.models.history_matrix_row import HistoryMatrixRow
+from app.services.history_matrix import history_matrix_version
 
 
-def get_history_matrix(db: Session, season_year: int = None) -> Dict:
-    """Return a dict matching HistoryMatrixResponse: {weeks: [week_numbers], entries: [{entry_id, entry_name, picks: [...]}, ...]}"""
+MAX_PAGE_SIZE = 1000
+
 
-    # Fetch weeks ordered by season_year, week_number. Optionally filter by season_year
-    q = db.query(Week)
+def _weeks_in_scope(db: Session, season_year: Optional[int]) -> List[Tuple[int, int]]:
+    """(week_id, week_number) ordered by season_year, week_number."""
+    stmt = select(Week.id, Week.week_number)
     if season_year is not None:
-        q = q.filter(Week.season_year == season_year)
-    weeks = q.order_by(Week.season_year, Week.week_number).all()
-    week_ids = [w.id for w in weeks]
-    week_numbers = [w.week_number for w in weeks]
+        stmt = stmt.where(Week.season_year == season_year)
+    return [(r[0], r[1]) for r in db.execute(stmt.order_by(Week.season_year, Week.week_number))]
+
+
+def get_history_page(
+    db: Session,
+    season_year: Optional[int] = None,
+    after_entry_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    columnar: bool = False,
+) -> Dict:
+    """Return one page of the history matrix, entries ordered by id after `after_entry_id`.
 
-    # Map week id to its position index
-    week_index = {wid: idx for idx, wid in enumerate(week_ids)}
+    Reads the maintained `history_matrix_rows` (one row per entry, see
+    app/services/history_matrix.py), so no `picks` aggregation runs on the request path. Row
+    format matches `get_history_matrix`; columnar format returns parallel `entry_ids` /
+    `entry_names` arrays and a flat row-major `team_ids` grid of `len(entry_ids) * len(weeks)`
+    cells. Both carry `version` (pass it back as `since_version`) and `next_after_entry_id`
+    (None on the last page).
+    """
+    version = history_matrix_version(db)
+    weeks = _weeks_in_scope(db, season_year)
+    week_index = {str(wid): idx for idx, (wid, _) in enumerate(weeks)}
+    n_weeks = len(weeks)
 
-    # Fetch entries for the season (if season_year supplied, use it; otherwise include all)
-    eq = db.query(Entry)
+    stmt = select(HistoryMatrixRow.entry_id, HistoryMatrixRow.entry_name, HistoryMatrixRow.picks)
     if season_year is not None:
-        eq = eq.filter(Entry.season_year == season_year)
-    entries = eq.order_by(Entry.id).all()
-
-    # Pre-build entry rows with empty picks list sized to weeks
-    entry_rows = {}
-    for e in entries:
-        entry_rows[e.id] = {
-            "entry_id": e.id,
-            "entry_name": e.name,
-            "picks": [None] * len(week_ids),
-        }
-
-    if week_ids and entries:
-        # Fetch all picks for those entries and weeks in a single query
-        picks = (
-            db.query(Pick)
-            .filter(Pick.week_id.in_(week_ids))
-            .filter(Pick.entry_id.in_(list(entry_rows.keys())))
-            .all()
-        )
-
-        for p in picks:
-            e_row = entry_rows.get(p.entry_id)
-            if e_row is None:
-                continue
-            idx = week_index.get(p.week_id)
-            if idx is None:
-                continue
-            e_row["picks"][idx] = p.team_id
-
-    return {"weeks": week_numbers, "entries": list(entry_rows.values())}
+        stmt = stmt.where(HistoryMatrixRow.season_year == season_year)
+    if after_entry_id is not None:
+        stmt = stmt.where(HistoryMatrixRow.entry_id > after_entry_id)
+    stmt = stmt.order_by(HistoryMatrixRow.entry_id)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = db.execute(stmt).all()
+    next_after = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_after = rows[-1][0]
+
+    grid: List[Optional[int]] = [None] * (len(rows) * n_weeks)
+    for i, (_, _, picks) in enumerate(rows):
+        base = i * n_weeks
+        for week_id, team_id in (picks or {}).items():
+            col = week_index.get(week_id)
+            if col is not None:
+                grid[base + col] = team_id
+
+    result = {"weeks": [num for _, num in weeks]}
+    if columnar:
+        result.update(entry_ids=[r[0] for r in rows], entry_names=[r[1] for r in rows], team_ids=grid)
+    else:
+        result["entries"] = [
+            {"entry_id": eid, "entry_name": name, "picks": grid[i * n_weeks:(i + 1) * n_weeks]}
+            for i, (eid, name, _) in enumerate(rows)
+        ]
+    result.update(version=version, next_after_entry_id=next_after)
+    return result
+
+
+def get_history_delta(db: Session, since_version: int, season_year: Optional[int] = None) -> Dict:
+    """Return the cells of entries changed since `since_version` as parallel arrays.
+
+    `changes` holds `entry_ids`, `entry_names`, `week_indexes` (into `weeks`) and `team_ids`
+    for every pick of each matrix row stamped after `since_version` (an indexed range scan on
+    `(season_year, version)`). A `since_version` ahead of the current watermark (an older
+    version scheme, or a lagging replica) resends every row. Deleted entries are not reported;
+    clients should do a full fetch when they need to drop rows.
+    """
+    version = history_matrix_version(db)
+    if since_version > version:
+        since_version = 0
+    weeks = _weeks_in_scope(db, season_year)
+    week_index = {str(wid): idx for idx, (wid, _) in enumerate(weeks)}
+    changes: Dict[str, List] = {"entry_ids": [], "entry_names": [], "week_indexes": [], "team_ids": []}
+    stmt = (
+        select(HistoryMatrixRow.entry_id, HistoryMatrixRow.entry_name, HistoryMatrixRow.picks)
+        .where(HistoryMatrixRow.version > since_version)
+        .order_by(HistoryMatrixRow.entry_id)
+    )
+    if season_year is not None:
+        stmt = stmt.where(HistoryMatrixRow.season_year == season_year)
+    for entry_id, name, picks in db.execute(stmt):
+        cells = sorted((week_index[wid], team_id) for wid, team_id in (picks or {}).items() if wid in week_index)
+        for col, team_id in cells:
+            changes["entry_ids"].append(entry_id)
+            changes["entry_names"].append(name)
+            changes["week_indexes"].append(col)
+            changes["team_ids"].append(team_id)
+    return {
+        "weeks": [num for _, num in weeks],
+        "since_version": since_version,
+        "version": version,
+        "changes": changes,
+    }
+
+
+def get_history_matrix(db: Session, season_year: int = None) -> Dict:
+    """Return a dict matching HistoryMatrixResponse: {weeks: [week_numbers], entries: [{entry_id, entry_name, picks: [...]}, ...]}"""
+    page = get_history_page(db, season_year=season_year)
+    return {"weeks": page["weeks"], "entries": page["entries"]}
 
 
 def get_raw_matrix_records(db: Session, season_year: int = None) -> List[Tuple[int, str, int, int]]:
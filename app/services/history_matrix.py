@@ -0,0 +1,196 @@
+"""Maintenance of the precomputed season history matrix (`history_matrix_rows`).
+
+One row per entry holds that entry's `{week_id: team_id}` picks, so history reads are a single
+indexed range scan instead of an aggregation over `picks`. Writers keep it current inside their
+own transaction:
+
+- `record_entry` / `remove_entry` from the entry service, `record_entries` from the legacy importer,
+- `record_pick` / `record_picks` from the pick service and the legacy importer.
+
+Finalize and result resolution only change `picks.result`, which the matrix does not carry.
+
+Each writing transaction stamps the rows it changes with a version (see `next_version`) that
+never takes a lock of its own:
+
+- Postgres: the writer's transaction id. Reads report `history_matrix_version`, the reader
+  snapshot's xmin minus one; every transaction at or below it has finished, so a later
+  `version > since` scan cannot miss a change that was still in flight.
+- SQLite: one database-wide writer lock already serializes writers, so the next value of the
+  single-row `history_matrix_clock` is commit-ordered at no extra cost.
+
+`since_version` deltas are an indexed range scan on `(season_year, version)`.
+
+Reads trust the rows and never touch `picks`. Anything that bypasses those paths (raw SQL,
+direct ORM inserts, restores) must be followed by `rebuild_history_matrix`, exposed as
+`python scripts/rebuild_history_matrix.py`, with `verify_history_matrix` checking the rows
+against `get_raw_matrix_records`.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry
+from app.models.history_matrix_row import HistoryMatrixClock, HistoryMatrixRow
+from app.models.pick import Pick
+from app.models.week import Week
+
+
+def _xid_versions(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def next_version(db: Session) -> int:
+    """Return the version the caller's transaction stamps on the matrix rows it changes."""
+    if _xid_versions(db):
+        return int(db.execute(text("SELECT pg_current_xact_id()::text::bigint")).scalar_one())
+    bump = (
+        update(HistoryMatrixClock)
+        .where(HistoryMatrixClock.id == 1)
+        .values(version=HistoryMatrixClock.version + 1)
+        .returning(HistoryMatrixClock.version)
+    )
+    return db.execute(bump).scalar_one()
+
+
+def record_entry(db: Session, entry: Entry) -> None:
+    """Create or rename the matrix row for `entry` (entry must be flushed)."""
+    record_entries(db, [(entry.id, entry.season_year, entry.name)])
+
+
+def record_entries(db: Session, entries: Iterable[Tuple[int, int, str]]) -> None:
+    """Batch form of `record_entry`: `(entry_id, season_year, name)` tuples."""
+    entries = {e[0]: e for e in entries}
+    if not entries:
+        return
+    stmt = select(HistoryMatrixRow).where(HistoryMatrixRow.entry_id.in_(entries))
+    rows = {r.entry_id: r for r in db.execute(stmt).scalars()}
+    for entry_id, season, name in entries.values():
+        row = rows.get(entry_id)
+        if row is None:
+            db.add(HistoryMatrixRow(entry_id=entry_id, season_year=season, entry_name=name, picks={}, pick_count=0, version=0))
+        else:
+            row.entry_name = name
+            row.season_year = season
+
+
+def remove_entry(db: Session, entry_id: int) -> None:
+    db.execute(delete(HistoryMatrixRow).where(HistoryMatrixRow.entry_id == entry_id))
+
+
+def record_pick(db: Session, pick: Pick, is_new: bool) -> None:
+    """Fold a created (`is_new`) or re-pointed pick into its entry's row (pick must be flushed)."""
+    record_picks(db, [(pick.entry_id, pick.week_id, pick.team_id, is_new)])
+
+
+def record_picks(db: Session, changes: Iterable[Tuple[int, int, Optional[int], bool]]) -> None:
+    """Batch form of `record_pick`: `(entry_id, week_id, team_id, is_new)` tuples."""
+    changes = list(changes)
+    if not changes:
+        return
+    entry_ids = {c[0] for c in changes}
+
+    def load():
+        stmt = select(HistoryMatrixRow).where(HistoryMatrixRow.entry_id.in_(entry_ids))
+        return {r.entry_id: r for r in db.execute(stmt).scalars()}
+
+    rows = load()
+    missing = entry_ids - rows.keys()
+    if missing:
+        # Rebuilt rows already include the (flushed) changes; the rebuild detaches the loaded rows
+        _rebuild(db, Entry.id.in_(missing), HistoryMatrixRow.entry_id.in_(missing))
+        entry_ids -= missing
+        rows = load() if entry_ids else {}
+    version = next_version(db)
+    for entry_id, week_id, team_id, is_new in changes:
+        row = rows.get(entry_id)
+        if row is None:
+            continue
+        picks = dict(row.picks or {})
+        picks[str(week_id)] = team_id
+        # Reassign so the JSON column is marked dirty
+        row.picks = picks
+        if is_new:
+            row.pick_count = (row.pick_count or 0) + 1
+        row.version = version
+
+
+def _rebuild(db: Session, entry_filter, row_filter) -> int:
+    # Rebuilt rows may differ from what clients hold, so they all count as changed
+    version = next_version(db)
+    stmt = (
+        select(Entry.id, Entry.season_year, Entry.name, Pick.id, Pick.week_id, Pick.team_id)
+        .outerjoin(Pick, Pick.entry_id == Entry.id)
+        .order_by(Entry.id)
+    )
+    if entry_filter is not None:
+        stmt = stmt.where(entry_filter)
+    rows: Dict[int, Dict[str, Any]] = {}
+    for entry_id, season, name, pick_id, week_id, team_id in db.execute(stmt):
+        row = rows.get(entry_id)
+        if row is None:
+            row = rows[entry_id] = {"entry_id": entry_id, "season_year": season, "entry_name": name, "picks": {}, "pick_count": 0, "version": 0}
+        if pick_id is not None:
+            row["picks"][str(week_id)] = team_id
+            row["pick_count"] += 1
+            row["version"] = version
+
+    dstmt = delete(HistoryMatrixRow)
+    if row_filter is not None:
+        dstmt = dstmt.where(row_filter)
+    # Objects for rows we are about to replace must not be flushed over the new ones
+    for obj in [o for o in (*db.identity_map.values(), *db.new) if isinstance(o, HistoryMatrixRow)]:
+        db.expunge(obj)
+    db.execute(dstmt)
+    if rows:
+        db.execute(insert(HistoryMatrixRow), list(rows.values()))
+    return len(rows)
+
+
+def _season_filters(season_year: Optional[int]):
+    if season_year is None:
+        return None, None
+    return Entry.season_year == season_year, HistoryMatrixRow.season_year == season_year
+
+
+def rebuild_history_matrix(db: Session, season_year: Optional[int] = None) -> int:
+    """Recompute the rows for a season (or everything) from `entries` + `picks` and commit."""
+    entry_filter, row_filter = _season_filters(season_year)
+    count = _rebuild(db, entry_filter, row_filter)
+    db.commit()
+    return count
+
+
+def history_matrix_version(db: Session) -> int:
+    """Watermark for `since_version`: no transaction stamped at or below it is still running.
+
+    Take it before reading the rows it is returned with; a row committed in between is then
+    sent again by the next delta rather than skipped.
+    """
+    if _xid_versions(db):
+        return int(db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint - 1")).scalar_one())
+    return int(db.execute(select(HistoryMatrixClock.version).where(HistoryMatrixClock.id == 1)).scalar_one())
+
+
+def verify_history_matrix(db: Session, season_year: Optional[int] = None) -> Dict[str, Any]:
+    """Compare stored rows with `get_raw_matrix_records`; returns the ids of entries that differ."""
+    from app.services.history import get_raw_matrix_records
+
+    wstmt = select(Week.id, Week.week_number)
+    if season_year is not None:
+        wstmt = wstmt.where(Week.season_year == season_year)
+    number_of = dict(db.execute(wstmt).all())
+    expected: Dict[int, Dict[str, Any]] = {}
+    for entry_id, _name, week_number, team_id in get_raw_matrix_records(db, season_year=season_year):
+        expected.setdefault(entry_id, {})[week_number] = team_id
+
+    stmt = select(HistoryMatrixRow.entry_id, HistoryMatrixRow.picks)
+    if season_year is not None:
+        stmt = stmt.where(HistoryMatrixRow.season_year == season_year)
+    mismatched = []
+    for entry_id, picks in db.execute(stmt):
+        stored = {number_of[int(wid)]: team for wid, team in (picks or {}).items() if int(wid) in number_of}
+        if stored != expected.pop(entry_id, {}):
+            mismatched.append(entry_id)
+    mismatched.extend(eid for eid, picks in expected.items() if picks)
+    return {"ok": not mismatched, "mismatched_entries": sorted(mismatched)}
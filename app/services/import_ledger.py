@@ -0,0 +1,97 @@
+"""Checkpoint ledger for legacy imports (`import_files` / `import_chunks`).
+
+`BulkImporter` given an `ImportLedger` commits each chunk together with its ledger row, so a run
+that dies midway keeps every applied chunk and a re-run skips them by index and content hash
+instead of re-staging them. Once every chunk is in, the file's fingerprint (content hash of the
+whole export) is stored; `is_current` lets the import script skip an unchanged file before
+reading it at all.
+
+A chunk with records whose references did not resolve (user, week, entry or team not imported
+yet) is written but not recorded, and its file finishes `incomplete` without a fingerprint, so
+the next run stages those chunks again once the referenced rows exist.
+
+Chunk hashes are compared per index, so an append-only export re-applies only its new tail. They
+are only comparable between runs with the same chunk size; changing it starts the file over.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import IO, Dict, Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.import_ledger import ImportChunk, ImportFile
+
+_BLOCK = 1024 * 1024
+
+
+def chunk_hash(records: Iterable[dict]) -> str:
+    canonical = json.dumps(list(records), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def stream_fingerprint(stream: IO[bytes]) -> str:
+    """sha256 of a binary stream, read in blocks."""
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(_BLOCK), b""):
+        digest.update(block)
+    return "sha256:" + digest.hexdigest()
+
+
+class ImportLedger:
+    """Ledger state of one source file for one import run."""
+
+    def __init__(self, db: Session, source: str, kind: str, chunk_size: int, fingerprint: Optional[str] = None):
+        self.db = db
+        self.source = source
+        self.kind = kind
+        self.chunk_size = chunk_size
+        self.fingerprint = fingerprint
+        self.applied: Dict[int, str] = {}
+        self.chunks = 0
+
+    def is_current(self) -> bool:
+        """True if this exact content (same fingerprint and kind) was fully imported before."""
+        if self.fingerprint is None:
+            return False
+        row = self.db.get(ImportFile, self.source)
+        return row is not None and row.status == "completed" and row.kind == self.kind and row.fingerprint == self.fingerprint
+
+    def begin(self) -> None:
+        """Mark the file running and load the chunks earlier runs applied (commits)."""
+        row = self.db.get(ImportFile, self.source)
+        if row is None:
+            row = ImportFile(source=self.source, kind=self.kind, chunk_size=self.chunk_size)
+            self.db.add(row)
+        elif row.kind != self.kind or row.chunk_size != self.chunk_size:
+            self.db.execute(delete(ImportChunk).where(ImportChunk.source == self.source))
+            row.kind, row.chunk_size = self.kind, self.chunk_size
+        row.status, row.fingerprint, row.completed_at = "running", None, None
+        self.db.commit()
+        stmt = select(ImportChunk.chunk_index, ImportChunk.chunk_hash).where(ImportChunk.source == self.source)
+        self.applied = dict(self.db.execute(stmt).all())
+        self.chunks = 0
+
+    def is_applied(self, index: int, digest: str) -> bool:
+        self.chunks = max(self.chunks, index + 1)
+        return self.applied.get(index) == digest
+
+    def record(self, index: int, digest: str, records: int) -> None:
+        """Stage the ledger row for an applied chunk; the caller commits it with the chunk's rows."""
+        self.chunks = max(self.chunks, index + 1)
+        self.db.merge(ImportChunk(source=self.source, chunk_index=index, chunk_hash=digest, records=records, applied_at=datetime.now(timezone.utc)))
+        self.applied[index] = digest
+
+    def finish(self, records: int, complete: bool = True) -> None:
+        """Drop chunks past the end (the file shrank), store the fingerprint and commit.
+
+        An incomplete file (some chunks left unrecorded) gets no fingerprint, so `is_current`
+        never skips it.
+        """
+        self.db.execute(delete(ImportChunk).where(ImportChunk.source == self.source, ImportChunk.chunk_index >= self.chunks))
+        row = self.db.get(ImportFile, self.source)
+        row.status, row.fingerprint = ("completed", self.fingerprint) if complete else ("incomplete", None)
+        row.records = records
+        row.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
@@ -0,0 +1,445 @@
+"""Set-based import of the legacy JSON exports (teams, users, weeks, games, entries, picks).
+
+Used by scripts/import_from_gcs.py. For each file `BulkImporter.import_records`
+
+- loads the lookup maps it needs (teams by abbreviation, users by email, weeks by
+  season/number, existing rows by natural key) once, one statement each,
+- normalizes records in chunks of `chunk_size`, skipping malformed or unresolvable ones,
+- writes only new or changed rows: `INSERT ... ON CONFLICT` batches where the table has a
+  unique key (teams, users, entries, picks), and bulk INSERT / UPDATE-by-id against the
+  preloaded map where it has none (weeks, games; inserted rows are added to the map from
+  `RETURNING`, so later chunks see them),
+- commits once per file, so a failure leaves the file's rows untouched.
+
+With an `ImportLedger` (app/services/import_ledger.py) each chunk is committed together with
+its ledger row instead, and chunks an earlier run already applied are skipped unstaged, so an
+interrupted import resumes where it stopped. Records whose user, week, entry or team is not in
+the database yet are counted as `unresolved`; their chunks are not recorded as applied, so a
+re-run after the missing rows were imported picks them up.
+
+In dry-run mode records are only validated and counted; the database is not read.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry
+from app.models.game import Game
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.history_matrix import record_entries, record_picks
+from app.services.import_ledger import ImportLedger, chunk_hash
+from app.services.used_teams import rebuild_used_teams
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("teams", "users", "weeks", "games", "entries", "picks")
+DEFAULT_CHUNK_SIZE = 1000
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def kind_for_filename(name: str) -> Optional[str]:
+    """Map an export file name (e.g. `picks_2025.json`) to its record kind by prefix."""
+    base = name.rsplit("/", 1)[-1].lower()
+    return next((k for k in KINDS if base.startswith(k)), None)
+
+
+def parse_iso_to_utc(dt_str: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 string (optionally ending in Z) to a naive UTC datetime, or None."""
+    if not dt_str:
+        return None
+    try:
+        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00") if dt_str.endswith("Z") else dt_str)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _chunks(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for obj in records:
+        chunk.append(obj)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _first(obj: dict, *keys: str) -> Any:
+    for key in keys:
+        value = obj.get(key)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def _log_progress(kind: str, report: Dict[str, Any]) -> None:
+    logger.info(
+        "%s: %d records (%d created, %d updated, %d skipped), %.0f records/s",
+        kind, report["records"], report["created"], report["updated"], report["skipped"], report["records_per_sec"],
+    )
+
+
+class BulkImporter:
+    """Import legacy records into `db`, one transaction per `import_records` call."""
+
+    def __init__(
+        self,
+        db: Optional[Session],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = _log_progress,
+        ledger: Optional[ImportLedger] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.progress = progress
+        # ignored for dry runs, which never write
+        self.ledger = None if dry_run else ledger
+        self.unresolved = 0
+
+    def _unresolved(self, message: str, *args: Any) -> None:
+        """Log a reference that doesn't resolve (yet); keeps the current chunk out of the ledger."""
+        logger.warning(message, *args)
+        self.unresolved += 1
+
+    # -- writes ---------------------------------------------------------------------------
+
+    def _upsert(
+        self, model, rows: List[Dict[str, Any]], key: Tuple[str, ...], update_cols: Tuple[str, ...], returning: Tuple[Any, ...] = ()
+    ) -> List[Any]:
+        """`INSERT ... ON CONFLICT (key) DO UPDATE SET update_cols` for a batch of uniform rows.
+
+        Returns the `returning` columns of every upserted row, if any were asked for.
+        """
+        if not rows:
+            return []
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:  # pragma: no cover - only Postgres and SQLite are deployed
+            raise RuntimeError(f"Bulk upsert is not implemented for {dialect}")
+        stmt = dialect_insert(model.__table__)
+        stmt = stmt.on_conflict_do_update(index_elements=list(key), set_={c: stmt.excluded[c] for c in update_cols})
+        if not returning:
+            self.db.execute(stmt, rows)
+            return []
+        return self.db.execute(stmt.returning(*returning, sort_by_parameter_order=True), rows).all()
+
+    def _insert_update(self, model, inserts: List[Dict[str, Any]], updates: List[Dict[str, Any]], returning: Tuple[Any, ...]) -> List[Any]:
+        """Plain bulk INSERT / UPDATE by primary key, for tables without a natural unique key.
+
+        Returns the `returning` columns of the inserted rows, in insert order, so the caller can
+        add them to its lookup map before the next chunk is staged.
+        """
+        created: List[Any] = []
+        if inserts:
+            stmt = insert(model.__table__).returning(*returning, sort_by_parameter_order=True)
+            created = self.db.execute(stmt, inserts).all()
+        if updates:
+            self.db.execute(update(model), updates)
+        return created
+
+    # -- per-kind staging -----------------------------------------------------------------
+    #
+    # Each `_stage_<kind>` normalizes one record and returns `(key, row, status)` where status is
+    # "created", "updated" or "unchanged", or None when the record must be skipped. The matching
+    # `_write_<kind>` flushes the staged created/updated rows of a chunk.
+
+    def _load_teams(self) -> None:
+        self.teams = {abbr: (tid, name) for tid, abbr, name in self.db.execute(select(Team.id, Team.abbreviation, Team.name))}
+
+    def _stage_teams(self, obj: dict):
+        abbr, name = obj.get("abbreviation"), obj.get("name")
+        if not abbr or not name:
+            logger.warning("Skipping malformed team record: %s", obj)
+            return None
+        row = {"abbreviation": abbr, "name": name, "city": obj.get("city"), "conference": obj.get("conference"), "division": obj.get("division")}
+        if self.dry_run:
+            return abbr, row, "created"
+        existing = self.teams.get(abbr)
+        if existing is None:
+            return abbr, row, "created"
+        return abbr, row, "unchanged" if existing[1] == name else "updated"
+
+    def _write_teams(self, rows):
+        # Matches the per-row importer: only the name of an existing team is refreshed
+        self._upsert(Team, rows, ("abbreviation",), ("name",))
+
+    def _load_users(self) -> None:
+        self.users = {
+            r.email: r
+            for r in self.db.execute(select(User.id, User.email, User.first_name, User.last_name, User.phone_number))
+        }
+
+    def _stage_users(self, obj: dict):
+        email = obj.get("email")
+        if not email:
+            logger.warning("Skipping malformed user record: %s", obj)
+            return None
+        first = _first(obj, "first_name", "firstName", "given_name")
+        last = _first(obj, "last_name", "lastName", "family_name")
+        phone = _first(obj, "phone", "phone_number")
+        existing = None if self.dry_run else self.users.get(email)
+        if existing is None:
+            row = {"email": email, "hashed_password": obj.get("hashed_password") or "", "first_name": first, "last_name": last, "phone_number": phone}
+            return email, row, "created"
+        # Provided fields overwrite, missing ones keep the stored value
+        merged = {
+            "first_name": first or existing.first_name,
+            "last_name": last or existing.last_name,
+            "phone_number": phone or existing.phone_number,
+        }
+        status = "unchanged" if merged == {"first_name": existing.first_name, "last_name": existing.last_name, "phone_number": existing.phone_number} else "updated"
+        return email, {"email": email, "hashed_password": "", **merged}, status
+
+    def _write_users(self, rows):
+        self._upsert(User, rows, ("email",), ("first_name", "last_name", "phone_number"))
+
+    def _load_weeks(self) -> None:
+        self.weeks = {(s, n): (wid, lock) for wid, s, n, lock in self.db.execute(select(Week.id, Week.season_year, Week.week_number, Week.lock_time))}
+
+    def _stage_weeks(self, obj: dict):
+        season, number = _first(obj, "season_year", "season"), _first(obj, "week_number", "week")
+        if season is None or number is None:
+            logger.warning("Skipping malformed week record: %s", obj)
+            return None
+        lock_time = parse_iso_to_utc(_first(obj, "lock_time", "lockTime"))
+        existing = None if self.dry_run else self.weeks.get((season, number))
+        if existing is None:
+            row = {"season_year": season, "week_number": number, "is_current": bool(obj.get("is_current", False)), "lock_time": lock_time, "is_locked": False}
+            return (season, number), row, "created"
+        if lock_time and existing[1] != lock_time:
+            return (season, number), {"id": existing[0], "lock_time": lock_time}, "updated"
+        return (season, number), None, "unchanged"
+
+    def _write_weeks(self, rows):
+        returning = (Week.id, Week.season_year, Week.week_number, Week.lock_time)
+        for wid, season, number, lock in self._insert_update(Week, [r for r in rows if "id" not in r], [r for r in rows if "id" in r], returning):
+            self.weeks[(season, number)] = (wid, lock)
+
+    def _load_games(self) -> None:
+        self._load_teams()
+        self._load_weeks()
+        self.games = {
+            (r.week_id, r.start_time, r.home_team_abbr, r.away_team_abbr): r
+            for r in self.db.execute(
+                select(Game.id, Game.week_id, Game.start_time, Game.home_team_abbr, Game.away_team_abbr, Game.home_team_id, Game.away_team_id)
+            )
+        }
+
+    def _stage_games(self, obj: dict):
+        season, number = _first(obj, "season_year", "season"), _first(obj, "week_number", "week")
+        if season is None or number is None:
+            logger.warning("Skipping malformed game record (missing season/week): %s", obj)
+            return None
+        start_time = parse_iso_to_utc(_first(obj, "start_time", "startTime"))
+        home, away = _first(obj, "home_team_abbr", "home_abbr"), _first(obj, "away_team_abbr", "away_abbr")
+        if not home or not away or not start_time:
+            logger.warning("Skipping malformed game record (missing team or time): %s", obj)
+            return None
+        if self.dry_run:
+            return (season, number, start_time, home, away), None, "created"
+        week = self.weeks.get((season, number))
+        if week is None:
+            self._unresolved("Week not found for game: season=%s week=%s", season, number)
+            return None
+        home_id = self.teams.get(home, (None,))[0]
+        away_id = self.teams.get(away, (None,))[0]
+        if home_id is None or away_id is None:
+            # Stored by abbreviation; a re-run after the teams import fills in the ids
+            self._unresolved("Team not found for game: %s @ %s", away, home)
+        key = (week[0], start_time, home, away)
+        existing = self.games.get(key)
+        if existing is None:
+            row = {
+                "week_id": week[0], "start_time": start_time, "home_team_abbr": home, "away_team_abbr": away,
+                "home_team_id": home_id, "away_team_id": away_id, "status": obj.get("status", "scheduled"),
+            }
+            return key, row, "created"
+        # Resolved team ids fill in or correct the stored ones; unresolved ones never clear them
+        new_home = home_id if home_id is not None else existing.home_team_id
+        new_away = away_id if away_id is not None else existing.away_team_id
+        if (new_home, new_away) == (existing.home_team_id, existing.away_team_id):
+            return key, None, "unchanged"
+        return key, {"id": existing.id, "home_team_id": new_home, "away_team_id": new_away}, "updated"
+
+    def _write_games(self, rows):
+        returning = (Game.id, Game.week_id, Game.start_time, Game.home_team_abbr, Game.away_team_abbr, Game.home_team_id, Game.away_team_id)
+        for r in self._insert_update(Game, [r for r in rows if "id" not in r], [r for r in rows if "id" in r], returning):
+            self.games[(r.week_id, r.start_time, r.home_team_abbr, r.away_team_abbr)] = r
+
+    def _load_entries(self) -> None:
+        self.user_ids = {email: uid for uid, email in self.db.execute(select(User.id, User.email))}
+        self._load_weeks()
+        self.entries = {(r.user_id, r.season_year, r.name): r for r in self.db.execute(select(Entry.id, Entry.user_id, Entry.season_year, Entry.name, Entry.picks))}
+
+    def _stage_entries(self, obj: dict):
+        email = _first(obj, "user_email", "email")
+        season, number = _first(obj, "season_year", "season"), _first(obj, "week_number", "week")
+        name = _first(obj, "name", "entry_name")
+        picks = obj.get("picks")
+        if not email or season is None or number is None or not name:
+            logger.warning("Skipping malformed entry record: %s", obj)
+            return None
+        if self.dry_run:
+            return (email, season, name), None, "created"
+        user_id = self.user_ids.get(email)
+        if user_id is None:
+            self._unresolved("User not found for entry: %s", email)
+            return None
+        week = self.weeks.get((season, number))
+        if week is None:
+            self._unresolved("Week not found for entry: season=%s week=%s", season, number)
+            return None
+        key = (user_id, season, name)
+        existing = self.entries.get(key)
+        row = {
+            "user_id": user_id, "week_id": week[0], "name": name, "season_year": season,
+            "picks": picks or (existing.picks if existing else []),
+            "is_eliminated": bool(obj.get("is_eliminated", False)), "is_paid": bool(obj.get("is_paid", False)),
+        }
+        if existing is None:
+            return key, row, "created"
+        return key, row, "updated" if picks is not None and existing.picks != picks else "unchanged"
+
+    def _write_entries(self, rows):
+        # As before, only the picks JSON of an existing entry is refreshed
+        upserted = self._upsert(Entry, rows, ("user_id", "season_year", "name"), ("picks",), (Entry.id, Entry.season_year, Entry.name))
+        # Every entry gets its history matrix row now, even one whose picks never arrive
+        record_entries(self.db, upserted)
+
+    def _load_picks(self) -> None:
+        self._load_teams()
+        self._load_weeks()
+        self.user_ids = {email: uid for uid, email in self.db.execute(select(User.id, User.email))}
+        self.entry_ids = {(r.user_id, r.season_year, r.name): r.id for r in self.db.execute(select(Entry.id, Entry.user_id, Entry.season_year, Entry.name))}
+        self.known_entries = set(self.entry_ids.values())
+        self.picks = {(e, w): (pid, t) for pid, e, w, t in self.db.execute(select(Pick.id, Pick.entry_id, Pick.week_id, Pick.team_id))}
+        self.now = datetime.now(timezone.utc)
+
+    def _stage_picks(self, obj: dict):
+        entry_name, entry_id = obj.get("entry_name"), obj.get("entry_id")
+        email = _first(obj, "user_email", "email")
+        season, number = _first(obj, "season_year", "season"), _first(obj, "week_number", "week")
+        abbr = _first(obj, "team_abbr", "team")
+        if season is None or number is None or (not entry_id and not (entry_name and email)):
+            logger.warning("Skipping malformed pick record: %s", obj)
+            return None
+        if self.dry_run:
+            return (entry_id or (email, entry_name), season, number), None, "created"
+        if entry_id:
+            entry_id = entry_id if entry_id in self.known_entries else None
+        else:
+            entry_id = self.entry_ids.get((self.user_ids.get(email), season, entry_name))
+        if entry_id is None:
+            self._unresolved("Entry not found for pick: %s", obj)
+            return None
+        week = self.weeks.get((season, number))
+        if week is None:
+            self._unresolved("Week not found for pick: season=%s week=%s", season, number)
+            return None
+        team_id = self.teams.get(abbr, (None,))[0] if abbr else None
+        if abbr and team_id is None:
+            self._unresolved("Team not found for pick: %s", abbr)
+        key = (entry_id, week[0])
+        existing = self.picks.get(key)
+        row = {"entry_id": entry_id, "week_id": week[0], "team_id": team_id, "team_abbr": abbr, "created_at": self.now, "updated_at": self.now}
+        if existing is None:
+            return key, row, "created"
+        if team_id is not None and existing[1] != team_id:
+            return key, row, "updated"
+        return key, None, "unchanged"
+
+    def _write_picks(self, rows):
+        self._upsert(Pick, rows, ("entry_id", "week_id"), ("team_id", "team_abbr", "updated_at"))
+        record_picks(self.db, [(r["entry_id"], r["week_id"], r["team_id"], (r["entry_id"], r["week_id"]) not in self.picks) for r in rows])
+        for r in rows:
+            self.picks[(r["entry_id"], r["week_id"])] = (None, r["team_id"])
+
+    # -- driver ---------------------------------------------------------------------------
+
+    def import_records(self, kind: str, records: Iterable[dict]) -> Dict[str, Any]:
+        """Import one file's records of `kind`; returns counts plus elapsed time and throughput."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown record kind {kind!r}")
+        stage = getattr(self, f"_stage_{kind}")
+        write = getattr(self, f"_write_{kind}")
+        report = {"kind": kind, "records": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "unresolved": 0, "resumed": 0}
+        ledger = self.ledger
+        self.unresolved = 0
+        started = time.perf_counter()
+
+        def finish_chunk():
+            elapsed = time.perf_counter() - started
+            report["elapsed_ms"] = round(elapsed * 1000, 1)
+            report["records_per_sec"] = round(report["records"] / elapsed, 1) if elapsed > 0 else 0.0
+            report["unresolved"] = self.unresolved
+            if self.progress is not None:
+                self.progress(kind, dict(report))
+
+        try:
+            if ledger is not None:
+                ledger.begin()
+            if not self.dry_run:
+                getattr(self, f"_load_{kind}")()
+            for index, chunk in enumerate(_chunks(records, self.chunk_size)):
+                digest = chunk_hash(chunk) if ledger is not None else None
+                if ledger is not None and ledger.is_applied(index, digest):
+                    # Written by an earlier run; its rows are already in the preloaded maps
+                    report["records"] += len(chunk)
+                    report["resumed"] += len(chunk)
+                    finish_chunk()
+                    continue
+                staged: Dict[Any, Dict[str, Any]] = {}
+                unresolved_before = self.unresolved
+                for obj in chunk:
+                    report["records"] += 1
+                    result = stage(obj)
+                    if result is None:
+                        report["skipped"] += 1
+                        continue
+                    key, row, status = result
+                    report[status] += 1
+                    if self.dry_run:
+                        logger.info("DRY-RUN: Would upsert %s %s", kind[:-1] if kind != "entries" else "entry", key)
+                    if row is not None and status != "unchanged":
+                        # Later records for the same key win, as they did with per-row commits
+                        staged[key] = row
+                if staged and not self.dry_run:
+                    write(list(staged.values()))
+                if ledger is not None:
+                    if self.unresolved == unresolved_before:
+                        ledger.record(index, digest, len(chunk))
+                    self.db.commit()
+                finish_chunk()
+            if report["records"] == 0:
+                finish_chunk()
+            if ledger is not None:
+                ledger.finish(report["records"], complete=not self.unresolved)
+            elif not self.dry_run:
+                self.db.commit()
+        except Exception:
+            if not self.dry_run:
+                self.db.rollback()
+            raise
+
+        # A resumed run may have applied picks before the rebuild of the interrupted one
+        if kind == "picks" and not self.dry_run and (report["created"] or report["updated"] or report["resumed"]):
+            # Legacy rows aren't checked against the season-repeat rule, so rebuild the index once
+            # (earliest pick wins) instead of claiming per row
+            rebuild_used_teams(self.db)
+        return report
@@ -0,0 +1,162 @@
+"""Lock-time cutover: freeze a week's picks and pre-build its reveal the moment it locks.
+
+`LockCutoverScheduler` sleeps until the earliest `lock_time` among unlocked weeks and then
+runs `cutover_week`, which
+
+- sets `Week.is_locked` (a conditional UPDATE, so concurrent workers flip it once), after
+  which pick/entry writes are rejected on the flag alone (app/services/week_lock.py), and
+- builds and stores the reveal snapshot (pick distribution, results, survivor counts) so the
+  first wave of reveal requests reads a stored row instead of aggregating picks.
+
+Sleeps are capped at `LOCK_CUTOVER_MAX_SLEEP_SECONDS` so lock times edited without calling
+`wake()` (scripts, other workers) are still picked up. It runs in-process as an asyncio task
+when `LOCK_CUTOVER_ENABLED` is set (see `app/main.py`), or standalone:
+`python -m app.services.lock_cutover`.
+"""
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.week import Week
+from app.services.reveal import build_reveal_snapshot
+from app.services.week_lock import as_utc
+
+logger = logging.getLogger(__name__)
+
+
+def _pending_locks(db: Session) -> List[Tuple[int, datetime]]:
+    # Only weeks that still have to lock; a handful per season
+    rows = db.execute(
+        select(Week.id, Week.lock_time).where(Week.is_locked == False, Week.lock_time.is_not(None))  # noqa: E712
+    ).all()
+    return [(week_id, as_utc(lock_time)) for week_id, lock_time in rows]
+
+
+def cutover_week(db: Session, week_id: int) -> Dict[str, Any]:
+    """Flip `week_id` to locked and store its reveal snapshot. Idempotent; commits."""
+    flipped = db.execute(
+        update(Week).where(Week.id == week_id, Week.is_locked == False).values(is_locked=True)  # noqa: E712
+    ).rowcount
+    snap = build_reveal_snapshot(db, week_id)
+    db.commit()
+    return {
+        "week_id": week_id,
+        "flipped": bool(flipped),
+        "snapshot_version": snap.version if snap is not None else None,
+    }
+
+
+def cutover_due_weeks(db: Session, now: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+    """Cut over every week whose lock time has passed; returns `(results, next_lock_time)`."""
+    now = now or datetime.now(timezone.utc)
+    results, upcoming = [], []
+    for week_id, lock_time in _pending_locks(db):
+        if lock_time <= now:
+            results.append(cutover_week(db, week_id))
+        else:
+            upcoming.append(lock_time)
+    return results, min(upcoming) if upcoming else None
+
+
+class LockCutoverScheduler:
+    """Wake at each week's lock time and run the cutover."""
+
+    def __init__(self, session_factory: Callable[[], Any] = SessionLocal, max_sleep: Optional[float] = None):
+        self.session_factory = session_factory
+        self.max_sleep = max_sleep if max_sleep is not None else settings.LOCK_CUTOVER_MAX_SLEEP_SECONDS
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {
+            "runs": 0,
+            "cutovers": 0,
+            "last_cutover": None,
+            "next_lock_at": None,
+            "last_error": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"running": self.running, **self._state}
+
+    def _tick(self, now: datetime) -> Tuple[List[Dict[str, Any]], Optional[datetime]]:
+        db = self.session_factory()
+        try:
+            return cutover_due_weeks(db, now)
+        finally:
+            db.close()
+
+    async def run_once(self) -> float:
+        """Cut over due weeks and return how long to sleep before the next check."""
+        now = datetime.now(timezone.utc)
+        results, next_lock = await asyncio.to_thread(self._tick, now)
+        with self._lock:
+            self._state["runs"] += 1
+            for r in results:
+                if r["flipped"]:
+                    self._state["cutovers"] += 1
+                    self._state["last_cutover"] = {**r, "at": now.isoformat()}
+                    logger.info("Week %s locked; reveal snapshot v%s stored", r["week_id"], r["snapshot_version"])
+            self._state["next_lock_at"] = next_lock.isoformat() if next_lock else None
+            self._state["last_error"] = None
+        if next_lock is None:
+            return self.max_sleep
+        return min(self.max_sleep, max(0.0, (next_lock - datetime.now(timezone.utc)).total_seconds()))
+
+    async def run(self) -> None:
+        """Run until `stop()` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        while not self._stopping:
+            try:
+                delay = await self.run_once()
+            except Exception as exc:
+                with self._lock:
+                    self._state["last_error"] = str(exc)
+                logger.exception("Lock cutover failed; retrying in %.0fs", self.max_sleep)
+                delay = self.max_sleep
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def wake(self) -> None:
+        """Re-plan now (lock times changed). Safe to call from request threads."""
+        loop, event = self._loop, self._wake
+        if loop is not None and event is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(event.set)
+
+    def start(self) -> None:
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self.wake()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+
+# Process-wide scheduler used by the app lifespan, the week routes and the metrics endpoint
+lock_cutover_scheduler = LockCutoverScheduler()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(lock_cutover_scheduler.run())
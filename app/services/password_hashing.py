@@ -0,0 +1,113 @@
+"""Bounded off-thread bcrypt for the auth endpoints.
+
+bcrypt is deliberately slow (~250ms at cost 12), and running it inside request threads lets a
+login stampede exhaust the worker threadpool and stall every other endpoint. The helpers here
+submit hashing/verification to a dedicated pool (`PASSWORD_HASH_EXECUTOR`: "process" by
+default, or "thread") with `PASSWORD_HASH_WORKERS` workers, and admit at most
+`PASSWORD_HASH_MAX_QUEUE` jobs at a time. Callers beyond that get `PasswordHashBusyError`
+immediately, which the routes turn into 429 + Retry-After instead of queueing unboundedly.
+
+`verify_and_update_password` also reports a replacement hash when the stored one was made
+with a different cost than `BCRYPT_ROUNDS`, so logins transparently migrate hashes.
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+
+class PasswordHashBusyError(Exception):
+    """Raised when the hashing queue is full; callers should shed load (HTTP 429)."""
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Worker entry points: module-level so they pickle into a process pool
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+_executor: Optional[Executor] = None
+_lock = threading.Lock()
+_stats = {"pending": 0, "peak_pending": 0, "submitted": 0, "completed": 0, "rejected": 0}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = settings.PASSWORD_HASH_WORKERS
+            if settings.PASSWORD_HASH_EXECUTOR == "thread":
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+            else:
+                _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def _admit() -> None:
+    with _lock:
+        if _stats["pending"] >= settings.PASSWORD_HASH_MAX_QUEUE:
+            _stats["rejected"] += 1
+            raise PasswordHashBusyError("Password hashing queue is full")
+        _stats["pending"] += 1
+        _stats["submitted"] += 1
+        _stats["peak_pending"] = max(_stats["peak_pending"], _stats["pending"])
+
+
+def _release() -> None:
+    with _lock:
+        _stats["pending"] -= 1
+        _stats["completed"] += 1
+
+
+async def _submit(fn, *args) -> Any:
+    _admit()
+    try:
+        future = _get_executor().submit(fn, *args)
+    except BaseException:
+        _release()
+        raise
+    # Release when the job finishes, not when the caller stops waiting: a cancelled request
+    # leaves its job running, and it must keep counting against PASSWORD_HASH_MAX_QUEUE
+    future.add_done_callback(lambda _: _release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str) -> str:
+    return await _submit(_hash, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_and_update_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Return `(valid, new_hash)`; `new_hash` is set when the stored hash should be replaced."""
+    return await _submit(_verify_and_update, password, hashed, settings.BCRYPT_ROUNDS)
+
+
+def password_hash_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            **_stats,
+            "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "executor": settings.PASSWORD_HASH_EXECUTOR,
+            "rounds": settings.BCRYPT_ROUNDS,
+        }
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
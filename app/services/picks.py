@@ -1,9 +1,30 @@
+"""Pick submission.
+
+Both write paths are built for the rush right before lock: one statement loads the entry,
+week lock state and the season-repeat check (a key probe into `used_teams`), the insert or
+update returns the row with RETURNING instead of a follow-up refresh, and duplicate
+entry/week picks and racing team reuse are left to the `uq_picks_entry_week` and
+`used_teams` keys rather than checked under a lock.
+
+`submit_picks` is the multi-entry form: it validates a whole batch against three set-wise reads
+and writes every valid item in one transaction, reporting a result per item.
+"""
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.entry import Entry
 from app.models.week import Week
 from app.models.pick import Pick
+from app.models.team import Team
+from app.models.used_team import UsedTeam
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+from app.services.dashboard import invalidate_dashboard
+from app.services.history_matrix import record_pick, record_picks
+from app.services.used_teams import claim_teams, is_used_team_conflict, team_used
+from app.services.week_lock import is_locked
+
+MAX_BATCH_PICKS = 100
 
 
 class PickConflict(ValueError):
@@ -14,74 +35,254 @@ class WeekLockedError(ValueError):
     pass
 
 
-def _is_week_locked(week: Week) -> bool:
-    if not week.lock_time:
+def _is_duplicate_pick(exc: IntegrityError) -> bool:
+    msg = str(exc.orig)
+    # Postgres names the constraint; SQLite lists the columns
+    return "uq_picks_entry_week" in msg or "picks.entry_id, picks.week_id" in msg
+
+
+def _missing_team(db: Session, exc: IntegrityError, team_ids: Collection[int]) -> bool:
+    """True if `exc` is a foreign-key failure caused by one of `team_ids` not existing.
+
+    SQLite does not say which key failed, so the teams are looked up (after the rollback).
+    """
+    if "foreign key" not in str(exc.orig).lower():
         return False
-    lock = week.lock_time
-    if lock.tzinfo is None:
-        lock = lock.replace(tzinfo=timezone.utc)
-    return datetime.now(timezone.utc) >= lock
+    found = set(db.execute(select(Team.id).where(Team.id.in_(set(team_ids)))).scalars())
+    return not set(team_ids) <= found
+
+
+def _conflict(db: Session, exc: IntegrityError, team_id: int) -> Exception:
+    """Map a failed pick write to the client error it stands for, or return `exc` itself."""
+    db.rollback()
+    if _is_duplicate_pick(exc):
+        return PickConflict("Pick for this entry and week already exists; use PATCH to update")
+    if is_used_team_conflict(exc):
+        return PickConflict("Team already picked by this entry in the season")
+    if _missing_team(db, exc, [team_id]):
+        return ValueError("Team not found")
+    return exc
+
+
+def _finish(db: Session, pick: Pick, user_id: int, season_year: int, is_new: bool) -> Pick:
+    try:
+        claim_teams(
+            db,
+            [(user_id, season_year, pick.team_id, pick.id, pick.entry_id, pick.week_id)],
+            repointed=() if is_new else (pick.id,),
+        )
+    except IntegrityError as e:
+        # another request took the team between our check and this write
+        raise _conflict(db, e, pick.team_id)
+    record_pick(db, pick, is_new=is_new)
+    # Every column came back via RETURNING; detach so commit doesn't expire them and force a refresh
+    db.expunge(pick)
+    db.commit()
+    invalidate_dashboard(user_id)
+    return pick
 
 
 def create_pick(db: Session, user_id: int, entry_id: int, week_id: int, team_id: int) -> Pick:
+    row = db.execute(
+        select(
+            Entry.user_id,
+            Entry.week_id,
+            Entry.season_year,
+            Week.id,
+            Week.is_locked,
+            Week.lock_time,
+            team_used(Entry.user_id, Entry.season_year, team_id),
+        )
+        .select_from(Entry)
+        .outerjoin(Week, Week.id == week_id)
+        .where(Entry.id == entry_id)
+    ).one_or_none()
+
     # verify entry ownership
-    entry = db.query(Entry).filter(Entry.id == entry_id).one_or_none()
-    if not entry:
+    if row is None:
         raise ValueError("Entry not found")
-    if entry.user_id != user_id:
+    owner_id, entry_week_id, season_year, found_week_id, locked, lock_time, already_used = row
+    if owner_id != user_id:
         raise ValueError("Not authorized to pick for this entry")
 
-    # verify week belongs to entry and lock status
-    week = db.query(Week).filter(Week.id == week_id).one_or_none()
-    if not week:
+    # verify week and lock status
+    if found_week_id is None:
         raise ValueError("Week not found")
-    if _is_week_locked(week):
+    if is_locked(locked, lock_time):
         raise WeekLockedError("Week is locked - cannot submit picks")
 
     # ensure entry.week_id matches provided week_id
-    if entry.week_id != week_id:
+    if entry_week_id != week_id:
         raise ValueError("Entry does not belong to the provided week")
 
-    # ensure team hasn't been previously picked by this entry this season
     # prevent the same user from picking the same team more than once in a season
-    previous = db.query(Pick).join(Entry, Pick.entry_id == Entry.id).filter(Entry.user_id == entry.user_id, Entry.season_year == entry.season_year, Pick.team_id == team_id).one_or_none()
-    if previous:
+    if already_used:
         raise PickConflict("Team already picked by this entry in the season")
 
-    # enforce unique entry/week at DB level via constraint; handle duplicates gracefully
-    existing = db.query(Pick).filter(Pick.entry_id == entry_id, Pick.week_id == week_id).one_or_none()
-    if existing:
-        raise PickConflict("Pick for this entry and week already exists; use PATCH to update")
-
-    pick = Pick(entry_id=entry_id, week_id=week_id, team_id=team_id)
-    db.add(pick)
-    db.commit()
-    db.refresh(pick)
-    return pick
+    # one pick per entry/week is enforced by uq_picks_entry_week
+    try:
+        pick = db.execute(
+            insert(Pick).values(entry_id=entry_id, week_id=week_id, team_id=team_id).returning(Pick)
+        ).scalar_one()
+    except IntegrityError as e:
+        raise _conflict(db, e, team_id)
+    return _finish(db, pick, user_id, season_year, is_new=True)
 
 
 def update_pick(db: Session, user_id: int, pick_id: int, team_id: int) -> Optional[Pick]:
-    pick = db.query(Pick).filter(Pick.id == pick_id).one_or_none()
-    if not pick:
+    row = db.execute(
+        select(
+            Entry.user_id,
+            Entry.season_year,
+            Week.is_locked,
+            Week.lock_time,
+            team_used(Entry.user_id, Entry.season_year, team_id, exclude_pick_id=pick_id),
+        )
+        .select_from(Pick)
+        .outerjoin(Entry, Entry.id == Pick.entry_id)
+        .outerjoin(Week, Week.id == Pick.week_id)
+        .where(Pick.id == pick_id)
+    ).one_or_none()
+    if row is None:
         return None
+    owner_id, season_year, locked, lock_time, already_used = row
     # verify ownership through entry
-    entry = db.query(Entry).filter(Entry.id == pick.entry_id).one_or_none()
-    if not entry or entry.user_id != user_id:
+    if owner_id is None or owner_id != user_id:
         raise ValueError("Not authorized to modify this pick")
-
-    week = db.query(Week).filter(Week.id == pick.week_id).one_or_none()
-    if _is_week_locked(week):
+    if is_locked(locked, lock_time):
         raise WeekLockedError("Week is locked - cannot modify picks")
 
-    # ensure no repeat of team in season
     # prevent the same user from picking the same team more than once in a season (excluding current pick)
-    previous = db.query(Pick).join(Entry, Pick.entry_id == Entry.id).filter(Entry.user_id == entry.user_id, Entry.season_year == entry.season_year, Pick.team_id == team_id, Pick.id != pick.id).one_or_none()
-    if previous:
+    if already_used:
         raise PickConflict("Team already picked by this entry in the season")
 
-    pick.team_id = team_id
-    pick.updated_at = datetime.now(timezone.utc)
-    db.add(pick)
-    db.commit()
-    db.refresh(pick)
-    return pick
+    try:
+        pick = db.execute(
+            update(Pick)
+            .where(Pick.id == pick_id)
+            .values(team_id=team_id, updated_at=datetime.now(timezone.utc))
+            .returning(Pick)
+        ).scalar_one()
+    except IntegrityError as e:
+        raise _conflict(db, e, team_id)
+    return _finish(db, pick, user_id, season_year, is_new=False)
+
+
+def _item_error(item: Dict[str, Any], code: int, message: str) -> Dict[str, Any]:
+    return {**item, "status": "error", "code": code, "error": message}
+
+
+def submit_picks(db: Session, user_id: int, items: Sequence[Tuple[int, int, int]]) -> Dict[str, Any]:
+    """Create or update picks for many `(entry_id, week_id, team_id)` items at once.
+
+    Applies the same rules as `create_pick` / `update_pick` (ownership, entry week, lock,
+    one team per user per season, counting earlier items in the batch). Items that fail are
+    reported with an HTTP-style `code` and skipped; the rest commit together. An existing pick
+    for the entry/week is re-pointed rather than rejected.
+    """
+    if len(items) > MAX_BATCH_PICKS:
+        raise ValueError(f"At most {MAX_BATCH_PICKS} picks per batch")
+    entry_ids = {entry_id for entry_id, _, _ in items}
+
+    entries = {
+        r[0]: r
+        for r in db.execute(
+            select(Entry.id, Entry.user_id, Entry.week_id, Entry.season_year, Week.is_locked, Week.lock_time)
+            .outerjoin(Week, Week.id == Entry.week_id)
+            .where(Entry.id.in_(entry_ids))
+        )
+    }
+    owned = {r[0] for r in entries.values() if r[1] == user_id}
+    seasons = {entries[e][3] for e in owned}
+    existing: Dict[Tuple[int, int], Tuple[int, Optional[int]]] = {}
+    # (season, team) -> the pick holding it; batch-created picks hold a placeholder key
+    holders: Dict[Tuple[int, int], Any] = {}
+    if owned:
+        for pick_id, entry_id, week_id, team_id in db.execute(
+            select(Pick.id, Pick.entry_id, Pick.week_id, Pick.team_id).where(Pick.entry_id.in_(owned))
+        ):
+            existing[(entry_id, week_id)] = (pick_id, team_id)
+        for season, team_id, pick_id in db.execute(
+            select(UsedTeam.season_year, UsedTeam.team_id, UsedTeam.pick_id).where(
+                UsedTeam.user_id == user_id, UsedTeam.season_year.in_(seasons)
+            )
+        ):
+            holders[(season, team_id)] = pick_id
+
+    now = datetime.now(timezone.utc)
+    results: List[Dict[str, Any]] = []
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    seen = set()
+    for entry_id, week_id, team_id in items:
+        item = {"entry_id": entry_id, "week_id": week_id, "team_id": team_id}
+        entry = entries.get(entry_id)
+        if entry is None:
+            results.append(_item_error(item, 400, "Entry not found"))
+            continue
+        _, owner_id, entry_week_id, season, locked, lock_time = entry
+        if owner_id != user_id:
+            results.append(_item_error(item, 400, "Not authorized to pick for this entry"))
+            continue
+        if entry_week_id != week_id:
+            results.append(_item_error(item, 400, "Entry does not belong to the provided week"))
+            continue
+        if is_locked(locked, lock_time):
+            results.append(_item_error(item, 403, "Week is locked - cannot submit picks"))
+            continue
+        if (entry_id, week_id) in seen:
+            results.append(_item_error(item, 409, "Duplicate entry/week in batch"))
+            continue
+        current = existing.get((entry_id, week_id))
+        if current is not None and current[1] == team_id:
+            seen.add((entry_id, week_id))
+            results.append({**item, "status": "unchanged", "pick_id": current[0]})
+            continue
+        holder = holders.get((season, team_id))
+        if holder is not None and (current is None or holder != current[0]):
+            results.append(_item_error(item, 409, "Team already picked by this entry in the season"))
+            continue
+
+        seen.add((entry_id, week_id))
+        if current is None:
+            holders[(season, team_id)] = ("new", entry_id, week_id)
+            inserts.append({"entry_id": entry_id, "week_id": week_id, "team_id": team_id, "created_at": now, "updated_at": now})
+            results.append({**item, "status": "created", "pick_id": None})
+        else:
+            if holders.get((season, current[1])) == current[0]:
+                del holders[(season, current[1])]
+            holders[(season, team_id)] = current[0]
+            updates.append({"id": current[0], "team_id": team_id, "updated_at": now})
+            results.append({**item, "status": "updated", "pick_id": current[0]})
+
+    if inserts or updates:
+        try:
+            if inserts:
+                created = {
+                    (r.entry_id, r.week_id): r.id
+                    for r in db.execute(insert(Pick).returning(Pick.id, Pick.entry_id, Pick.week_id), inserts)
+                }
+                for res in results:
+                    if res["status"] == "created":
+                        res["pick_id"] = created[(res["entry_id"], res["week_id"])]
+            if updates:
+                db.execute(update(Pick), updates)
+            written = [r for r in results if r["status"] in ("created", "updated")]
+            claim_teams(
+                db,
+                [(user_id, entries[r["entry_id"]][3], r["team_id"], r["pick_id"], r["entry_id"], r["week_id"]) for r in written],
+                repointed=[u["id"] for u in updates],
+            )
+            record_picks(db, [(r["entry_id"], r["week_id"], r["team_id"], r["status"] == "created") for r in written])
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            if _is_duplicate_pick(e) or is_used_team_conflict(e):
+                raise PickConflict("Picks changed while the batch was being submitted; retry")
+            if _missing_team(db, e, [r["team_id"] for r in results if r["status"] in ("created", "updated")]):
+                raise ValueError("Team not found")
+            raise
+        invalidate_dashboard(user_id)
+
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("created", "updated", "unchanged", "error")}
+    return {"results": results, **counts}
@@ -0,0 +1,108 @@
+"""Cached resolution of the authenticated user for request dependencies.
+
+`get_current_user` only needs a handful of user columns, so instead of loading the ORM
+`User` on every request we keep an immutable `UserPrincipal` per user id for a short TTL in
+the shared cache backend. Entries are tagged with the database URL as well, so switching
+databases (tests, scripts) never serves a principal from another database. Writers that
+change what a principal carries (`admin.patch_user`, password reset) call `invalidate_user`,
+which every worker sees.
+
+When `AUTH_TOKEN_CLAIMS` is enabled, login tokens also carry the principal fields and are
+verified statelessly (see `principal_from_claims`); changes then apply at token expiry.
+"""
+import threading
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.cache import get_cache
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    id: int
+    email: str
+    is_active: bool
+    is_admin: bool
+
+
+# Principals live in the shared cache backend (`app.services.cache`), so `invalidate_user` in
+# one worker is seen by all of them. Each value is tagged with the database URL and the current
+# generation; `clear_principal_cache` stores a new generation token.
+_KEY_PREFIX = "principal:"
+_GENERATION_KEY = _KEY_PREFIX + "generation"
+# Must outlive every entry TTL: a generation expiring back to None could revive older entries
+_GENERATION_TTL_SECONDS = 7 * 24 * 3600
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0, "invalidations": 0, "token_claims": 0}
+
+
+def _user_key(user_id: int) -> str:
+    return f"{_KEY_PREFIX}user:{user_id}"
+
+
+def principal_from_user(user: Any) -> UserPrincipal:
+    return UserPrincipal(
+        id=user.id,
+        email=user.email,
+        is_active=bool(user.is_active if user.is_active is not None else True),
+        is_admin=bool(user.is_admin),
+    )
+
+
+def token_claims(user: Any) -> Dict[str, Any]:
+    """Extra JWT claims that allow stateless verification of `user`."""
+    p = principal_from_user(user)
+    return {"email": p.email, "act": p.is_active, "adm": p.is_admin}
+
+
+def principal_from_claims(payload: Dict[str, Any]) -> Optional[UserPrincipal]:
+    """Build a principal from token claims, or None when the token does not carry them."""
+    if not settings.AUTH_TOKEN_CLAIMS or not {"email", "act", "adm"} <= payload.keys():
+        return None
+    with _LOCK:
+        _STATS["token_claims"] += 1
+    return UserPrincipal(id=int(payload["sub"]), email=payload["email"], is_active=bool(payload["act"]), is_admin=bool(payload["adm"]))
+
+
+def get_cached_principal(db_key: str, user_id: int) -> Optional[UserPrincipal]:
+    cache = get_cache()
+    generation = cache.get(_GENERATION_KEY)
+    entry = cache.get(_user_key(user_id))
+    with _LOCK:
+        if entry is not None and entry["db"] == db_key and entry["generation"] == generation:
+            _STATS["hits"] += 1
+            return UserPrincipal(**entry["principal"])
+        _STATS["misses"] += 1
+        return None
+
+
+def cache_principal(db_key: str, principal: UserPrincipal) -> None:
+    ttl = settings.AUTH_USER_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    cache = get_cache()
+    entry = {"db": db_key, "generation": cache.get(_GENERATION_KEY), "principal": asdict(principal)}
+    cache.set(_user_key(principal.id), entry, ttl)
+
+
+def invalidate_user(user_id: int) -> None:
+    with _LOCK:
+        _STATS["invalidations"] += 1
+    get_cache().delete(_user_key(user_id))
+
+
+def clear_principal_cache() -> None:
+    get_cache().set(_GENERATION_KEY, uuid.uuid4().hex, _GENERATION_TTL_SECONDS)
+
+
+def principal_cache_stats() -> Dict[str, Any]:
+    """Counters of this worker against the shared principal cache."""
+    with _LOCK:
+        lookups = _STATS["hits"] + _STATS["misses"]
+        return {
+            **_STATS,
+            "hit_rate": round(_STATS["hits"] / lookups, 4) if lookups else None,
+            "ttl_seconds": settings.AUTH_USER_CACHE_TTL_SECONDS,
+        }
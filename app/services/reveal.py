@@ -1,38 +1,138 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
+import hashlib
+import json
+import logging
 
-from sqlalchemy import select, func
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, func, and_, or_, case, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
 
+from app.db import require_primary
 from app.models.week import Week
 from app.models.game import Game
 from app.models.pick import Pick
 from app.models.team import Team
+from app.models.reveal_snapshot import RevealSnapshot
+from app.services.week_lock import is_week_locked
 
+logger = logging.getLogger(__name__)
 
-def _as_utc(dt: datetime) -> datetime:
-    if dt is None:
-        return dt
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
 
+def _normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Round-trip the payload through JSON so stored and live payloads look identical on the wire
+    (e.g. integer `pick_counts` keys become strings)."""
+    return json.loads(json.dumps(payload, default=str))
 
-def get_reveal_snapshot(db: Session, week_id: int) -> Dict[str, Any]:
-    """Return a reveal snapshot for the given week.
 
-    If now < week.lock_time, return a minimal payload with `locked: False` and
+def _payload_etag(payload: Dict[str, Any]) -> str:
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def compute_reveal_snapshot(db: Session, week_id: int) -> Dict[str, Any]:
+    """Compute a reveal snapshot for the given week straight from games and picks.
+
+    Until the week locks, return a minimal payload with `locked: False` and
     basic counts (or empty games). If lock time has passed, return aggregated
     pick distribution per game/team, game results, and survivor counts.
     """
     week = db.execute(select(Week).where(Week.id == week_id)).scalar_one_or_none()
     if week is None:
         return {"exists": False}
+    return _compute_for_week(db, week)
+
+
+def _team_join_condition(team, team_id_col, team_abbr_col):
+    """Join a Team alias on the canonical FK, falling back to the abbreviation snapshot for
+    legacy game rows that predate the team id columns."""
+    return or_(team.id == team_id_col, and_(team_id_col.is_(None), team.abbreviation == team_abbr_col))
+
+
+def _load_games_with_teams(db: Session, week_id: int) -> List[Tuple[Game, Optional[Team], Optional[Team]]]:
+    home = aliased(Team)
+    away = aliased(Team)
+    stmt = (
+        select(Game, home, away)
+        .outerjoin(home, _team_join_condition(home, Game.home_team_id, Game.home_team_abbr))
+        .outerjoin(away, _team_join_condition(away, Game.away_team_id, Game.away_team_abbr))
+        .where(Game.week_id == week_id)
+        .order_by(Game.start_time)
+    )
+    return [(g, h, a) for g, h, a in db.execute(stmt).all()]
+
+
+def _pick_aggregates_statement(week_id: int):
+    """Build the single grouped statement behind the locked snapshot.
+
+    One row per picked team: (team_id, entries, lost) where `lost` is 1 when the team played
+    a final, decided game this week and did not win it. Ties and unfinished games never count
+    as losses, matching the survivor rules shown on the reveal page.
+    """
+    home = aliased(Team)
+    away = aliased(Team)
+    home_id = func.coalesce(Game.home_team_id, home.id)
+    away_id = func.coalesce(Game.away_team_id, away.id)
+    decided = and_(
+        Game.week_id == week_id,
+        Game.status == "final",
+        Game.home_score.isnot(None),
+        Game.away_score.isnot(None),
+        Game.home_score != Game.away_score,
+    )
+
+    def _side(team_id, own_score, other_score):
+        return (
+            select(team_id.label("team_id"), case((own_score < other_score, 1), else_=0).label("lost"))
+            .select_from(Game)
+            .outerjoin(home, and_(Game.home_team_id.is_(None), home.abbreviation == Game.home_team_abbr))
+            .outerjoin(away, and_(Game.away_team_id.is_(None), away.abbreviation == Game.away_team_abbr))
+            .where(decided)
+        )
+
+    outcomes = union_all(
+        _side(home_id, Game.home_score, Game.away_score),
+        _side(away_id, Game.away_score, Game.home_score),
+    ).subquery("outcomes")
 
+    # Count picks per team first so the outcome join touches O(teams) rows rather than O(picks)
+    counts = (
+        select(Pick.team_id.label("team_id"), func.count().label("entries"))
+        .where(Pick.week_id == week_id)
+        .group_by(Pick.team_id)
+        .subquery("counts")
+    )
+
+    return (
+        select(
+            counts.c.team_id,
+            counts.c.entries,
+            func.coalesce(func.max(outcomes.c.lost), 0).label("lost"),
+        )
+        .outerjoin(outcomes, outcomes.c.team_id == counts.c.team_id)
+        .group_by(counts.c.team_id, counts.c.entries)
+    )
+
+
+def _team_out(abbr: Optional[str], team: Optional[Team]) -> Dict[str, Any]:
+    return {"id": team.id if team else None, "abbr": abbr, "name": team.name if team else None}
+
+
+def _winning_team_id(g: Game, home: Optional[Team], away: Optional[Team]) -> Optional[int]:
+    if g.status != "final" or g.home_score is None or g.away_score is None:
+        return None
+    if g.home_score > g.away_score:
+        return home.id if home else None
+    if g.away_score > g.home_score:
+        return away.id if away else None
+    return None  # tie
+
+
+def _compute_for_week(db: Session, week: Week) -> Dict[str, Any]:
+    week_id = week.id
     now = datetime.now(timezone.utc)
-    lock_time = _as_utc(week.lock_time) if week.lock_time is not None else None
 
     # Base response
     resp: Dict[str, Any] = {
@@ -42,129 +142,55 @@ def get_reveal_snapshot(db: Session, week_id: int) -> Dict[str, Any]:
         "games": [],
     }
 
-    # Load games for the week
-    games: List[Game] = db.execute(select(Game).where(Game.week_id == week_id).order_by(Game.start_time)).scalars().all()
-
-    # Prepare team lookups by abbreviation and id for use in both branches
-    team_abbrs = {abbr for g in games for abbr in (g.home_team_abbr, g.away_team_abbr) if abbr}
-    teams_by_abbr = {}
-    teams_by_id = {}
-    if team_abbrs:
-        team_rows = db.execute(select(Team).where(Team.abbreviation.in_(team_abbrs))).scalars().all()
-        teams_by_abbr = {t.abbreviation: t for t in team_rows}
-        teams_by_id = {t.id: t for t in team_rows}
+    # Games with both teams resolved in one joined query
+    games = _load_games_with_teams(db, week_id)
 
-    if lock_time is None or now < lock_time:
+    if not is_week_locked(week, now):
         # Return minimal info: games with limited fields (abbreviations + optional team ids)
-        for g in games:
-            home = teams_by_abbr.get(g.home_team_abbr)
-            away = teams_by_abbr.get(g.away_team_abbr)
+        for g, home, away in games:
             resp["games"].append({
                 "id": g.id,
                 "start_time": g.start_time.isoformat() if g.start_time is not None else None,
-                "home_team": {"abbr": g.home_team_abbr, "id": home.id if home else None, "name": home.name if home else None},
-                "away_team": {"abbr": g.away_team_abbr, "id": away.id if away else None, "name": away.name if away else None},
+                "home_team": _team_out(g.home_team_abbr, home),
+                "away_team": _team_out(g.away_team_abbr, away),
                 "status": g.status,
             })
         return resp
 
-    # Past lock_time: produce aggregated snapshot
+    # Locked: produce aggregated snapshot
     resp["locked"] = True
 
-    # Query picks aggregated by team across the week
-    picks_count_query = (
-        select(Pick.team_id, func.count().label("count"))
-        .where(Pick.week_id == week_id)
-        .group_by(Pick.team_id)
-    )
-    picks_rows = db.execute(picks_count_query).all()
-
-    # Build mapping (team_id -> count)
+    # Per-team pick counts and loss flags in a single grouped statement: O(teams) rows, not O(picks).
+    # Entries hold at most one pick per week (uq_picks_entry_week), so per-team entry counts sum
+    # to the distinct entry total.
     picks_map: Dict[int, int] = {}
-    for team_id, count in picks_rows:
-        picks_map[int(team_id)] = int(count)
-
-    # Fetch team rows by abbreviation for display and id mapping
-    team_abbrs = {abbr for g in games for abbr in (g.home_team_abbr, g.away_team_abbr) if abbr}
-    teams_by_abbr = {}
-    teams_by_id = {}
-    if team_abbrs:
-        team_rows = db.execute(select(Team).where(Team.abbreviation.in_(team_abbrs))).scalars().all()
-        teams_by_abbr = {t.abbreviation: t for t in team_rows}
-        teams_by_id = {t.id: t for t in team_rows}
-
-    # Determine winners for games with final scores
-    for g in games:
-        home_team = teams_by_abbr.get(g.home_team_abbr)
-        away_team = teams_by_abbr.get(g.away_team_abbr)
-
-        game_entry: Dict[str, Any] = {
+    total_count = 0
+    losers_count = 0
+    for team_id, entries, lost in db.execute(_pick_aggregates_statement(week_id)).all():
+        total_count += int(entries)
+        if lost:
+            losers_count += int(entries)
+        if team_id is not None:
+            picks_map[int(team_id)] = int(entries)
+
+    for g, home, away in games:
+        home_id = home.id if home else None
+        away_id = away.id if away else None
+        resp["games"].append({
             "id": g.id,
             "start_time": g.start_time.isoformat() if g.start_time is not None else None,
-            "home_team": {
-                "id": home_team.id if home_team else None,
-                "abbr": g.home_team_abbr,
-                "name": home_team.name if home_team else None,
-            },
-            "away_team": {
-                "id": away_team.id if away_team else None,
-                "abbr": g.away_team_abbr,
-                "name": away_team.name if away_team else None,
-            },
+            "home_team": _team_out(g.home_team_abbr, home),
+            "away_team": _team_out(g.away_team_abbr, away),
             "status": g.status,
-            "home_score": getattr(g, "home_score", None),
-            "away_score": getattr(g, "away_score", None),
+            "home_score": g.home_score,
+            "away_score": g.away_score,
             # pick counts for teams in this game (by team id)
             "pick_counts": {
-                (home_team.id if home_team else None): picks_map.get(home_team.id if home_team else None, 0),
-                (away_team.id if away_team else None): picks_map.get(away_team.id if away_team else None, 0),
+                home_id: picks_map.get(home_id, 0),
+                away_id: picks_map.get(away_id, 0),
             },
-            "winning_team_id": None,
-        }
-
-        if g.status == "final" and getattr(g, "home_score", None) is not None and getattr(g, "away_score", None) is not None:
-            if g.home_score > g.away_score:
-                game_entry["winning_team_id"] = home_team.id if home_team else None
-            elif g.away_score > g.home_score:
-                game_entry["winning_team_id"] = away_team.id if away_team else None
-            else:
-                game_entry["winning_team_id"] = None  # tie
-
-        resp["games"].append(game_entry)
-
-    # Compute survivors/losers by comparing picks to game winners when available
-    # Build mapping from team abbreviation -> winning_team_id for final games
-    abbr_to_winner: Dict[str, int] = {}
-    for g in games:
-        if g.status == "final":
-            if getattr(g, "home_score", None) is not None and getattr(g, "away_score", None) is not None:
-                if getattr(g, "home_score", 0) > getattr(g, "away_score", 0):
-                    abbr_to_winner[g.home_team_abbr] = teams_by_abbr.get(g.home_team_abbr).id if teams_by_abbr.get(g.home_team_abbr) else None
-                    abbr_to_winner[g.away_team_abbr] = teams_by_abbr.get(g.home_team_abbr).id if teams_by_abbr.get(g.home_team_abbr) else None
-                elif getattr(g, "away_score", 0) > getattr(g, "home_score", 0):
-                    abbr_to_winner[g.away_team_abbr] = teams_by_abbr.get(g.away_team_abbr).id if teams_by_abbr.get(g.away_team_abbr) else None
-                    abbr_to_winner[g.home_team_abbr] = teams_by_abbr.get(g.away_team_abbr).id if teams_by_abbr.get(g.away_team_abbr) else None
-
-    # Count total distinct entries with a pick this week
-    total_entries_q = select(func.count(func.distinct(Pick.entry_id))).where(Pick.week_id == week_id)
-    total_count = int(db.execute(total_entries_q).scalar() or 0)
-
-    # Determine losers by checking each pick against the known game winner for that team
-    pick_rows = db.execute(select(Pick.entry_id, Pick.team_id).where(Pick.week_id == week_id)).all()
-    losers_set = set()
-    for entry_id, team_id in pick_rows:
-        team = teams_by_id.get(team_id)
-        if not team:
-            continue
-        # find the winner for the game this team appeared in
-        winner_id = abbr_to_winner.get(team.abbreviation)
-        if winner_id is None:
-            # cannot determine yet (game not final or no mapping)
-            continue
-        if winner_id != team_id:
-            losers_set.add(entry_id)
-
-    losers_count = len(losers_set)
+            "winning_team_id": _winning_team_id(g, home, away),
+        })
 
     resp["summary"] = {
         "total_entries": total_count,
@@ -173,3 +199,100 @@ def get_reveal_snapshot(db: Session, week_id: int) -> Dict[str, Any]:
     }
 
     return resp
+
+
+def get_latest_reveal_snapshot(db: Session, week_id: int) -> Optional[RevealSnapshot]:
+    """Return the most recent stored snapshot for a week, or None if none was built yet."""
+    stmt = (
+        select(RevealSnapshot)
+        .where(RevealSnapshot.week_id == week_id)
+        .order_by(RevealSnapshot.version.desc())
+        .limit(1)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def build_reveal_snapshot(db: Session, week_id: int) -> Optional[RevealSnapshot]:
+    """Compute the locked reveal payload for a week and store it as a new version.
+
+    A new version is only written when the payload differs from the latest stored one,
+    so repeated rebuilds are cheap and keep the ETag stable. Returns None when the week
+    does not exist or is not locked yet. The caller owns the surrounding transaction.
+    """
+    week = db.get(Week, week_id)
+    if week is None or not is_week_locked(week):
+        return None
+
+    payload = _normalize_payload(_compute_for_week(db, week))
+    etag = _payload_etag(payload)
+
+    latest = get_latest_reveal_snapshot(db, week_id)
+    if latest is not None and latest.etag == etag:
+        return latest
+
+    snap = RevealSnapshot(
+        week_id=week_id,
+        version=(latest.version + 1) if latest is not None else 1,
+        etag=etag,
+        payload=payload,
+    )
+    try:
+        # SAVEPOINT so a concurrent builder winning the same version does not poison the caller's transaction
+        with db.begin_nested():
+            db.add(snap)
+    except IntegrityError:
+        logger.info("Reveal snapshot for week %s was built concurrently; using latest", week_id)
+        return get_latest_reveal_snapshot(db, week_id)
+    return snap
+
+
+def refresh_reveal_snapshot(db: Session, week_id: int) -> Optional[RevealSnapshot]:
+    """Rebuild the stored snapshot after games or picks for a week changed.
+
+    Intended to be called by writers (finalize, sync, admin elimination) inside their own
+    transaction; pending changes are flushed first so the rebuild sees them.
+    """
+    db.flush()
+    return build_reveal_snapshot(db, week_id)
+
+
+def discard_reveal_snapshots(db: Session, week_id: int) -> None:
+    """Drop a week's stored snapshots when it is reopened.
+
+    Picks made while the week is open again must show up once it locks, so the next lock
+    builds from scratch rather than serving the old payload and ETag. The caller owns the
+    surrounding transaction.
+    """
+    db.execute(delete(RevealSnapshot).where(RevealSnapshot.week_id == week_id))
+
+
+def get_reveal_snapshot_with_etag(db: Session, week_id: int) -> Tuple[Dict[str, Any], str]:
+    """Return `(payload, etag)` for the reveal endpoint.
+
+    Locked weeks are served from the stored snapshot (built on first access if the lock
+    cutover did not build it already, on the primary); unlocked weeks are computed live since
+    they only carry the schedule.
+    """
+    week = db.get(Week, week_id)
+    if week is None:
+        payload: Dict[str, Any] = {"exists": False}
+        return payload, _payload_etag(payload)
+
+    if is_week_locked(week):
+        snap = get_latest_reveal_snapshot(db, week_id)
+        if snap is not None:
+            return snap.payload, snap.etag
+        require_primary(db, f"reveal snapshot for week {week_id} not built yet")
+        snap = build_reveal_snapshot(db, week_id)
+        payload, etag = snap.payload, snap.etag
+        db.commit()
+        return payload, etag
+
+    payload = _normalize_payload(_compute_for_week(db, week))
+    return payload, _payload_etag(payload)
+
+
+def get_reveal_snapshot(db: Session, week_id: int) -> Dict[str, Any]:
+    """Return the reveal snapshot payload for the given week (see `get_reveal_snapshot_with_etag`)."""
+    payload, _etag = get_reveal_snapshot_with_etag(db, week_id)
+    return payload
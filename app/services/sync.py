@@ -1,23 +1,81 @@
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+
+from app.models.game import Game
+from app.models.team import Team
+from app.models.week import Week
 
 from app.services.transformer import transform_espn_response
+from app.services.reveal import refresh_reveal_snapshot
+from app.services.finalize import resolve_final_games
+from app.services.dashboard import invalidate_all_dashboards
 
 logger = logging.getLogger(__name__)
 
 
-def transform_and_sync_games(raw: Any, year: int, week: int, db):
-    """Top-level orchestration: transform the raw payload and persist games.
+def _is_newly_final(row: dict, previous_status) -> bool:
+    """True when an incoming game is final with scores and was not already final in the DB."""
+    return (
+        row["status"] == "final"
+        and row["home_score"] is not None
+        and row["away_score"] is not None
+        and previous_status != "final"
+    )
 
-    Persistence strategy: delete existing games for the week, insert new set, all in a single transaction.
-    """
-    games = transform_espn_response(raw)
 
-    # Find the week record
-    from app.models.week import Week
-    from app.models.game import Game
+def _utc_naive(dt: Optional[datetime]) -> Optional[datetime]:
+    """Normalize datetimes for comparison: SQLite hands back naive UTC while parsed feeds are aware."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _natural_key(home_abbr, away_abbr, start_time: Optional[datetime]) -> Tuple:
+    st = _utc_naive(start_time)
+    return (home_abbr, away_abbr, st.date() if st is not None else None)
+
+
+_DIFF_FIELDS = ("start_time", "status", "home_score", "away_score", "home_team_id", "away_team_id")
+
+
+def _changed_fields(game, row: dict) -> Dict[str, Any]:
+    changes = {}
+    for field in _DIFF_FIELDS:
+        current = getattr(game, field)
+        incoming = row[field]
+        if field == "start_time":
+            if _utc_naive(current) != _utc_naive(incoming):
+                changes[field] = incoming
+        elif field in ("home_team_id", "away_team_id"):
+            # never clear a known team id because the feed used an unknown abbreviation
+            if incoming is not None and current != incoming:
+                changes[field] = incoming
+        elif current != incoming:
+            changes[field] = incoming
+    return changes
+
+
+def transform_and_sync_games(raw: Any, year: int, week: int, db, resolve_results: bool = True):
+    """Top-level orchestration: transform the raw payload and persist games via `sync_games`."""
+    return sync_games(transform_espn_response(raw), year=year, week=week, db=db, resolve_results=resolve_results)
+
 
+def sync_games(games: List[dict], year: int, week: int, db, resolve_results: bool = True):
+    """Persist already-transformed games (see `transform_espn_response`) for one week.
+
+    Persistence strategy: diff-based upsert in a single transaction. Incoming games are matched to
+    existing rows by natural key (week, home/away team, start date, falling back to the matchup
+    alone for rescheduled games); only rows whose status, score, start time or team ids changed are
+    written, unmatched incoming games are inserted and games no longer in the feed are deleted.
+    Matched rows keep their primary key, so `game_id`s held by clients stay valid.
+
+    When `resolve_results` is set, games that transitioned to `final` since the previous sync have
+    their picks resolved incrementally (win/loss + elimination) in the same transaction.
+
+    Returns counts: `created` (inserted), `updated`, `unchanged`, `deleted`, `total_incoming`,
+    plus `finalized_games`/`resolved_picks` from result resolution.
+    """
     # Fetch the target week. Use an ordered query and defensively handle the case where
     # multiple Week rows for the same season/week exist (which can happen in local dev DBs).
     q = db.query(Week).filter(Week.season_year == year, Week.week_number == week)
@@ -30,7 +88,11 @@ def transform_and_sync_games(raw: Any, year: int, week: int, db):
         logger.warning("Multiple Week rows found for %d-%d; using latest id=%s", year, week, candidates[0].id)
     target_week = candidates[0]
 
-    # Normalize rows to insert
+    # Resolve canonical team ids for every abbreviation in the feed with one query
+    abbrs = {a for g in games for a in (g.get("home_team_abbr"), g.get("away_team_abbr")) if a}
+    team_ids = dict(db.query(Team.abbreviation, Team.id).filter(Team.abbreviation.in_(abbrs)).all()) if abbrs else {}
+
+    # Normalize incoming rows
     rows = []
     for g in games:
         st = g.get("start_time")
@@ -58,13 +120,16 @@ def transform_and_sync_games(raw: Any, year: int, week: int, db):
             "start_time": st_dt,
             "home_team_abbr": g.get("home_team_abbr"),
             "away_team_abbr": g.get("away_team_abbr"),
+            "home_team_id": team_ids.get(g.get("home_team_abbr")),
+            "away_team_id": team_ids.get(g.get("away_team_abbr")),
             "status": g.get("status") or "scheduled",
             "home_score": g.get("home_score"),
             "away_score": g.get("away_score"),
         })
 
-    created = 0
-    # Transactional delete-then-insert
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+    resolution = {"finalized_games": 0, "resolved_picks": 0}
+    # Transactional diff-based upsert
     try:
         # Use a nested transaction (SAVEPOINT) if the session is already in a transaction,
         # otherwise begin a regular transaction. This allows callers that already started
@@ -75,16 +140,63 @@ def transform_and_sync_games(raw: Any, year: int, week: int, db):
             tx_ctx = db.begin()
 
         with tx_ctx:
-            # Delete existing games for this week
-            db.query(Game).filter(Game.week_id == target_week.id).delete(synchronize_session=False)
-            # Insert new games
+            existing = db.query(Game).filter(Game.week_id == target_week.id).order_by(Game.id).all()
+            by_key: Dict[Tuple, List[Game]] = {}
+            by_matchup: Dict[Tuple, List[Game]] = {}
+            for game in existing:
+                by_key.setdefault(_natural_key(game.home_team_abbr, game.away_team_abbr, game.start_time), []).append(game)
+                by_matchup.setdefault((game.home_team_abbr, game.away_team_abbr), []).append(game)
+            matched_ids = set()
+
+            def _take(candidates: List[Game]) -> Optional[Game]:
+                for candidate in candidates:
+                    if candidate.id not in matched_ids:
+                        matched_ids.add(candidate.id)
+                        return candidate
+                return None
+
+            newly_final = []
             for r in rows:
-                g = Game(**r)
-                db.add(g)
-                created += 1
-        logger.info("Synced %d games for %d-%d", created, year, week)
+                game = _take(by_key.get(_natural_key(r["home_team_abbr"], r["away_team_abbr"], r["start_time"]), []))
+                if game is None:
+                    # rescheduled to another day: same matchup within the week
+                    game = _take(by_matchup.get((r["home_team_abbr"], r["away_team_abbr"]), []))
+                if game is None:
+                    game = Game(**r)
+                    db.add(game)
+                    counts["created"] += 1
+                    if _is_newly_final(r, None):
+                        newly_final.append(game)
+                    continue
+
+                changes = _changed_fields(game, r)
+                if not changes:
+                    counts["unchanged"] += 1
+                    continue
+                if _is_newly_final(r, game.status):
+                    newly_final.append(game)
+                for field, value in changes.items():
+                    setattr(game, field, value)
+                counts["updated"] += 1
+
+            for game in existing:
+                if game.id not in matched_ids:
+                    db.delete(game)
+                    counts["deleted"] += 1
+
+            if resolve_results and newly_final:
+                resolution = resolve_final_games(db, target_week.id, newly_final)
+            if counts["created"] or counts["updated"] or counts["deleted"]:
+                # Scores/statuses changed: keep the stored reveal snapshot current
+                refresh_reveal_snapshot(db, target_week.id)
+        logger.info(
+            "Synced games for %d-%d: %d created, %d updated, %d unchanged, %d deleted",
+            year, week, counts["created"], counts["updated"], counts["unchanged"], counts["deleted"],
+        )
     except Exception:
         logger.exception("Failed to sync games for %d-%d", year, week)
         raise
 
-    return {"created": created, "total_incoming": len(rows)}
+    if resolution.get("resolved_picks"):
+        invalidate_all_dashboards()
+    return {**counts, "total_incoming": len(rows), **resolution}
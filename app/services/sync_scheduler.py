@@ -0,0 +1,219 @@
+"""Adaptive background polling of the ESPN scoreboard for the current week.
+
+The scheduler replaces cron-driven calls to `/internal/sync-games/espn`:
+
+- fast cadence while a game window is open (kickoff minus a pregame margin until the
+  expected end of the game, or whenever a game is reported in progress),
+- slow cadence between windows, shortened so the next window is never missed,
+- idle cadence once every game of the week is final,
+- exponential backoff on errors and random jitter on every interval.
+
+Fetches go through a pooled `AsyncEspnClient` with conditional GETs; when the scoreboard is
+unchanged the transform and DB sync are skipped. A changed scoreboard is committed to the
+client's validator cache only after its sync succeeded, so a failed sync is retried.
+
+It runs in-process as an asyncio task (enabled with `ESPN_POLL_ENABLED`, see `app/main.py`)
+or as a standalone worker: `python -m app.services.sync_scheduler`.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.db import SessionLocal
+from app.models.game import Game
+from app.models.week import Week
+from app.services.espn_client import AsyncEspnClient
+from app.services.sync import transform_and_sync_games
+
+logger = logging.getLogger(__name__)
+
+PREGAME_MARGIN = timedelta(minutes=30)
+GAME_LENGTH = timedelta(hours=4)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def compute_poll_interval(
+    games: Iterable[Tuple[Optional[datetime], str]],
+    now: datetime,
+    fast: float,
+    slow: float,
+    idle: float,
+) -> Tuple[float, str]:
+    """Return `(seconds_until_next_poll, mode)` for the week's `(start_time, status)` pairs.
+
+    Modes: `live` (a game window is open), `waiting` (next window is coming up), `complete`
+    (every game is final), `no_games` and `stale` (unfinished games whose window has passed).
+    """
+    games = list(games)
+    if not games:
+        return slow, "no_games"
+    pending = [(_as_utc(st) if st is not None else None, status) for st, status in games if status != "final"]
+    if not pending:
+        return idle, "complete"
+
+    next_window = None
+    for start, status in pending:
+        if status == "in_progress":
+            return fast, "live"
+        if start is None:
+            continue
+        if start - PREGAME_MARGIN <= now <= start + GAME_LENGTH:
+            return fast, "live"
+        if start - PREGAME_MARGIN > now:
+            opens = start - PREGAME_MARGIN
+            next_window = opens if next_window is None else min(next_window, opens)
+
+    if next_window is not None:
+        return max(fast, min(slow, (next_window - now).total_seconds())), "waiting"
+    return slow, "stale"
+
+
+class EspnPollScheduler:
+    """Poll ESPN for the current week on an adaptive interval and sync the results."""
+
+    def __init__(
+        self,
+        client: Optional[Any] = None,
+        session_factory: Callable[[], Any] = SessionLocal,
+        fast: Optional[float] = None,
+        slow: Optional[float] = None,
+        idle: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        jitter: float = 0.1,
+    ):
+        self.client = client if client is not None else AsyncEspnClient()
+        self.session_factory = session_factory
+        self.fast = fast if fast is not None else settings.ESPN_POLL_FAST_SECONDS
+        self.slow = slow if slow is not None else settings.ESPN_POLL_SLOW_SECONDS
+        self.idle = idle if idle is not None else settings.ESPN_POLL_IDLE_SECONDS
+        self.max_backoff = max_backoff if max_backoff is not None else settings.ESPN_POLL_MAX_BACKOFF_SECONDS
+        self.jitter = jitter
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._state: Dict[str, Any] = {
+            "mode": None,
+            "season_year": None,
+            "week_number": None,
+            "runs": 0,
+            "skipped_unchanged": 0,
+            "consecutive_failures": 0,
+            "last_run_at": None,
+            "last_success_at": None,
+            "last_error": None,
+            "last_result": None,
+            "interval_seconds": None,
+            "next_run_at": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        return {"running": self.running, **self._state}
+
+    def _jittered(self, seconds: float) -> float:
+        return max(1.0, seconds * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def _current_week(self) -> Optional[Tuple[int, int, int]]:
+        db = self.session_factory()
+        try:
+            week = db.query(Week).filter(Week.is_current == True).order_by(Week.id.desc()).first()  # noqa: E712
+            if week is None:
+                return None
+            return week.season_year, week.week_number, week.id
+        finally:
+            db.close()
+
+    def _sync_and_schedule(self, raw: Any, year: int, week_number: int, week_id: int, now: datetime):
+        db = self.session_factory()
+        try:
+            result = None
+            if raw is not None:
+                result = transform_and_sync_games(raw, year=year, week=week_number, db=db)
+            games = db.query(Game.start_time, Game.status).filter(Game.week_id == week_id).all()
+            return result, compute_poll_interval(games, now, self.fast, self.slow, self.idle)
+        finally:
+            db.close()
+
+    async def poll_once(self) -> float:
+        """Run a single sync of the current week and return the next base interval.
+
+        DB work runs in a worker thread; the HTTP fetch is awaited on the event loop.
+        """
+        now = datetime.now(timezone.utc)
+        self._state["last_run_at"] = now.isoformat()
+        self._state["runs"] += 1
+        current = await asyncio.to_thread(self._current_week)
+        if current is None:
+            self._state.update(mode="no_current_week", season_year=None, week_number=None)
+            return self.slow
+        year, week_number, week_id = current
+        self._state.update(season_year=year, week_number=week_number)
+
+        fetched = await self.client.fetch_week(year, week_number)
+        raw = fetched.payload if fetched.changed else None
+        if raw is None:
+            self._state["skipped_unchanged"] += 1
+        result, (interval, mode) = await asyncio.to_thread(
+            self._sync_and_schedule, raw, year, week_number, week_id, now
+        )
+        if result is not None:
+            self._state["last_result"] = result
+        if fetched.changed:
+            self.client.commit(fetched)
+        self._state["mode"] = mode
+        return interval
+
+    async def run(self) -> None:
+        """Poll until `stop()` is called."""
+        self._stop = asyncio.Event()
+        while not self._stop.is_set():
+            try:
+                interval = await self.poll_once()
+                self._state["consecutive_failures"] = 0
+                self._state["last_error"] = None
+                self._state["last_success_at"] = datetime.now(timezone.utc).isoformat()
+            except Exception as exc:
+                failures = self._state["consecutive_failures"] + 1
+                self._state["consecutive_failures"] = failures
+                self._state["last_error"] = str(exc)
+                interval = min(self.max_backoff, self.fast * (2 ** failures))
+                logger.exception("ESPN poll failed (%d consecutive); retrying in %.0fs", failures, interval)
+
+            delay = self._jittered(interval)
+            self._state["interval_seconds"] = round(delay, 1)
+            self._state["next_run_at"] = (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.client.aclose()
+
+
+# Process-wide scheduler used by the app lifespan and the status endpoint
+espn_poll_scheduler = EspnPollScheduler()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(espn_poll_scheduler.run())
@@ -1,97 +1,135 @@
-from typing import Any, List, Dict
+from typing import Any, Dict, Iterator, List, Optional
 import logging
 
+from app.utils.jsonstream import iter_array_items
+
 logger = logging.getLogger(__name__)
 
 
+# Common ESPN -> canonical abbreviation mappings, built once at import
+_ABBR_ALIASES = {
+    "WSH": "WAS",
+    "JAC": "JAX",
+    "LA": "LAR",
+}
+
+_STATUS_BY_STATE = {
+    "pre": "scheduled",
+    "pregame": "scheduled",
+    "scheduled": "scheduled",
+    "in": "in_progress",
+    "inprogress": "in_progress",
+    "post": "final",
+    "final": "final",
+}
+
+
 def _normalize_abbr(abbr: Any) -> str:
     if not abbr:
         return ""
     a = str(abbr).upper().strip()
-    # Common ESPN -> canonical mappings
-    mapping = {
-        "WSH": "WAS",
-        "JAC": "JAX",
-        "LA": "LAR",
-    }
-    return mapping.get(a, a)
+    return _ABBR_ALIASES.get(a, a)
 
 
 def _map_status(espn_state: Any) -> str:
-    s = str(espn_state or "").lower()
-    if s in ("pre", "pregame", "scheduled"):
-        return "scheduled"
-    if s in ("in", "inprogress"):
-        return "in_progress"
-    if s in ("post", "final"):
-        return "final"
-    return "scheduled"
+    # Lists/dicts are unhashable; they take the lenient str() path like any other odd value
+    status = _STATUS_BY_STATE.get(espn_state) if isinstance(espn_state, str) else None
+    if status is None:
+        status = _STATUS_BY_STATE.get(str(espn_state or "").lower(), "scheduled")
+    return status
 
 
-def transform_espn_response(raw: Any) -> List[Dict]:
-    """Transform ESPN scoreboard JSON to a list of internal game dicts.
+def _score(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _team_abbr(competitor: Dict) -> str:
+    team = competitor.get("team")
+    return _normalize_abbr(team.get("abbreviation")) if isinstance(team, dict) else ""
+
+
+def _transform_event(ev: Any) -> Optional[Dict]:
+    """Validate one ESPN event and map it to an internal game dict, or None if malformed."""
+    if not isinstance(ev, dict):
+        return None
+    start_time = ev.get("date")
+    if not start_time:
+        return None
+    competitions = ev.get("competitions")
+    if not isinstance(competitions, list) or not competitions or not isinstance(competitions[0], dict):
+        return None
+    competitors = competitions[0].get("competitors")
+    if not isinstance(competitors, list) or len(competitors) < 2:
+        return None
+
+    home = away = None
+    for c in competitors:
+        if not isinstance(c, dict):
+            continue
+        side = c.get("homeAway")
+        if side == "home" and home is None:
+            home = c
+        elif side == "away" and away is None:
+            away = c
+    if home is None or away is None:
+        return None
+
+    home_abbr = _team_abbr(home)
+    away_abbr = _team_abbr(away)
+    if not 2 <= len(home_abbr) <= 4 or not 2 <= len(away_abbr) <= 4:
+        return None
+
+    status = ev.get("status")
+    status_type = status.get("type") if isinstance(status, dict) else None
+    state = status_type.get("state") if isinstance(status_type, dict) else None
+
+    return {
+        "home_team_abbr": home_abbr,
+        "away_team_abbr": away_abbr,
+        "start_time": start_time,
+        "status": _map_status(state),
+        "home_score": _score(home.get("score")),
+        "away_score": _score(away.get("score")),
+    }
 
-    Returned dicts contain keys:
-      - home_team_abbr, away_team_abbr, start_time (ISO str), status, home_score, away_score
 
-    The transformer is defensive: it skips malformed events.
+def iter_games(raw: Any) -> Iterator[Dict]:
+    """Yield internal game dicts from an ESPN scoreboard, skipping malformed events.
+
+    `raw` may be the decoded JSON dict or the undecoded body (`bytes`/`str`, a binary file
+    object or an iterator of byte chunks); the latter is parsed incrementally, one event at a
+    time, so a full-season payload never has to be materialized. A truncated or malformed body
+    raises `ValueError` rather than looking like an empty week.
     """
-    games: List[Dict] = []
-    try:
-        events = raw.get("events") if isinstance(raw, dict) else None
+    if isinstance(raw, dict):
+        events = raw.get("events")
         if not isinstance(events, list):
-            return []
-    except Exception:
-        return []
+            return
+    elif isinstance(raw, (bytes, bytearray, memoryview, str, Iterator)) or hasattr(raw, "read"):
+        events = iter_array_items(raw, "events")
+    else:
+        return
 
     for ev in events:
-        try:
-            competitions = ev.get("competitions") if isinstance(ev, dict) else []
-            comp = competitions[0] if isinstance(competitions, list) and competitions else {}
-            competitors = comp.get("competitors") if isinstance(comp, dict) else []
-            if not isinstance(competitors, list) or len(competitors) < 2:
-                continue
-
-            home = next((c for c in competitors if isinstance(c, dict) and c.get("homeAway") == "home"), {})
-            away = next((c for c in competitors if isinstance(c, dict) and c.get("homeAway") == "away"), {})
-
-            home_team = (home.get("team") if isinstance(home, dict) else {}) or {}
-            away_team = (away.get("team") if isinstance(away, dict) else {}) or {}
-
-            home_abbr = _normalize_abbr(home_team.get("abbreviation"))
-            away_abbr = _normalize_abbr(away_team.get("abbreviation"))
-            if not home_abbr or not away_abbr:
-                continue
-            if len(home_abbr) < 2 or len(home_abbr) > 4 or len(away_abbr) < 2 or len(away_abbr) > 4:
-                continue
-
-            status = _map_status(ev.get("status", {}).get("type", {}).get("state")) if isinstance(ev, dict) else "scheduled"
-
-            start_time = ev.get("date") if isinstance(ev, dict) else None
-            # validate date
-            if not start_time:
-                continue
-
-            # Scores may be nested on competitor objects
-            try:
-                home_score = int(home.get("score")) if home.get("score") is not None else None
-            except Exception:
-                home_score = None
-            try:
-                away_score = int(away.get("score")) if away.get("score") is not None else None
-            except Exception:
-                away_score = None
-
-            games.append({
-                "home_team_abbr": home_abbr,
-                "away_team_abbr": away_abbr,
-                "start_time": start_time,
-                "status": status,
-                "home_score": home_score,
-                "away_score": away_score,
-            })
-        except Exception:
-            # Skip problematic event
+        game = _transform_event(ev)
+        if game is None:
+            logger.debug("Skipping malformed ESPN event")
             continue
+        yield game
 
-    return games
+
+def transform_espn_response(raw: Any) -> List[Dict]:
+    """Transform ESPN scoreboard JSON to a list of internal game dicts.
+
+    Returned dicts contain keys:
+      - home_team_abbr, away_team_abbr, start_time (ISO str), status, home_score, away_score
+
+    The transformer is defensive: it skips malformed events. See `iter_games` for the
+    accepted inputs.
+    """
+    return list(iter_games(raw))
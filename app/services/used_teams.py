@@ -0,0 +1,150 @@
+"""Per-user, per-season index of teams already picked (`used_teams`), and pick eligibility.
+
+The pick services keep it in step with `picks` inside their own transaction (`claim_teams`
+after inserts/updates, `release_entry` before an entry is deleted); the legacy importer
+calls `rebuild_used_teams` once at the end instead. Because (user, season, team) is the
+primary key, the season-repeat check is a key lookup (`team_used`) and two racing requests
+for the same team cannot both commit.
+
+`get_entry_eligibility` merges the index with the week's `ineligible_teams` (abbreviations)
+and `locked_games` (game ids) into one list the frontend can render the team grid from.
+"""
+from typing import Any, Collection, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.entry import Entry
+from app.models.game import Game
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.used_team import UsedTeam
+from app.models.week import Week
+from app.services.week_lock import is_locked
+
+
+def team_used(user_id, season_year, team_id: int, exclude_pick_id: Optional[int] = None):
+    """EXISTS clause for "the user already holds `team_id` this season" (a primary key probe)."""
+    cond = exists().where(
+        UsedTeam.user_id == user_id,
+        UsedTeam.season_year == season_year,
+        UsedTeam.team_id == team_id,
+    )
+    if exclude_pick_id is not None:
+        cond = cond.where(UsedTeam.pick_id != exclude_pick_id)
+    return cond
+
+
+def is_used_team_conflict(exc) -> bool:
+    msg = str(exc.orig)
+    # Postgres names the constraint; SQLite lists the columns
+    return "pk_used_teams" in msg or "used_teams.user_id, used_teams.season_year, used_teams.team_id" in msg
+
+
+def claim_teams(
+    db: Session, claims: Iterable[Tuple[int, int, int, int, int, int]], repointed: Collection[int] = ()
+) -> None:
+    """Record `(user_id, season_year, team_id, pick_id, entry_id, week_id)` for created or re-pointed picks.
+
+    Rows held by the `repointed` pick ids are released first. Raises IntegrityError (see
+    `is_used_team_conflict`) when another pick already holds the team.
+    """
+    if repointed:
+        db.execute(delete(UsedTeam).where(UsedTeam.pick_id.in_(list(repointed))))
+    rows = [
+        {"user_id": u, "season_year": s, "team_id": t, "pick_id": p, "entry_id": e, "week_id": w}
+        for u, s, t, p, e, w in claims
+        if t is not None
+    ]
+    if rows:
+        db.execute(insert(UsedTeam), rows)
+
+
+def release_entry(db: Session, entry_id: int) -> None:
+    db.execute(delete(UsedTeam).where(UsedTeam.entry_id == entry_id))
+
+
+def rebuild_used_teams(db: Session) -> int:
+    """Recompute the whole index from `picks` + `entries` and commit. The earliest pick wins repeats."""
+    holders = (
+        select(func.min(Pick.id))
+        .join(Entry, Entry.id == Pick.entry_id)
+        .where(Pick.team_id.is_not(None))
+        .group_by(Entry.user_id, Entry.season_year, Pick.team_id)
+    )
+    rows = (
+        select(Entry.user_id, Entry.season_year, Pick.team_id, Pick.id, Pick.entry_id, Pick.week_id)
+        .join(Entry, Entry.id == Pick.entry_id)
+        .where(Pick.id.in_(holders))
+    )
+    db.execute(delete(UsedTeam))
+    db.execute(
+        insert(UsedTeam).from_select(["user_id", "season_year", "team_id", "pick_id", "entry_id", "week_id"], rows)
+    )
+    db.commit()
+    return db.execute(select(func.count()).select_from(UsedTeam)).scalar()
+
+
+def get_entry_eligibility(db: Session, user_id: int, entry_id: int) -> Optional[Dict[str, Any]]:
+    """Team-by-team pick eligibility for `entry_id` in its week, or None if the user doesn't own it.
+
+    `reason` is the first that applies of `week_locked`, `used`, `ineligible`, `game_locked`.
+    The team holding the entry's own pick for the week counts as eligible.
+    """
+    row = db.execute(
+        select(Entry.week_id, Entry.season_year, Week.is_locked, Week.lock_time, Week.ineligible_teams, Week.locked_games, Pick.id, Pick.team_id)
+        .join(Week, Week.id == Entry.week_id)
+        .outerjoin(Pick, and_(Pick.entry_id == Entry.id, Pick.week_id == Entry.week_id))
+        .where(Entry.id == entry_id, Entry.user_id == user_id)
+    ).one_or_none()
+    if row is None:
+        return None
+    week_id, season, locked, lock_time, ineligible, locked_games, pick_id, current_team = row
+
+    used = {
+        team_id: used_week
+        for team_id, used_week, holder in db.execute(
+            select(UsedTeam.team_id, UsedTeam.week_id, UsedTeam.pick_id).where(
+                UsedTeam.user_id == user_id, UsedTeam.season_year == season
+            )
+        )
+        if holder != pick_id
+    }
+    locked_teams = set()
+    if locked_games:
+        for home, away in db.execute(
+            select(Game.home_team_id, Game.away_team_id).where(Game.id.in_(locked_games))
+        ):
+            locked_teams.update(t for t in (home, away) if t is not None)
+    ineligible_abbrs = set(ineligible or [])
+
+    week_locked = is_locked(locked, lock_time)
+
+    teams = []
+    for team_id, abbr, name in db.execute(select(Team.id, Team.abbreviation, Team.name).order_by(Team.abbreviation)):
+        if week_locked:
+            reason = "week_locked"
+        elif team_id in used:
+            reason = "used"
+        elif abbr in ineligible_abbrs:
+            reason = "ineligible"
+        elif team_id in locked_teams:
+            reason = "game_locked"
+        else:
+            reason = None
+        teams.append({
+            "team_id": team_id,
+            "abbreviation": abbr,
+            "name": name,
+            "eligible": reason is None,
+            "reason": reason,
+            "used_in_week_id": used.get(team_id),
+        })
+    return {
+        "entry_id": entry_id,
+        "week_id": week_id,
+        "season_year": season,
+        "week_locked": week_locked,
+        "current_team_id": current_team,
+        "teams": teams,
+    }
@@ -0,0 +1,32 @@
+"""Week lock state shared by the write paths and the public views.
+
+`Week.is_locked` is flipped once by the lock cutover (app/services/lock_cutover.py) when
+`lock_time` passes; after that a lock check is a column read. Until the cutover has run
+(disabled, or a moment late) `lock_time` is still honoured, so nothing is accepted past lock.
+"""
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+
+def as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes as UTC (how lock times are stored)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def lock_time_passed(lock_time: Optional[datetime], now: Optional[datetime] = None) -> bool:
+    if lock_time is None:
+        return False
+    return (now or datetime.now(timezone.utc)) >= as_utc(lock_time)
+
+
+def is_locked(locked_flag: Optional[bool], lock_time: Optional[datetime], now: Optional[datetime] = None) -> bool:
+    """Lock check for callers that selected `(Week.is_locked, Week.lock_time)` as columns."""
+    return bool(locked_flag) or lock_time_passed(lock_time, now)
+
+
+def is_week_locked(week: Any, now: Optional[datetime] = None) -> bool:
+    return is_locked(week.is_locked, week.lock_time, now)
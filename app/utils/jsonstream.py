@@ -0,0 +1,150 @@
+"""Incremental JSON parsing for large payloads.
+
+`iter_array_items(source, key)` yields the elements of the top-level `key` array of a JSON
+object one at a time, without decoding the whole document first; `iter_root_items(source)`
+does the same for a document that is itself an array (the legacy export files). Only the element currently
+being decoded (plus one read chunk) is held in memory; sibling keys before the array are
+decoded and discarded, keys after it are never read.
+
+`source` may be `bytes`/`str`, a file-like object with `.read()` (binary or text) or an
+iterator of `bytes`/`str` chunks (e.g. `httpx.Response.iter_bytes()`).
+Malformed or truncated input raises `json.JSONDecodeError` (a `ValueError`).
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_chunks(source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Normalize `source` into an iterator of decoded text chunks."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source)
+        raw: Iterable[Union[bytes, str]] = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif isinstance(source, str):
+        raw = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif hasattr(source, "read"):
+        raw = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        raw = source
+
+    # Incremental decoder so multi-byte characters split across chunks survive
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in raw:
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class _Reader:
+    """A sliding text buffer over a chunk iterator with refill-on-demand decoding."""
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            return False
+        # Drop the consumed prefix before growing so memory stays bounded by one element
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected {char!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next JSON value, pulling more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A value ending exactly at the buffer edge may be a truncated number/literal
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode()
+        sep = reader.peek()
+        if sep == "]":
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+def iter_root_items(source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of the JSON array in `source`; any other document raises `JSONDecodeError`."""
+    reader = _Reader(iter_chunks(source, chunk_size))
+    if reader.peek() != "[":
+        raise json.JSONDecodeError("Expected a JSON array", reader.buf, reader.pos)
+    yield from _iter_array(reader)
+    if reader.peek() != "":
+        raise json.JSONDecodeError("Extra data", reader.buf, reader.pos)
+
+
+def iter_array_items(source: Any, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of the top-level `key` array of the JSON object in `source`.
+
+    Yields nothing when the document is not an object, the key is absent or its value is not
+    an array.
+    """
+    reader = _Reader(iter_chunks(source, chunk_size))
+    if reader.peek() != "{":
+        reader.decode()  # still validate the document
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.decode()
+        reader.expect(":")
+        if name == key and reader.peek() == "[":
+            yield from _iter_array(reader)
+            return
+        reader.decode()
+        sep = reader.peek()
+        if sep == "}":
+            return
+        reader.expect(",")
@@ -1,10 +1,10 @@
 from passlib.context import CryptContext
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 
 def get_password_hash(password: str) -> str:
@@ -15,10 +15,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(subject: str, expires_delta: Optional[timedelta] = None, claims: Optional[Dict[str, Any]] = None) -> str:
     now = datetime.now(timezone.utc)
     exp = now + (expires_delta or timedelta(minutes=60))
-    to_encode = {"sub": str(subject), "exp": exp}
+    to_encode = {**(claims or {}), "sub": str(subject), "exp": exp}
     encoded = jwt.encode(to_encode, settings.JWT_SECRET, algorithm="HS256")
     return encoded
 
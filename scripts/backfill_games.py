@@ -0,0 +1,71 @@
+"""
+Backfill ESPN games for a range of weeks using the bulk sync service.
+
+Fetches run concurrently (bounded by --concurrency), each week is committed in its own
+transaction, and a per-week timing table is printed at the end. Transforms run inline unless
+--transform-processes starts a process pool for them. Weeks must already exist
+in the `weeks` table. Uses DATABASE_URL like the app does.
+
+Usage:
+python scripts/backfill_games.py --year 2025 --weeks 1-18 --concurrency 6
+python scripts/backfill_games.py --year 2025 --weeks 1,2,5 --no-resolve
+python scripts/backfill_games.py --year 2025 --weeks 1-18 --transform-processes 4
+"""
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.main  # noqa: E402,F401  (registers every model mapper)
+from app.services.backfill import DEFAULT_CONCURRENCY, backfill_weeks  # noqa: E402
+
+
+def parse_weeks(spec: str):
+    weeks = []
+    for part in spec.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            weeks.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            weeks.append(int(part))
+    return weeks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--weeks", default="1-18", help="e.g. 1-18 or 1,3,5-7")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--no-resolve", action="store_true", help="skip resolving picks for newly final games")
+    parser.add_argument("--transform-processes", type=int, default=0, help="transform in a process pool of this size (0 = inline)")
+    args = parser.parse_args()
+
+    pairs = [(args.year, w) for w in parse_weeks(args.weeks)]
+    executor = ProcessPoolExecutor(args.transform_processes) if args.transform_processes > 0 else None
+    try:
+        report = asyncio.run(backfill_weeks(
+            pairs, concurrency=args.concurrency, executor=executor, resolve_results=not args.no_resolve
+        ))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print(f"{'week':>4} {'status':>6} {'fetch':>8} {'xform':>8} {'sync':>8}  created/updated/unchanged/deleted")
+    for w in report["weeks"]:
+        if w["status"] == "ok":
+            counts = f"{w['created']}/{w['updated']}/{w['unchanged']}/{w['deleted']}"
+            print(f"{w['week']:>4} {'ok':>6} {w['fetch_ms']:>7}ms {w['transform_ms']:>7}ms {w['sync_ms']:>7}ms  {counts}")
+        else:
+            print(f"{w['week']:>4} {'error':>6}  {w['error']}")
+    print(f"{report['ok']} ok, {report['failed']} failed in {report['elapsed_ms']}ms")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark the maintained history matrix: cold rebuild vs. incremental maintenance.
+
+Seeds a throwaway SQLite database (or the DATABASE_URL you pass with --database-url) with
+--entries entries and one pick per entry per week, then times:
+
+- rebuild:     `rebuild_history_matrix` over the whole season (the repair / cold path)
+- incremental: `record_pick` for --updates re-pointed picks, one commit each, as update_pick does
+- read:        a full `get_history_page` walk in --page-size pages off the maintained rows
+
+Usage:
+python scripts/bench_history_matrix.py --entries 10000 --weeks 18 --updates 500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.pick import Pick  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.week import Week  # noqa: E402
+import app.models.history_matrix_row  # noqa: E402,F401
+import app.models.password_reset  # noqa: E402,F401
+from app.services.history import get_history_page  # noqa: E402
+from app.services.history_matrix import rebuild_history_matrix, record_pick  # noqa: E402
+
+
+def seed(Session, entries: int, weeks: int):
+    db = Session()
+    try:
+        db.add(User(email="bench@example.com", hashed_password="x"))
+        db.execute(insert(Week), [{"season_year": 2025, "week_number": n} for n in range(1, weeks + 1)])
+        db.execute(insert(Team), [{"abbreviation": f"B{i:02d}", "name": f"Bench {i}"} for i in range(32)])
+        db.commit()
+        user_id = db.execute(select(User.id)).scalar()
+        week_ids = list(db.execute(select(Week.id).order_by(Week.week_number)).scalars())
+        team_ids = list(db.execute(select(Team.id).order_by(Team.id)).scalars())
+        db.execute(insert(Entry), [
+            {"user_id": user_id, "week_id": week_ids[0], "name": f"Entry {e}", "season_year": 2025, "picks": {}}
+            for e in range(1, entries + 1)
+        ])
+        rng = random.Random(7)
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Pick), [
+            {"entry_id": e, "week_id": w, "team_id": rng.choice(team_ids), "created_at": now, "updated_at": now}
+            for e in range(1, entries + 1)
+            for w in week_ids
+        ])
+        db.commit()
+        return week_ids, team_ids
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the maintained history matrix")
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--weeks", type=int, default=18)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench_history.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    week_ids, team_ids = seed(Session, args.entries, args.weeks)
+
+    db = Session()
+    try:
+        t0 = time.perf_counter()
+        rows = rebuild_history_matrix(db, 2025)
+        rebuild_s = time.perf_counter() - t0
+
+        rng = random.Random(11)
+        targets = [(rng.randint(1, args.entries), rng.choice(week_ids)) for _ in range(args.updates)]
+        t0 = time.perf_counter()
+        for entry_id, week_id in targets:
+            pick = db.execute(select(Pick).where(Pick.entry_id == entry_id, Pick.week_id == week_id)).scalar_one()
+            pick.team_id = rng.choice(team_ids)
+            pick.updated_at = datetime.now(timezone.utc)
+            record_pick(db, pick, is_new=False)
+            db.commit()
+        incremental_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        after, seen = None, 0
+        while True:
+            page = get_history_page(db, season_year=2025, after_entry_id=after, limit=args.page_size, columnar=True)
+            seen += len(page["entry_ids"])
+            after = page["next_after_entry_id"]
+            if after is None:
+                break
+        read_s = time.perf_counter() - t0
+    finally:
+        db.close()
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    assert seen == rows == args.entries, (seen, rows)
+    per_update = incremental_s / args.updates * 1000 if args.updates else 0.0
+    print(f"entries={args.entries} weeks={args.weeks} picks={args.entries * args.weeks}")
+    print(f"rebuild     {rebuild_s * 1000:8.1f} ms  ({rows} rows)")
+    print(f"incremental {incremental_s * 1000:8.1f} ms  ({args.updates} updates, {per_update:.2f} ms each incl. commit)")
+    print(f"read        {read_s * 1000:8.1f} ms  (full walk, page size {args.page_size})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark the set-based legacy importer against the per-row importer it replaced.
+
+The files in scripts/samples are replicated --scale times (copy i gets its own teams, users
+and season 2025+i), then imported into throwaway SQLite databases (or the DATABASE_URL you
+pass with --database-url, which must be empty):
+
+- bulk:     every file through `BulkImporter`, one transaction per file
+- reimport: the same files again (all rows unchanged, nothing written)
+- per-row:  users and picks the old way (session, lookups and commit per record), with the
+            other files loaded in bulk so the references resolve
+
+Usage:
+python scripts/bench_import.py --scale 2000 --chunk-size 1000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app.main  # noqa: E402,F401  (registers every model mapper)
+from app.models.base import Base  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.pick import Pick  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.week import Week  # noqa: E402
+from app.services.history_matrix import record_pick  # noqa: E402
+from app.services.legacy_import import KINDS, BulkImporter  # noqa: E402
+
+SAMPLES = os.path.join(ROOT, "scripts", "samples")
+
+
+def scaled_samples(scale: int):
+    base = {kind: json.load(open(os.path.join(SAMPLES, f"{kind}.json"))) for kind in KINDS}
+    out = {kind: [] for kind in KINDS}
+    for i in range(scale):
+        def team(abbr):
+            return f"{abbr}{i}"
+
+        def email(addr):
+            return f"{i}.{addr}"
+
+        for r in base["teams"]:
+            out["teams"].append({**r, "abbreviation": team(r["abbreviation"])})
+        for r in base["users"]:
+            out["users"].append({**r, "email": email(r["email"])})
+        for r in base["weeks"]:
+            out["weeks"].append({**r, "season_year": r["season_year"] + i})
+        for r in base["games"]:
+            out["games"].append({
+                **r, "season_year": r["season_year"] + i,
+                "home_team_abbr": team(r["home_team_abbr"]), "away_team_abbr": team(r["away_team_abbr"]),
+            })
+        for r in base["entries"]:
+            out["entries"].append({**r, "season_year": r["season_year"] + i, "user_email": email(r["user_email"])})
+        for r in base["picks"]:
+            out["picks"].append({
+                **r, "season_year": r["season_year"] + i, "user_email": email(r["user_email"]), "team_abbr": team(r["team_abbr"]),
+            })
+    return out
+
+
+def make_session(url):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def bulk(Session, kind, records, chunk_size):
+    db = Session()
+    try:
+        started = time.perf_counter()
+        report = BulkImporter(db, chunk_size=chunk_size, progress=None).import_records(kind, records)
+        return time.perf_counter() - started, report
+    finally:
+        db.close()
+
+
+def legacy_users(Session, records):
+    for obj in records:
+        db = Session()
+        try:
+            existing = db.query(User).filter(User.email == obj["email"]).one_or_none()
+            if existing is None:
+                db.add(User(email=obj["email"], hashed_password="", first_name=obj.get("first_name"), last_name=obj.get("last_name"), phone_number=obj.get("phone")))
+                db.commit()
+        finally:
+            db.close()
+
+
+def legacy_picks(Session, records):
+    for obj in records:
+        db = Session()
+        try:
+            user = db.query(User).filter(User.email == obj["user_email"]).one_or_none()
+            entry = db.query(Entry).filter(Entry.user_id == user.id, Entry.season_year == obj["season_year"], Entry.name == obj["entry_name"]).one_or_none()
+            week = db.query(Week).filter(Week.season_year == obj["season_year"], Week.week_number == obj["week_number"]).one_or_none()
+            team = db.query(Team).filter(Team.abbreviation == obj["team_abbr"]).one_or_none()
+            existing = db.query(Pick).filter(Pick.entry_id == entry.id, Pick.week_id == week.id).one_or_none()
+            if existing is None:
+                p = Pick(entry_id=entry.id, week_id=week.id, team_id=team.id, team_abbr=obj["team_abbr"], updated_at=datetime.now(timezone.utc))
+                db.add(p)
+                db.flush()
+                record_pick(db, p, is_new=True)
+                db.commit()
+        finally:
+            db.close()
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def row(label, records, seconds):
+    print(f"  {label:<18} {records:>8} records  {seconds * 1000:>9.1f} ms  {records / seconds if seconds else 0:>10.0f} records/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1000, help="copies of the sample files")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None, help="empty database for the bulk run (default: temp SQLite)")
+    args = parser.parse_args()
+
+    data = scaled_samples(args.scale)
+    tmpdir = tempfile.mkdtemp(prefix="bench_import_")
+    bulk_url = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'bulk.db')}"
+    Bulk = make_session(bulk_url)
+    Legacy = make_session(f"sqlite:///{os.path.join(tmpdir, 'legacy.db')}")
+
+    print(f"bulk import (chunk size {args.chunk_size})")
+    total_records, total_seconds = 0, 0.0
+    for kind in KINDS:
+        seconds, report = bulk(Bulk, kind, data[kind], args.chunk_size)
+        assert report["created"] == len(data[kind]), report
+        row(kind, len(data[kind]), seconds)
+        total_records, total_seconds = total_records + len(data[kind]), total_seconds + seconds
+    row("total", total_records, total_seconds)
+
+    print("re-import (unchanged)")
+    for kind in KINDS:
+        seconds, report = bulk(Bulk, kind, data[kind], args.chunk_size)
+        assert report["unchanged"] == len(data[kind]), report
+        row(kind, len(data[kind]), seconds)
+
+    print("per-row baseline")
+    row("users", len(data["users"]), timed(legacy_users, Legacy, data["users"]))
+    for kind in ("teams", "weeks", "games", "entries"):
+        bulk(Legacy, kind, data[kind], args.chunk_size)
+    row("picks", len(data["picks"]), timed(legacy_picks, Legacy, data["picks"]))
+
+
+if __name__ == "__main__":
+    main()
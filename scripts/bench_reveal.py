@@ -0,0 +1,138 @@
+"""
+Benchmark the reveal snapshot aggregation against a synthetic locked week.
+
+Seeds a throwaway SQLite database (or the DATABASE_URL you pass with --database-url) with
+32 teams, 16 final games and one pick per entry, then times:
+
+- legacy:    the previous approach that pulled every (entry_id, team_id) pick row into Python
+- aggregate: `app.services.reveal.compute_reveal_snapshot`, one grouped statement per snapshot
+
+Usage:
+python scripts/bench_reveal.py --entries 50000 --repeat 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models.game import Game  # noqa: E402
+from app.models.pick import Pick  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.week import Week  # noqa: E402
+import app.models.entry  # noqa: E402,F401
+import app.models.user  # noqa: E402,F401
+import app.models.password_reset  # noqa: E402,F401
+from app.services.reveal import compute_reveal_snapshot  # noqa: E402
+
+
+def seed(Session, entries: int) -> int:
+    db = Session()
+    try:
+        week = Week(season_year=2025, week_number=1, lock_time=datetime.now(timezone.utc) - timedelta(hours=1))
+        db.add(week)
+        db.commit()
+        db.execute(insert(Team), [{"abbreviation": f"B{i:02d}", "name": f"Bench {i}"} for i in range(32)])
+        team_ids = [t for t in db.execute(select(Team.id).order_by(Team.id)).scalars()]
+        games = []
+        for i in range(16):
+            home, away = team_ids[2 * i], team_ids[2 * i + 1]
+            games.append({
+                "week_id": week.id,
+                "start_time": datetime(2025, 9, 7, 17, 0),
+                "home_team_abbr": f"B{2 * i:02d}",
+                "away_team_abbr": f"B{2 * i + 1:02d}",
+                "home_team_id": home,
+                "away_team_id": away,
+                "status": "final",
+                "home_score": random.randint(0, 40),
+                "away_score": random.randint(0, 40),
+            })
+        db.execute(insert(Game), games)
+        rng = random.Random(7)
+        db.execute(insert(Pick), [{"entry_id": e, "week_id": week.id, "team_id": rng.choice(team_ids)} for e in range(1, entries + 1)])
+        db.commit()
+        return week.id
+    finally:
+        db.close()
+
+
+def legacy_summary(db, week_id: int) -> dict:
+    """The pre-aggregation path: per-pick rows scanned in Python against abbreviation-keyed winners."""
+    games = db.execute(select(Game).where(Game.week_id == week_id)).scalars().all()
+    teams_by_abbr = {t.abbreviation: t for t in db.execute(select(Team)).scalars()}
+    teams_by_id = {t.id: t for t in teams_by_abbr.values()}
+    abbr_to_winner = {}
+    for g in games:
+        if g.status == "final" and g.home_score != g.away_score:
+            winner = g.home_team_abbr if g.home_score > g.away_score else g.away_team_abbr
+            abbr_to_winner[g.home_team_abbr] = abbr_to_winner[g.away_team_abbr] = teams_by_abbr[winner].id
+    rows = db.execute(select(Pick.entry_id, Pick.team_id).where(Pick.week_id == week_id)).all()
+    losers = set()
+    for entry_id, team_id in rows:
+        team = teams_by_id.get(team_id)
+        winner_id = abbr_to_winner.get(team.abbreviation) if team else None
+        if winner_id is not None and winner_id != team_id:
+            losers.add(entry_id)
+    total = len({r[0] for r in rows})
+    return {"total_entries": total, "losers": len(losers), "survivors": total - len(losers), "rows": len(rows)}
+
+
+def timed(fn, repeat: int):
+    best = None
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reveal snapshot aggregation")
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench_reveal.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    week_id = seed(Session, args.entries)
+
+    db = Session()
+    try:
+        legacy_s, legacy = timed(lambda: legacy_summary(db, week_id), args.repeat)
+        agg_s, snap = timed(lambda: compute_reveal_snapshot(db, week_id), args.repeat)
+    finally:
+        db.close()
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    summary = snap["summary"]
+    assert (summary["total_entries"], summary["losers"]) == (legacy["total_entries"], legacy["losers"]), (summary, legacy)
+    print(f"entries={args.entries} survivors={summary['survivors']} losers={summary['losers']}")
+    print(f"legacy    best={legacy_s * 1000:8.1f} ms  rows transferred={legacy['rows']}")
+    print(f"aggregate best={agg_s * 1000:8.1f} ms  rows transferred<=32 (one per picked team)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Benchmark the ESPN transformer over full-season scoreboard fixtures.
+
+Pass recorded scoreboard responses with --fixtures DIR (every *.json file is one week's
+scoreboard body, e.g. saved with `curl -o week01.json "$ESPN_BASE_URL?year=2025&week=1"`).
+Without --fixtures, 18 synthetic weeks shaped like ESPN responses (16 events each, with the
+venue/broadcast/odds/leader blocks that make real payloads large) are generated.
+
+Compares, per full season:
+
+- legacy:    json.loads + the previous transformer (mapping dict rebuilt per call, try/except per event)
+- decoded:   json.loads + `transform_espn_response`
+- streaming: `transform_espn_response(bytes)`, parsing events incrementally from the raw body
+
+and reports peak traced memory for the legacy and streaming paths.
+
+Usage:
+python scripts/bench_transformer.py --repeat 20
+python scripts/bench_transformer.py --fixtures recorded/2024 --repeat 50
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services.transformer import transform_espn_response  # noqa: E402
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GB", "HOU", "IND", "JAX", "KC",
+    "LV", "LAC", "LA", "MIA", "MIN", "NE", "NO", "NYG", "NYJ", "PHI", "PIT", "SF", "SEA", "TB", "TEN", "WSH",
+]
+
+
+def synthetic_week(week: int, rng: random.Random) -> bytes:
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    events = []
+    for i in range(16):
+        away, home = teams[2 * i], teams[2 * i + 1]
+        competitors = []
+        for side, abbr in (("home", home), ("away", away)):
+            competitors.append({
+                "id": str(rng.randint(1, 34)),
+                "homeAway": side,
+                "score": str(rng.randint(0, 45)),
+                "team": {"abbreviation": abbr, "displayName": f"{abbr} Team", "color": "000000",
+                         "logo": f"https://a.espncdn.com/i/teamlogos/nfl/500/{abbr}.png"},
+                "linescores": [{"value": rng.randint(0, 14)} for _ in range(4)],
+                "statistics": [{"name": f"stat{k}", "displayValue": str(rng.random())} for k in range(12)],
+                "leaders": [{"name": n, "leaders": [{"displayValue": "x" * 40, "value": rng.random()}]}
+                            for n in ("passingYards", "rushingYards", "receivingYards")],
+            })
+        events.append({
+            "id": f"4017{week:02d}{i:02d}",
+            "date": f"2025-09-{(week % 28) + 1:02d}T17:00:00Z",
+            "name": f"{away} at {home}",
+            "status": {"type": {"state": "post", "completed": True, "description": "Final"}},
+            "competitions": [{
+                "competitors": competitors,
+                "venue": {"fullName": "Stadium", "address": {"city": "City", "state": "ST"}},
+                "broadcasts": [{"market": "national", "names": ["CBS"]}],
+                "odds": [{"details": f"{home} -3.5", "overUnder": 44.5}],
+                "notes": [], "headlines": [{"description": "y" * 200}],
+            }],
+        })
+    doc = {"leagues": [{"id": "28", "name": "NFL", "calendar": [{"label": f"Week {n}"} for n in range(1, 19)]}],
+           "season": {"year": 2025}, "week": {"number": week}, "events": events}
+    return json.dumps(doc).encode("utf-8")
+
+
+def legacy_transform(raw):
+    games = []
+    try:
+        events = raw.get("events") if isinstance(raw, dict) else None
+        if not isinstance(events, list):
+            return []
+    except Exception:
+        return []
+    for ev in events:
+        try:
+            comp = ev.get("competitions")[0]
+            competitors = comp.get("competitors")
+            home = next((c for c in competitors if c.get("homeAway") == "home"), {})
+            away = next((c for c in competitors if c.get("homeAway") == "away"), {})
+
+            def norm(a):
+                mapping = {"WSH": "WAS", "JAC": "JAX", "LA": "LAR"}
+                a = str(a or "").upper().strip()
+                return mapping.get(a, a)
+
+            state = str(ev.get("status", {}).get("type", {}).get("state") or "").lower()
+            status = {"pre": "scheduled", "in": "in_progress", "post": "final"}.get(state, "scheduled")
+            games.append({
+                "home_team_abbr": norm(home.get("team", {}).get("abbreviation")),
+                "away_team_abbr": norm(away.get("team", {}).get("abbreviation")),
+                "start_time": ev.get("date"),
+                "status": status,
+                "home_score": int(home.get("score")) if home.get("score") is not None else None,
+                "away_score": int(away.get("score")) if away.get("score") is not None else None,
+            })
+        except Exception:
+            continue
+    return games
+
+
+def timed(fn, bodies, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for body in bodies:
+            fn(body)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def peak_kib(fn, bodies):
+    tracemalloc.start()
+    for body in bodies:
+        fn(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of recorded scoreboard *.json bodies")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        paths = sorted(glob.glob(os.path.join(args.fixtures, "*.json")))
+        if not paths:
+            parser.error(f"no *.json fixtures in {args.fixtures}")
+        bodies = [open(p, "rb").read() for p in paths]
+    else:
+        rng = random.Random(2025)
+        bodies = [synthetic_week(w, rng) for w in range(1, 19)]
+
+    size_kib = sum(len(b) for b in bodies) / 1024
+    games = sum(len(transform_espn_response(b)) for b in bodies)
+    print(f"{len(bodies)} scoreboards, {size_kib:.0f} KiB, {games} games, best of {args.repeat}")
+
+    legacy = lambda b: legacy_transform(json.loads(b))  # noqa: E731
+    decoded = lambda b: transform_espn_response(json.loads(b))  # noqa: E731
+    streaming = transform_espn_response
+
+    for name, fn in (("legacy", legacy), ("decoded", decoded), ("streaming", streaming)):
+        print(f"{name:>10}: {timed(fn, bodies, args.repeat):8.2f} ms/season")
+    print(f"peak memory per week: legacy {peak_kib(legacy, bodies):.0f} KiB, streaming {peak_kib(streaming, bodies):.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,10 @@ import app.models.week  # noqa
 import app.models.entry  # noqa
 import app.models.pick  # noqa
 import app.models.game  # noqa
+import app.models.reveal_snapshot  # noqa
+import app.models.history_matrix_row  # noqa
+import app.models.used_team  # noqa
+import app.models.import_ledger  # noqa
 
 
 def main():
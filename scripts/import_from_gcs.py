@@ -6,6 +6,16 @@ with Google Application Default Credentials.
 
 Usage examples:
   python scripts/import_from_gcs.py --bucket my-bucket --files teams.json,users.json --dry-run
+  python scripts/import_from_gcs.py --files gs://my-bucket/teams.json,file:///tmp/exports/users.json
+
+Files are streamed (GCS blobs through a chunked reader, `file://` paths from disk) and parsed
+incrementally; up to `--workers` files are read ahead concurrently while the previous ones are
+written, in the order given, with a bounded number of record chunks buffered per file.
+
+Real runs are checkpointed in the import ledger (`import_files` / `import_chunks`): each chunk
+commits with its ledger row, a re-run resumes after the last applied chunk, and a file whose
+content hash (GCS md5 / sha256 of a local file) matches its last completed import is skipped
+without being read. Pass `--no-checkpoint` for one transaction per file and no ledger.
 
 If you run without `--dry-run`, the script will attempt to write to the database
 using the application's `app.db` session. Use with care.
@@ -13,22 +23,21 @@ using the application's `app.db` session. Use with care.
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import os
-from typing import Iterable
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
 
 from google.cloud import storage
-from sqlalchemy.exc import IntegrityError
 
-# Import DB session and models lazily when needed to avoid side-effects on import
+# Import the DB session lazily when needed to avoid side-effects on import
 def _import_db():
+    import app.main  # noqa: F401  (registers every model mapper)
     from app.db import SessionLocal
-    from app.models.team import Team
-    from app.models.user import User
-    return SessionLocal, Team, User
-
-# Local imports kept lazy to avoid side effects on import
+    return SessionLocal
 
 
 def make_gcs_client():
@@ -37,477 +46,271 @@ def make_gcs_client():
     return storage.Client()
 
 
-def download_blob_to_text(client: storage.Client, bucket_name: str, blob_name: str) -> str:
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(blob_name)
-    return blob.download_as_text()
-
-
-def parse_json_text(text: str):
-    return json.loads(text)
-
-
-def process_teams(data: Iterable[dict], dry_run: bool = True) -> dict:
-    """Process teams list JSON objects. Returns summary dict."""
-    created = 0
-    updated = 0
-
-    SessionLocal, Team, _ = _import_db()
-
-    for obj in data:
-        # basic validation
-        abbr = obj.get("abbreviation")
-        name = obj.get("name")
-        if not abbr or not name:
-            logging.warning("Skipping malformed team record: %s", obj)
-            continue
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert team %s (%s)", name, abbr)
-            created += 1
-            continue
-
-        db = SessionLocal()
-        try:
-            existing = db.query(Team).filter(Team.abbreviation == abbr).one_or_none()
-            if existing:
-                # naive update of mutable fields
-                if existing.name != name:
-                    existing.name = name
-                    db.add(existing)
-                    db.commit()
-                    updated += 1
-                else:
-                    # nothing to change
-                    pass
-            else:
-                t = Team(abbreviation=abbr, name=name, city=obj.get("city"), conference=obj.get("conference"), division=obj.get("division"))
-                db.add(t)
-                db.commit()
-                created += 1
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert team %s", abbr)
-        finally:
-            db.close()
-
-    return {"created": created, "updated": updated}
-
-
-def process_users(data: Iterable[dict], dry_run: bool = True) -> dict:
-    created = 0
-    updated = 0
-
-    SessionLocal, _, User = _import_db()
+def resolve_source(uri: str, bucket: Optional[str] = None) -> Tuple[str, str, str]:
+    """Split a `--files` entry into `(scheme, bucket_or_empty, name_or_path)`.
 
-    for obj in data:
-        email = obj.get("email")
-        if not email:
-            logging.warning("Skipping malformed user record: %s", obj)
-            continue
-
-        first_name = obj.get("first_name") or obj.get("firstName") or obj.get("given_name")
-        last_name = obj.get("last_name") or obj.get("lastName") or obj.get("family_name")
-        phone = obj.get("phone") or obj.get("phone_number")
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert user %s (first=%s last=%s phone=%s)", email, first_name, last_name, phone)
-            created += 1
-            continue
+    Accepts `gs://bucket/name`, `file:///path`, or a blob name in `bucket`.
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return "file", "", os.path.abspath(unquote(parsed.path))
+    if parsed.scheme == "gs":
+        return "gs", parsed.netloc, parsed.path.lstrip("/")
+    if parsed.scheme:
+        raise ValueError(f"Unsupported source {uri!r}")
+    if not bucket:
+        raise ValueError(f"{uri!r} needs --bucket or a gs:// / file:// prefix")
+    return "gs", bucket, uri
+
+
+def source_key(uri: str, bucket: Optional[str] = None) -> str:
+    """Canonical URI of a source, used as its import ledger key."""
+    scheme, bucket, name = resolve_source(uri, bucket)
+    return f"file://{name}" if scheme == "file" else f"gs://{bucket}/{name}"
+
+
+def open_source(uri: str, client: Optional[storage.Client] = None, bucket: Optional[str] = None) -> IO[bytes]:
+    """Open an export for streaming (see `resolve_source` for the accepted forms)."""
+    scheme, bucket, name = resolve_source(uri, bucket)
+    if scheme == "file":
+        return open(name, "rb")
+    client = client or make_gcs_client()
+    # BlobReader fetches the object in ranged chunks instead of downloading it whole
+    return client.bucket(bucket).blob(name).open("rb", chunk_size=STREAM_CHUNK_BYTES)
+
+
+def source_fingerprint(uri: str, client: Optional[storage.Client] = None, bucket: Optional[str] = None) -> str:
+    """Content hash of a source: GCS object metadata (no download), or sha256 of a local file."""
+    from app.services.import_ledger import stream_fingerprint
+
+    scheme, bucket, name = resolve_source(uri, bucket)
+    if scheme == "file":
+        with open(name, "rb") as stream:
+            return stream_fingerprint(stream)
+    client = client or make_gcs_client()
+    blob = client.bucket(bucket).get_blob(name)
+    if blob is None:
+        raise FileNotFoundError(f"gs://{bucket}/{name}")
+    # Composite objects have no md5; generation changes whenever the object is rewritten
+    return f"md5:{blob.md5_hash}" if blob.md5_hash else f"crc32c:{blob.crc32c}:{blob.generation}"
+
+
+def iter_records(stream: IO[bytes]) -> Iterator[dict]:
+    """Incrementally decode the top-level JSON array of an export file."""
+    from app.utils.jsonstream import iter_root_items
+
+    return iter_root_items(stream)
+
+
+STREAM_CHUNK_BYTES = 4 * 1024 * 1024
+_DONE = object()
+
+
+class _Prefetch:
+    """Read and parse one file on a worker thread into a bounded queue of record chunks."""
+
+    def __init__(self, opener, chunk_size: int, depth: int, stop: threading.Event):
+        self.opener = opener
+        self.chunk_size = chunk_size
+        self.queue: "queue.Queue" = queue.Queue(maxsize=depth)
+        self.stop = stop
+        self.abandoned = threading.Event()
+
+    def _put(self, item) -> bool:
+        while not (self.stop.is_set() or self.abandoned.is_set()):
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-        db = SessionLocal()
+    def run(self) -> None:
         try:
-            existing = db.query(User).filter(User.email == email).one_or_none()
-            if existing:
-                changed = False
-                if first_name and existing.first_name != first_name:
-                    existing.first_name = first_name
-                    changed = True
-                if last_name and existing.last_name != last_name:
-                    existing.last_name = last_name
-                    changed = True
-                if phone and existing.phone_number != phone:
-                    existing.phone_number = phone
-                    changed = True
-                if changed:
-                    db.add(existing)
-                    db.commit()
-                    updated += 1
-            else:
-                u = User(email=email, hashed_password=obj.get("hashed_password") or "", first_name=first_name, last_name=last_name, phone_number=phone)
-                db.add(u)
-                db.commit()
-                created += 1
-        except IntegrityError:
-            db.rollback()
-            logging.exception("Integrity error upserting user %s", email)
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert user %s", email)
-        finally:
-            db.close()
-
-    return {"created": created, "updated": updated}
-
-
-def _parse_iso_to_utc(dt_str: str):
-    """Parse various ISO-like strings to a timezone-aware UTC datetime.
-    Returns None on parse failure.
+            with self.opener() as stream:
+                chunk: List[dict] = []
+                for record in iter_records(stream):
+                    chunk.append(record)
+                    if len(chunk) >= self.chunk_size:
+                        if not self._put(chunk):
+                            return
+                        chunk = []
+                if chunk and not self._put(chunk):
+                    return
+            self._put(_DONE)
+        except Exception as exc:  # handed to the consumer, which reports it for this file
+            self._put(exc)
+
+    def records(self) -> Iterator[dict]:
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+
+def stream_sources(openers, workers: int = 4, chunk_size: int = 1000, depth: int = 2):
+    """Yield `(index, records)` per opener in order, reading up to `workers` files ahead.
+
+    Each file holds at most `depth` chunks of `chunk_size` records in memory while it waits to
+    be written. The caller must consume each `records` iterator before asking for the next.
     """
-    from datetime import datetime, timezone
-    if not dt_str:
-        return None
+    stop = threading.Event()
+    jobs = [_Prefetch(opener, chunk_size, depth, stop) for opener in openers]
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="import-read")
     try:
-        # Let Python parse common ISO formats; fallback to simple fromisoformat
-        dt = datetime.fromisoformat(dt_str)
-    except Exception:
-        try:
-            # Some strings may end with Z
-            if dt_str.endswith("Z"):
-                dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
-            else:
-                return None
-        except Exception:
-            return None
-
-    # Ensure timezone-aware and converted to UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc).replace(tzinfo=None)
-
-
-def process_weeks(data: Iterable[dict], dry_run: bool = True) -> dict:
-    created = 0
-    updated = 0
-    SessionLocal, Week, _ = None, None, None
-    # lazy import of Week model
-    try:
-        from app.db import SessionLocal as _SessionLocal
-        from app.models.week import Week
-        SessionLocal = _SessionLocal
-    except Exception:
-        logging.exception("Failed to import Week model -- are app packages available?")
-        return {"error": "import_failed"}
-
-    for obj in data:
-        season = obj.get("season_year") or obj.get("season")
-        week_number = obj.get("week_number") or obj.get("week")
-        if season is None or week_number is None:
-            logging.warning("Skipping malformed week record: %s", obj)
-            continue
-
-        lock_time_raw = obj.get("lock_time") or obj.get("lockTime")
-        lock_time = _parse_iso_to_utc(lock_time_raw)
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert week season=%s week=%s lock_time=%s", season, week_number, lock_time)
-            created += 1
-            continue
-
-        db = SessionLocal()
-        try:
-            existing = db.query(Week).filter(Week.season_year == season, Week.week_number == week_number).one_or_none()
-            if existing:
-                changed = False
-                if lock_time and existing.lock_time != lock_time:
-                    existing.lock_time = lock_time
-                    changed = True
-                if changed:
-                    db.add(existing)
-                    db.commit()
-                    updated += 1
-            else:
-                w = Week(season_year=season, week_number=week_number, is_current=obj.get("is_current", False), lock_time=lock_time)
-                db.add(w)
-                db.commit()
-                created += 1
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert week %s-%s", season, week_number)
-        finally:
-            db.close()
-
-    return {"created": created, "updated": updated}
-
+        # Submission order is consumption order, so a blocked reader never starves the file
+        # currently being written
+        for job in jobs:
+            pool.submit(job.run)
+        for index, job in enumerate(jobs):
+            yield index, job.records()
+            # A file whose write failed is not drained; release its reader's worker
+            job.abandoned.set()
+    finally:
+        stop.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_import(
+    kind: str,
+    data: Iterable[dict],
+    dry_run: bool,
+    chunk_size: int = 1000,
+    source: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+) -> dict:
+    """Import one file's records with the set-based engine.
+
+    With a `source` the run is checkpointed in the import ledger under that key; otherwise the
+    file is one transaction.
+    """
+    from app.services.import_ledger import ImportLedger
+    from app.services.legacy_import import BulkImporter
 
-def process_games(data: Iterable[dict], dry_run: bool = True) -> dict:
-    created = 0
-    updated = 0
+    if dry_run:
+        return BulkImporter(None, chunk_size=chunk_size, dry_run=True).import_records(kind, data)
 
-    # Lazy import models
+    SessionLocal = _import_db()
+    db = SessionLocal()
     try:
-        from app.db import SessionLocal as _SessionLocal
-        from app.models.game import Game
-        from app.models.team import Team
-        from app.models.week import Week
-        SessionLocal = _SessionLocal
-    except Exception:
-        logging.exception("Failed to import Game/Team/Week models -- are app packages available?")
-        return {"error": "import_failed"}
-
-    for obj in data:
-        # Expect fields: season_year, week_number, start_time, home_abbr, away_abbr
-        season = obj.get("season_year") or obj.get("season")
-        week_number = obj.get("week_number") or obj.get("week")
-        if season is None or week_number is None:
-            logging.warning("Skipping malformed game record (missing season/week): %s", obj)
-            continue
-
-        start_time = _parse_iso_to_utc(obj.get("start_time") or obj.get("startTime"))
-        home_abbr = obj.get("home_team_abbr") or obj.get("home_abbr")
-        away_abbr = obj.get("away_team_abbr") or obj.get("away_abbr")
-        if not home_abbr or not away_abbr or not start_time:
-            logging.warning("Skipping malformed game record (missing team or time): %s", obj)
-            continue
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert game %s vs %s at %s (season=%s week=%s)", home_abbr, away_abbr, start_time, season, week_number)
-            created += 1
-            continue
-
-        db = SessionLocal()
-        try:
-            # Resolve week id
-            week = db.query(Week).filter(Week.season_year == season, Week.week_number == week_number).one_or_none()
-            if not week:
-                logging.warning("Week not found for game: season=%s week=%s", season, week_number)
-                continue
+        ledger = ImportLedger(db, source, kind, chunk_size, fingerprint) if source else None
+        return BulkImporter(db, chunk_size=chunk_size, ledger=ledger).import_records(kind, data)
+    except Exception as exc:
+        # Only the failing chunk (or, without a ledger, the whole file) was rolled back
+        logging.exception("Failed to import %s", kind)
+        return {"error": str(exc)}
+    finally:
+        db.close()
 
-            # Resolve team ids
-            home_team = db.query(Team).filter(Team.abbreviation == home_abbr).one_or_none()
-            away_team = db.query(Team).filter(Team.abbreviation == away_abbr).one_or_none()
-
-            g = db.query(Game).filter(Game.week_id == week.id, Game.start_time == start_time, Game.home_team_abbr == home_abbr, Game.away_team_abbr == away_abbr).one_or_none()
-            if g:
-                changed = False
-                if g.start_time != start_time:
-                    g.start_time = start_time
-                    changed = True
-                if home_team and g.home_team_id != home_team.id:
-                    g.home_team_id = home_team.id
-                    changed = True
-                if away_team and g.away_team_id != away_team.id:
-                    g.away_team_id = away_team.id
-                    changed = True
-                if changed:
-                    db.add(g)
-                    db.commit()
-                    updated += 1
-            else:
-                newg = Game(week_id=week.id, start_time=start_time, home_team_abbr=home_abbr, away_team_abbr=away_abbr, home_team_id=(home_team.id if home_team else None), away_team_id=(away_team.id if away_team else None), status=obj.get("status", "scheduled"))
-                db.add(newg)
-                db.commit()
-                created += 1
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert game: %s", obj)
-        finally:
-            db.close()
 
-    return {"created": created, "updated": updated}
+def process_teams(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    """Process teams list JSON objects. Returns summary dict."""
+    return _run_import("teams", data, dry_run, chunk_size)
 
 
-def process_entries(data: Iterable[dict], dry_run: bool = True) -> dict:
-    """Process entries.json which links users and weeks."""
-    created = 0
-    updated = 0
+def process_users(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    return _run_import("users", data, dry_run, chunk_size)
 
-    # lazy imports
-    try:
-        from app.db import SessionLocal as _SessionLocal
-        from app.models.entry import Entry
-        from app.models.user import User
-        from app.models.week import Week
-        SessionLocal = _SessionLocal
-    except Exception:
-        logging.exception("Failed to import Entry/User/Week models -- are app packages available?")
-        return {"error": "import_failed"}
-
-    for obj in data:
-        # expected fields: user_email, season_year, week_number, name, picks (json)
-        user_email = obj.get("user_email") or obj.get("email")
-        season = obj.get("season_year") or obj.get("season")
-        week_number = obj.get("week_number") or obj.get("week")
-        name = obj.get("name") or obj.get("entry_name")
-        picks = obj.get("picks")
-
-        if not user_email or season is None or week_number is None or not name:
-            logging.warning("Skipping malformed entry record: %s", obj)
-            continue
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert entry %s for user %s season=%s week=%s", name, user_email, season, week_number)
-            created += 1
-            continue
-
-        db = SessionLocal()
-        try:
-            user = db.query(User).filter(User.email == user_email).one_or_none()
-            if not user:
-                logging.warning("User not found for entry: %s", user_email)
-                continue
 
-            week = db.query(Week).filter(Week.season_year == season, Week.week_number == week_number).one_or_none()
-            if not week:
-                logging.warning("Week not found for entry: season=%s week=%s", season, week_number)
-                continue
+def process_weeks(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    return _run_import("weeks", data, dry_run, chunk_size)
 
-            existing = db.query(Entry).filter(Entry.user_id == user.id, Entry.season_year == season, Entry.name == name).one_or_none()
-            if existing:
-                changed = False
-                if picks is not None and existing.picks != picks:
-                    existing.picks = picks
-                    changed = True
-                if changed:
-                    db.add(existing)
-                    db.commit()
-                    updated += 1
-            else:
-                e = Entry(user_id=user.id, week_id=week.id, name=name, season_year=season, picks=picks or [], is_eliminated=obj.get("is_eliminated", False), is_paid=obj.get("is_paid", False))
-                db.add(e)
-                db.commit()
-                created += 1
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert entry: %s", obj)
-        finally:
-            db.close()
 
-    return {"created": created, "updated": updated}
+def process_games(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    return _run_import("games", data, dry_run, chunk_size)
 
 
-def process_picks(data: Iterable[dict], dry_run: bool = True) -> dict:
-    """Process picks.json linking entries, weeks, and teams/games."""
-    created = 0
-    updated = 0
-
-    try:
-        from app.db import SessionLocal as _SessionLocal
-        from app.models.pick import Pick
-        from app.models.entry import Entry
-        from app.models.week import Week
-        from app.models.team import Team
-        from app.models.game import Game
-        from app.models.user import User
-        SessionLocal = _SessionLocal
-    except Exception:
-        logging.exception("Failed to import Pick/Entry/Week/Team/Game models -- are app packages available?")
-        return {"error": "import_failed"}
-
-    for obj in data:
-        # expected: entry_name or entry_id, user_email, season_year, week_number, team_abbr or team_id
-        entry_name = obj.get("entry_name")
-        entry_id = obj.get("entry_id")
-        user_email = obj.get("user_email") or obj.get("email")
-        season = obj.get("season_year") or obj.get("season")
-        week_number = obj.get("week_number") or obj.get("week")
-        team_abbr = obj.get("team_abbr") or obj.get("team")
-
-        if season is None or week_number is None or (not entry_id and not (entry_name and user_email)):
-            logging.warning("Skipping malformed pick record: %s", obj)
-            continue
-
-        if dry_run:
-            logging.info("DRY-RUN: Would upsert pick for entry=%s user=%s season=%s week=%s team=%s", entry_id or entry_name, user_email, season, week_number, team_abbr)
-            created += 1
-            continue
-
-        db = SessionLocal()
-        try:
-            # resolve entry
-            entry = None
-            if entry_id:
-                entry = db.query(Entry).filter(Entry.id == entry_id).one_or_none()
-            else:
-                user = db.query(User).filter(User.email == user_email).one_or_none()
-                if user:
-                    entry = db.query(Entry).filter(Entry.user_id == user.id, Entry.season_year == season, Entry.name == entry_name).one_or_none()
-
-            if not entry:
-                logging.warning("Entry not found for pick: %s", obj)
-                continue
+def process_entries(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    """Process entries.json which links users and weeks."""
+    return _run_import("entries", data, dry_run, chunk_size)
 
-            week = db.query(Week).filter(Week.season_year == season, Week.week_number == week_number).one_or_none()
-            if not week:
-                logging.warning("Week not found for pick: season=%s week=%s", season, week_number)
-                continue
 
-            # resolve team
-            team = None
-            if team_abbr:
-                team = db.query(Team).filter(Team.abbreviation == team_abbr).one_or_none()
-
-            existing = db.query(Pick).filter(Pick.entry_id == entry.id, Pick.week_id == week.id).one_or_none()
-            if existing:
-                changed = False
-                if team and existing.team_id != team.id:
-                    existing.team_id = team.id
-                    existing.team_abbr = team_abbr
-                    changed = True
-                if changed:
-                    db.add(existing)
-                    db.commit()
-                    updated += 1
-            else:
-                p = Pick(entry_id=entry.id, week_id=week.id, team_id=(team.id if team else None), team_abbr=team_abbr)
-                db.add(p)
-                db.commit()
-                created += 1
-        except Exception:
-            db.rollback()
-            logging.exception("Failed to upsert pick: %s", obj)
-        finally:
-            db.close()
-
-    return {"created": created, "updated": updated}
+def process_picks(data: Iterable[dict], dry_run: bool = True, chunk_size: int = 1000) -> dict:
+    """Process picks.json linking entries, weeks, and teams/games."""
+    return _run_import("picks", data, dry_run, chunk_size)
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = argparse.ArgumentParser(description="Import legacy JSON exports from GCS")
-    parser.add_argument("--bucket", required=True, help="GCS bucket name")
-    parser.add_argument("--files", required=True, help="Comma-separated list of file names to import (e.g. teams.json,users.json)")
+    parser = argparse.ArgumentParser(description="Import legacy JSON exports from GCS or local files")
+    parser.add_argument("--bucket", help="GCS bucket for file names given without a gs:// or file:// prefix")
+    parser.add_argument("--files", required=True, help="Comma-separated list of files to import (e.g. teams.json,users.json, gs://bucket/picks.json, file:///tmp/picks.json)")
     parser.add_argument("--dry-run", action="store_true", help="Do not persist changes; only show summary")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Records staged per INSERT ... ON CONFLICT batch")
+    parser.add_argument("--workers", type=int, default=4, help="Files downloaded and parsed concurrently")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Skip the import ledger: no resume, no unchanged-file skip")
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
 
     args = parser.parse_args(argv)
 
+    from app.services.legacy_import import kind_for_filename
+
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
 
-    client = make_gcs_client()
+    client_lock = threading.Lock()
+    clients: dict = {}
+
+    def gcs_client():
+        # Created on first use so file:// runs need no credentials
+        with client_lock:
+            if "client" not in clients:
+                clients["client"] = make_gcs_client()
+            return clients["client"]
+
+    def client_for(fname):
+        return None if urlparse(fname).scheme == "file" else gcs_client()
 
     summary = {}
+    files = []
     for fname in [f.strip() for f in args.files.split(",") if f.strip()]:
-        logging.info("Downloading %s from bucket %s", fname, args.bucket)
+        if kind_for_filename(urlparse(fname).path or fname) is None:
+            logging.warning("No handler for %s; skipping", fname)
+            summary[fname] = {"skipped": True}
+        else:
+            files.append(fname)
+
+    checkpoints: dict = {}
+    if not args.dry_run and not args.no_checkpoint:
+        from app.services.import_ledger import ImportLedger
+
+        db = _import_db()()
         try:
-            text = download_blob_to_text(client, args.bucket, fname)
-        except Exception as exc:  # network/auth errors surface here
-            logging.error("Failed to download %s: %s", fname, exc)
-            summary[fname] = {"error": str(exc)}
-            continue
+            for fname in list(files):
+                try:
+                    key = source_key(fname, args.bucket)
+                    fingerprint = source_fingerprint(fname, client_for(fname), args.bucket)
+                except Exception as exc:
+                    logging.error("Failed to read %s: %s", fname, exc)
+                    summary[fname] = {"error": str(exc)}
+                    files.remove(fname)
+                    continue
+                kind = kind_for_filename(urlparse(fname).path or fname)
+                if ImportLedger(db, key, kind, args.chunk_size, fingerprint).is_current():
+                    logging.info("%s unchanged since its last import; skipping", fname)
+                    summary[fname] = {"skipped": "unchanged"}
+                    files.remove(fname)
+                    continue
+                checkpoints[fname] = (key, fingerprint)
+        finally:
+            db.close()
+
+    def opener(fname):
+        def open_file():
+            logging.info("Streaming %s", fname)
+            return open_source(fname, client_for(fname), args.bucket)
+        return open_file
 
+    for index, records in stream_sources([opener(f) for f in files], workers=args.workers, chunk_size=args.chunk_size):
+        fname = files[index]
+        kind = kind_for_filename(urlparse(fname).path or fname)
+        source, fingerprint = checkpoints.get(fname, (None, None))
         try:
-            data = parse_json_text(text)
-        except Exception as exc:
-            logging.error("Failed to parse JSON for %s: %s", fname, exc)
-            summary[fname] = {"error": "invalid_json"}
-            continue
-
-        # Dispatch by file name prefix
-        if fname.lower().startswith("teams"):
-            summary[fname] = process_teams(data, dry_run=args.dry_run)
-        elif fname.lower().startswith("users"):
-            summary[fname] = process_users(data, dry_run=args.dry_run)
-        elif fname.lower().startswith("weeks"):
-            summary[fname] = process_weeks(data, dry_run=args.dry_run)
-        elif fname.lower().startswith("games"):
-            summary[fname] = process_games(data, dry_run=args.dry_run)
-        elif fname.lower().startswith("entries"):
-            summary[fname] = process_entries(data, dry_run=args.dry_run)
-        elif fname.lower().startswith("picks"):
-            summary[fname] = process_picks(data, dry_run=args.dry_run)
-        else:
-            logging.warning("No handler for %s; skipping", fname)
-            summary[fname] = {"skipped": True}
+            summary[fname] = _run_import(kind, records, args.dry_run, args.chunk_size, source, fingerprint)
+        except Exception as exc:  # download, auth or JSON errors surface while streaming
+            logging.error("Failed to read %s: %s", fname, exc)
+            summary[fname] = {"error": str(exc)}
 
     logging.info("Import summary: %s", summary)
     if args.dry_run:
@@ -0,0 +1,47 @@
+"""
+Rebuild (and optionally verify) the precomputed history matrix in `history_matrix_rows`.
+
+Reads trust the maintained rows, so run this after restores, raw SQL or any other write that
+bypasses the entry/pick services.
+Uses DATABASE_URL like the app does.
+
+Usage:
+python scripts/rebuild_history_matrix.py
+python scripts/rebuild_history_matrix.py --season 2025 --verify
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import app.main  # noqa: E402,F401  (registers every model mapper)
+from app.db import SessionLocal  # noqa: E402
+from app.services.history_matrix import rebuild_history_matrix, verify_history_matrix  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--season", type=int, default=None, help="only rebuild this season (default: all)")
+    parser.add_argument("--verify", action="store_true", help="compare the rebuilt rows against the picks table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = rebuild_history_matrix(db, args.season)
+        print(f"rebuilt {count} rows" + (f" for season {args.season}" if args.season is not None else ""))
+        if args.verify:
+            report = verify_history_matrix(db, args.season)
+            if not report["ok"]:
+                print(f"mismatched entries: {report['mismatched_entries']}")
+                return 1
+            print("verify ok")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app import db as app_db
+from app.core.config import settings
+from app.main import app
+from app.models.base import Base
+from app.models.entry import Entry
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.principals import clear_principal_cache
+from app.utils import security
+
+
+@pytest.fixture()
+def seeded(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'async.db'}")
+    clear_principal_cache()
+    Base.metadata.create_all(bind=app_db.engine)
+    db = app_db.SessionLocal()
+    try:
+        soon = datetime.now(timezone.utc) + timedelta(hours=1)
+        user = User(email="async@example.com", hashed_password="x")
+        week = Week(season_year=2025, week_number=1, is_current=True, lock_time=soon)
+        team = Team(abbreviation="ASY", name="Async")
+        db.add_all([user, week, team])
+        db.commit()
+        entry = Entry(user_id=user.id, week_id=week.id, name="Async 1", season_year=2025, picks=[])
+        db.add(entry)
+        db.commit()
+        yield {"user": user.id, "week": week.id, "team": team.id, "entry": entry.id}
+    finally:
+        db.close()
+        clear_principal_cache()
+
+
+def _run(requests):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            try:
+                return await asyncio.gather(*(client.request(*r[:2], **r[2]) for r in requests))
+            finally:
+                # Pooled aiosqlite connections belong to this event loop
+                await app_db.dispose_async_engine()
+
+    return asyncio.run(go())
+
+
+def test_async_url_swaps_drivers():
+    assert app_db.async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+    assert app_db.async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    with pytest.raises(ValueError):
+        app_db.async_database_url("mysql://h/db")
+
+
+def test_hot_routes_run_on_the_async_engine_without_the_threadpool(seeded, monkeypatch):
+    def no_threadpool(*_args, **_kwargs):
+        raise AssertionError("async routes must not use the threadpool")
+
+    monkeypatch.setattr(app_db, "run_in_threadpool", no_threadpool)
+    sync_before = app_db._pool_stats.snapshot()["checkouts"]
+    headers = {"Authorization": f"Bearer {security.create_access_token(str(seeded['user']))}"}
+    body = {"entry_id": seeded["entry"], "week_id": seeded["week"], "team_id": seeded["team"]}
+
+    created, = _run([("POST", "/api/picks", {"json": body, "headers": headers})])
+    assert created.status_code == 201
+    responses = _run(
+        [("GET", "/api/dashboard", {"headers": headers})] * 5
+        + [("GET", "/api/history/matrix", {}), ("GET", f"/api/public/pre-reveal/{seeded['week']}", {})]
+        + [("GET", f"/api/public/weeks/{seeded['week']}/reveal-snapshot", {})]
+    )
+    assert [r.status_code for r in responses] == [200] * 8
+    assert responses[0].json()["entries"][0]["current_pick"]["team_abbr"] == "ASY"
+    assert responses[6].json()["exists"] is True
+    # Everything above went through the aiosqlite engine
+    assert app_db._pool_stats.snapshot()["checkouts"] == sync_before
+    assert app_db._async_pool_stats.snapshot()["checkouts"] > 0
+
+
+def test_disabled_async_falls_back_to_sync_sessions(seeded, monkeypatch):
+    monkeypatch.setattr(settings, "ASYNC_DB_ENABLED", False)
+    async_before = app_db._async_pool_stats.snapshot()["checkouts"]
+    resp, = _run([("GET", "/api/history/matrix", {})])
+    assert resp.status_code == 200
+    assert app_db._async_pool_stats.snapshot()["checkouts"] == async_before
@@ -0,0 +1,107 @@
+import sys
+import os
+import asyncio
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def use_temp_db(tmp_path):
+    """Set a unique DATABASE_URL per test to avoid locking and collisions."""
+    db_file = tmp_path / "test.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+    yield
+    os.environ.pop("DATABASE_URL", None)
+
+
+import app.main  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.game import Game  # noqa: E402
+from app.models.week import Week  # noqa: E402
+from app.db import engine, SessionLocal  # noqa: E402
+from app.services.backfill import backfill_weeks  # noqa: E402
+from app.services.espn_client import ScoreboardFetch  # noqa: E402
+
+
+def _payload(week):
+    return {"events": [{
+        "date": f"2025-09-{week + 6:02d}T17:00:00Z",
+        "status": {"type": {"state": "pre"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "away", "team": {"abbreviation": "MIA"}},
+            {"homeAway": "home", "team": {"abbreviation": f"H{week}"}},
+        ]}],
+    }]}
+
+
+class FakeClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_week(self, year, week):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        if week == 13:
+            raise RuntimeError("boom")
+        return ScoreboardFetch(_payload(week), True, 200, str(week))
+
+    async def aclose(self):
+        pass
+
+
+def test_backfill_syncs_weeks_concurrently_and_reports_failures():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([Week(season_year=2025, week_number=w) for w in range(1, 6)] + [Week(season_year=2025, week_number=13)])
+    db.commit()
+    db.close()
+
+    client = FakeClient()
+    # week 6 has no Week row and week 13 fails to fetch; both are reported, the rest still sync
+    pairs = [(2025, w) for w in (1, 2, 3, 4, 5, 6, 13)]
+    report = asyncio.run(backfill_weeks(pairs, concurrency=3, client=client))
+
+    assert client.max_in_flight == 3
+    assert report["ok"] == 5 and report["failed"] == 2
+    by_week = {w["week"]: w for w in report["weeks"]}
+    assert by_week[1]["status"] == "ok" and by_week[1]["created"] == 1
+    assert {"fetch_ms", "transform_ms", "sync_ms"} <= set(by_week[1])
+    assert by_week[6]["status"] == "error" and "Week not found" in by_week[6]["error"]
+    assert by_week[13]["status"] == "error" and by_week[13]["error"] == "boom"
+
+    db = SessionLocal()
+    try:
+        assert db.query(Game).count() == 5
+    finally:
+        db.close()
+
+    # Re-running is idempotent: the diff-based sync leaves existing games untouched
+    again = asyncio.run(backfill_weeks([(2025, 1)], client=FakeClient()))
+    assert again["weeks"][0]["unchanged"] == 1 and again["weeks"][0]["created"] == 0
+
+
+def test_backfill_rejects_bad_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(backfill_weeks([(2025, 1)], concurrency=0, client=FakeClient()))
+
+
+def test_backfill_transforms_in_a_process_pool():
+    from concurrent.futures import ProcessPoolExecutor
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add_all([Week(season_year=2025, week_number=w) for w in (1, 2)])
+    db.commit()
+    db.close()
+
+    with ProcessPoolExecutor(2) as executor:
+        report = asyncio.run(backfill_weeks([(2025, 1), (2025, 2)], client=FakeClient(), executor=executor))
+    assert report["ok"] == 2
+    assert [w["created"] for w in report["weeks"]] == [1, 1]
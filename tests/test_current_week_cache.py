@@ -0,0 +1,152 @@
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def use_temp_db(tmp_path):
+    """Set a unique DATABASE_URL per test to avoid locking and collisions."""
+    db_file = tmp_path / "test.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+    yield
+    os.environ.pop("DATABASE_URL", None)
+
+
+from app.main import app  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.week import Week  # noqa: E402
+from app.db import engine, SessionLocal  # noqa: E402
+from app.routes.auth import require_admin  # noqa: E402
+from app.services.cache import MemoryCacheBackend, SQLiteCacheBackend, set_cache  # noqa: E402
+from app.services.dashboard import get_current_week_info  # noqa: E402
+
+
+@pytest.mark.parametrize("make", [lambda p: MemoryCacheBackend(), lambda p: SQLiteCacheBackend(str(p / "cache.db"))])
+def test_backend_roundtrip_and_expiry(tmp_path, make):
+    cache = make(tmp_path)
+    cache.set("k", {"a": [1, 2]}, ttl=60)
+    assert cache.get("k") == {"a": [1, 2]}
+    cache.set("short", 1, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    cache.delete("k")
+    assert cache.get("k") is None
+
+
+def test_incomplete_backend_fails_at_construction():
+    from app.services.cache import CacheBackend
+
+    class NoClear(CacheBackend):
+        def get(self, key):
+            return None
+
+        def set(self, key, value, ttl):
+            pass
+
+        def delete(self, key):
+            pass
+
+    with pytest.raises(TypeError):
+        NoClear()
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    # Two backends on one file stand in for two uvicorn worker processes
+    worker_a = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    worker_b = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    worker_a.set("current_week:x", {"week": {"week_id": 1}}, ttl=60)
+    assert worker_b.get("current_week:x") == {"week": {"week_id": 1}}
+    worker_b.delete("current_week:x")
+    assert worker_a.get("current_week:x") is None
+
+
+def test_redis_backend_roundtrip():
+    pytest.importorskip("redis")
+    from app.services.cache import RedisCacheBackend
+
+    cache = RedisCacheBackend(os.environ.get("TEST_REDIS_URL", "redis://localhost:6379/15"), prefix="test:")
+    try:
+        cache.set("k", [1], ttl=5)
+    except Exception:
+        pytest.skip("no Redis server available")
+    assert cache.get("k") == [1]
+    cache.clear()
+
+
+def test_week_routes_invalidate_cached_week_and_countdown_is_live(tmp_path):
+    set_cache(SQLiteCacheBackend(str(tmp_path / "cache.db")))
+    app.dependency_overrides[require_admin] = lambda: True
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        lock = datetime.now(timezone.utc) + timedelta(hours=1)
+        w1 = Week(season_year=2025, week_number=1, is_current=True, lock_time=lock)
+        w2 = Week(season_year=2025, week_number=2, lock_time=lock + timedelta(days=7))
+        db.add_all([w1, w2])
+        db.commit()
+        w1_id, w2_id = w1.id, w2.id
+
+        first = get_current_week_info(db)
+        assert first["week_id"] == w1_id
+        time.sleep(1.1)
+        # Served from cache, but the countdown is recomputed rather than cached
+        second = get_current_week_info(db)
+        assert second["lock_time"] == first["lock_time"]
+        assert second["countdown_seconds"] < first["countdown_seconds"]
+
+        # Direct DB writes are not seen until invalidation...
+        db.query(Week).filter(Week.id == w1_id).update({"lock_time": lock + timedelta(hours=5)})
+        db.commit()
+        assert get_current_week_info(db)["lock_time"] == first["lock_time"]
+
+        client = TestClient(app)
+        # ...which PATCH /api/weeks/{id} performs
+        new_lock = (lock + timedelta(hours=2)).isoformat()
+        assert client.patch(f"/api/weeks/{w1_id}", json={"lock_time": new_lock, "ineligible_teams": None, "locked_games": None, "is_current": None}).status_code == 200
+        assert get_current_week_info(db)["lock_time"] == lock + timedelta(hours=2)
+
+        assert client.post("/api/weeks/admin/set-current", params={"week_id": w2_id}).status_code == 204
+        assert get_current_week_info(db)["week_number"] == 2
+        db.close()
+    finally:
+        app.dependency_overrides.pop(require_admin, None)
+        set_cache(None)
+
+
+def test_blocking_backends_leave_the_event_loop_inside_run_sync(tmp_path):
+    import asyncio
+    import threading
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    threads = []
+
+    class RecordingBackend(SQLiteCacheBackend):
+        def _get(self, key):
+            threads.append(threading.get_ident())
+            return super()._get(key)
+
+    cache = RecordingBackend(str(tmp_path / "cache.db"))
+    cache.set("k", 1, ttl=60)
+
+    async def go():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with AsyncSession(engine) as session:
+                assert await session.run_sync(lambda _: cache.get("k")) == 1
+        finally:
+            await engine.dispose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(go())
+    assert threads[0] != loop_thread
+    # Outside an async session the call stays inline
+    assert cache.get("k") == 1 and threads[1] == threading.get_ident()
@@ -46,3 +46,113 @@ def test_get_entries_for_user_and_week_info():
         assert "countdown_seconds" in week_info
     finally:
         db.close()
+
+
+def test_dashboard_data_is_one_query_then_cached_until_invalidated():
+    from sqlalchemy import event
+    from app.models.team import Team
+    from app.services.current_week import invalidate_current_week
+    from app.services.dashboard import get_current_week_info, get_dashboard_data, invalidate_all_dashboards
+    from app.services.picks import create_pick
+
+    db = SessionLocal()
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    bind = db.get_bind()
+    try:
+        invalidate_all_dashboards()
+        db.query(Week).filter(Week.is_current == True).update({"is_current": False})  # noqa: E712
+        w = Week(season_year=2025, week_number=7, is_current=True, lock_time=datetime.now(timezone.utc) + timedelta(hours=2))
+        t = Team(abbreviation="DQ1", name="Dash Team")
+        db.add_all([w, t])
+        db.commit()
+        e1 = Entry(user_id=4242, week_id=w.id, name="D1", season_year=2025, picks=[], is_eliminated=False)
+        e2 = Entry(user_id=4242, week_id=w.id, name="D2", season_year=2025, picks=[], is_eliminated=True)
+        db.add_all([e1, e2])
+        db.commit()
+        week_id, entry_id, team_id = w.id, e1.id, t.id
+        invalidate_all_dashboards()
+        invalidate_current_week(db)
+        assert get_current_week_info(db)["week_id"] == week_id  # warm the current-week cache
+
+        event.listen(bind, "before_cursor_execute", count)
+        data = get_dashboard_data(db, 4242)
+        assert len(statements) == 1
+        assert data["current_week"]["week_id"] == week_id
+        assert data["current_week"]["countdown_seconds"] > 3600
+        assert [(e["name"], e["is_eliminated"], e["current_pick"]) for e in data["entries"]] == [
+            ("D1", False, None),
+            ("D2", True, None),
+        ]
+
+        again = get_dashboard_data(db, 4242)
+        assert len(statements) == 1
+        assert again["entries"] == data["entries"]
+        event.remove(bind, "before_cursor_execute", count)
+
+        # Creating a pick invalidates that user's cached dashboard
+        create_pick(db, 4242, entry_id, week_id, team_id)
+        fresh = get_dashboard_data(db, 4242)
+        assert fresh["entries"][0]["current_pick"] == {"team_id": team_id, "team_abbr": "DQ1", "team_name": "Dash Team"}
+
+        # A user with no entries still sees the current week
+        empty = get_dashboard_data(db, 999999)
+        assert empty["entries"] == [] and empty["current_week"]["week_id"] == week_id
+    finally:
+        if event.contains(bind, "before_cursor_execute", count):
+            event.remove(bind, "before_cursor_execute", count)
+        # Tables are dropped at teardown; don't leave this week cached for later modules
+        invalidate_current_week(db)
+        db.close()
+
+
+def test_dashboard_invalidation_reaches_other_workers(tmp_path):
+    from app.models.team import Team
+    from app.services.cache import SQLiteCacheBackend, set_cache
+    from app.services.current_week import invalidate_current_week
+    from app.services.dashboard import dashboard_cache_stats, get_dashboard_data, invalidate_all_dashboards
+    from app.services.picks import create_pick
+
+    # Two backends on one file stand in for two uvicorn worker processes
+    worker_a = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    worker_b = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    db = SessionLocal()
+    try:
+        set_cache(worker_a)
+        db.query(Week).filter(Week.is_current == True).update({"is_current": False})  # noqa: E712
+        w = Week(season_year=2025, week_number=8, is_current=True, lock_time=datetime.now(timezone.utc) + timedelta(hours=2))
+        t = Team(abbreviation="DW1", name="Worker Team")
+        db.add_all([w, t])
+        db.commit()
+        e = Entry(user_id=4343, week_id=w.id, name="W1", season_year=2025, picks=[], is_eliminated=False)
+        db.add(e)
+        db.commit()
+        week_id, entry_id, team_id = w.id, e.id, t.id
+        invalidate_current_week(db)
+
+        set_cache(worker_b)
+        assert get_dashboard_data(db, 4343)["entries"][0]["current_pick"] is None
+        hits = dashboard_cache_stats()["hits"]
+        get_dashboard_data(db, 4343)
+        assert dashboard_cache_stats()["hits"] == hits + 1
+
+        # A pick made through worker A drops the dashboard worker B cached
+        set_cache(worker_a)
+        create_pick(db, 4343, entry_id, week_id, team_id)
+        set_cache(worker_b)
+        assert get_dashboard_data(db, 4343)["entries"][0]["current_pick"]["team_abbr"] == "DW1"
+
+        # So does a new generation from worker A
+        misses = dashboard_cache_stats()["misses"]
+        set_cache(worker_a)
+        invalidate_all_dashboards()
+        set_cache(worker_b)
+        get_dashboard_data(db, 4343)
+        assert dashboard_cache_stats()["misses"] == misses + 1
+    finally:
+        invalidate_current_week(db)
+        set_cache(None)
+        db.close()
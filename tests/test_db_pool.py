@@ -0,0 +1,47 @@
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app import db as app_db
+from app.core.config import settings
+
+
+def test_file_database_gets_pool_settings_and_sqlite_pragmas(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "DB_SQLITE_BUSY_TIMEOUT_MS", 1234)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'pool.db'}")
+
+    session = app_db.SessionLocal()
+    try:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert session.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert session.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    finally:
+        session.close()
+
+    pool = app_db.engine.pool
+    assert isinstance(pool, QueuePool)
+    assert (pool.size(), pool._max_overflow, pool._pre_ping) == (3, 2, True)
+    stats = app_db.pool_stats()
+    assert stats["pool"] == "QueuePool" and stats["pool_size"] == 3 and stats["max_overflow"] == 2
+    assert stats["checkouts"] >= 1 and stats["checked_out"] == stats["checkouts"] - stats["checkins"]
+
+
+def test_in_memory_sqlite_keeps_its_single_connection_pool():
+    kwargs = app_db._engine_kwargs("sqlite:///:memory:")
+    assert "pool_size" not in kwargs and kwargs["connect_args"] == {"check_same_thread": False}
+    assert app_db._engine_kwargs("postgresql://u@h/db")["pool_recycle"] == settings.DB_POOL_RECYCLE_SECONDS
+
+
+def test_url_is_resolved_once_per_environment_value(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'a.db'}")
+    app_db.init_engine()
+    first = app_db._engine
+    # Settings are not re-read while DATABASE_URL is unchanged
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql://ignored@nowhere/db")
+    app_db.SessionLocal().close()
+    assert app_db._engine is first
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'b.db'}")
+    app_db.SessionLocal().close()
+    assert app_db._engine is not first and str(app_db._engine.url).endswith("b.db")
@@ -410,3 +410,32 @@ def test_finalize_large_batch_sanity(tmp_path):
     res = finalize_week_scores(db, week.id, payload)
     assert res["status"] == "ok"
     assert res["processed_picks"] == total_picks
+
+
+def test_finalize_bulk_updates_refresh_loaded_objects(tmp_path):
+    """Set-based updates must not leave stale Pick/Entry instances in the caller's session."""
+    db: Session = SessionLocal()
+    Base.metadata.create_all(bind=engine)
+    week, game, team_a, team_b = _create_week_and_game(db)
+
+    import uuid as _uuid
+    winner_entry = Entry(user_id=1, week_id=week.id, name=f"bw-{_uuid.uuid4().hex[:6]}", season_year=week.season_year, picks=[])
+    loser_entry = Entry(user_id=2, week_id=week.id, name=f"bl-{_uuid.uuid4().hex[:6]}", season_year=week.season_year, picks=[])
+    db.add_all([winner_entry, loser_entry])
+    db.commit()
+    win_pick = Pick(entry_id=winner_entry.id, week_id=week.id, team_id=team_b.id)
+    loss_pick = Pick(entry_id=loser_entry.id, week_id=week.id, team_id=team_a.id)
+    db.add_all([win_pick, loss_pick])
+    db.commit()
+
+    # Load the objects inside an open transaction so finalize runs in a SAVEPOINT
+    assert win_pick.result is None and loser_entry.is_eliminated is False
+    payload = {"games": [{"game_id": game.id, "home_score": 10, "away_score": 17}]}
+    res = finalize_week_scores(db, week.id, payload)
+    assert res == {"status": "ok", "processed_games": 1, "processed_picks": 2}
+
+    assert win_pick.result == "win"
+    assert loss_pick.result == "loss"
+    assert winner_entry.is_eliminated is False
+    assert loser_entry.is_eliminated is True
+    db.close()
@@ -82,6 +82,9 @@ def test_history_matrix_integration():
             {"entry_id": e.id, "week_id": w.id, "team_id": team.id},
         )
         db.commit()
+        # raw SQL bypasses the pick service, so fold the pick into the maintained history rows
+        from app.services.history_matrix import rebuild_history_matrix
+        rebuild_history_matrix(db, 2025)
 
     finally:
         db.close()
@@ -0,0 +1,86 @@
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401  (registers every model mapper)
+from app.models.base import Base
+from app.models.entry import Entry
+from app.models.history_matrix_row import HistoryMatrixRow
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.entries import create_entry, delete_entry
+from app.services.history import get_history_matrix
+from app.services.history_matrix import rebuild_history_matrix, verify_history_matrix
+from app.services.picks import create_pick, update_pick
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def _seed(db):
+    teams = [Team(abbreviation=f"M{i}", name=f"Matrix {i}") for i in range(3)]
+    week = Week(season_year=2025, week_number=1)
+    user = User(email="matrix@example.com", hashed_password="x")
+    db.add_all(teams + [week, user])
+    db.commit()
+    return user.id, week.id, [t.id for t in teams]
+
+
+def test_service_writes_maintain_rows_without_rebuild():
+    db = _session()
+    user_id, week_id, teams = _seed(db)
+    entry = create_entry(db, user_id, week_id, picks=[], name="Maintained")
+    row = db.get(HistoryMatrixRow, entry.id)
+    assert (row.entry_name, row.pick_count, row.picks) == ("Maintained", 0, {})
+
+    pick = create_pick(db, user_id, entry.id, week_id, teams[0])
+    db.expire_all()
+    row = db.get(HistoryMatrixRow, entry.id)
+    assert row.picks == {str(week_id): teams[0]} and row.pick_count == 1
+    first_version = row.version
+    assert first_version > 0
+
+    update_pick(db, user_id, pick.id, teams[1])
+    db.expire_all()
+    row = db.get(HistoryMatrixRow, entry.id)
+    assert row.picks == {str(week_id): teams[1]} and row.pick_count == 1
+    assert row.version >= first_version
+
+    # Reads use the rows as-is
+    assert get_history_matrix(db, 2025)["entries"] == [{"entry_id": entry.id, "entry_name": "Maintained", "picks": [teams[1]]}]
+    assert verify_history_matrix(db, 2025) == {"ok": True, "mismatched_entries": []}
+
+    db.query(Pick).delete()
+    db.commit()
+    assert delete_entry(db, entry.id, user_id) is True
+    assert db.get(HistoryMatrixRow, entry.id) is None
+    db.close()
+
+
+def test_writes_outside_services_are_repaired():
+    db = _session()
+    user_id, week_id, teams = _seed(db)
+    entry = Entry(user_id=user_id, week_id=week_id, name="Raw", season_year=2025, picks=[])
+    db.add(entry)
+    db.commit()
+    db.add(Pick(entry_id=entry.id, week_id=week_id, team_id=teams[2]))
+    db.commit()
+
+    # Reads never scan picks, so raw writes stay invisible until the repair path runs
+    assert get_history_matrix(db, 2025)["entries"] == []
+    assert verify_history_matrix(db, 2025) == {"ok": False, "mismatched_entries": [entry.id]}
+    assert rebuild_history_matrix(db, 2025) == 1
+    assert get_history_matrix(db, 2025)["entries"][0]["picks"] == [teams[2]]
+
+    db.execute(update(Pick).values(team_id=teams[0]))
+    db.commit()
+    assert verify_history_matrix(db, 2025) == {"ok": False, "mismatched_entries": [entry.id]}
+    assert rebuild_history_matrix(db, 2025) == 1
+    assert verify_history_matrix(db, 2025)["ok"] is True
+    assert db.execute(select(HistoryMatrixRow.picks)).scalar() == {str(week_id): teams[0]}
+    db.close()
@@ -0,0 +1,149 @@
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db import get_db
+from app.models.base import Base
+from app.models.entry import Entry
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.history_matrix import rebuild_history_matrix
+
+
+def _seed():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session()
+    teams = [Team(abbreviation=f"H{i}", name=f"Hist {i}") for i in range(5)]
+    w1, w2 = Week(season_year=2025, week_number=1), Week(season_year=2025, week_number=2)
+    other = Week(season_year=2024, week_number=1)
+    user = User(email="hist@example.com", hashed_password="x")
+    db.add_all(teams + [w1, w2, other, user])
+    db.commit()
+    entries = [Entry(user_id=user.id, week_id=w1.id, name=f"E{i}", season_year=2025, picks=[]) for i in range(5)]
+    db.add_all(entries)
+    db.commit()
+    # Every entry picked in week 1; only the first two picked in week 2
+    db.add_all([Pick(entry_id=e.id, week_id=w1.id, team_id=teams[i % 4].id) for i, e in enumerate(entries)])
+    db.add_all([Pick(entry_id=e.id, week_id=w2.id, team_id=teams[3].id) for e in entries[:2]])
+    db.commit()
+    # Raw inserts bypass the pick service, so fold them into the maintained rows
+    rebuild_history_matrix(db)
+    ids = {"entries": [e.id for e in entries], "teams": [t.id for t in teams], "w1": w1.id}
+    db.close()
+    return Session, ids
+
+
+def _client(Session):
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_columnar_pages_cover_the_full_matrix():
+    Session, ids = _seed()
+    client = _client(Session)
+    try:
+        full = client.get("/api/history/matrix", params={"season_year": 2025}).json()
+        assert set(full) == {"weeks", "entries"}
+
+        cursor, entry_ids, grid = None, [], []
+        while True:
+            params = {"season_year": 2025, "format": "columnar", "limit": 2}
+            if cursor is not None:
+                params["after_entry_id"] = cursor
+            page = client.get("/api/history/matrix", params=params).json()
+            assert page["weeks"] == [1, 2]
+            assert len(page["team_ids"]) == len(page["entry_ids"]) * 2
+            entry_ids += page["entry_ids"]
+            grid += page["team_ids"]
+            cursor = page["next_after_entry_id"]
+            if cursor is None:
+                break
+        assert entry_ids == ids["entries"]
+        assert [grid[i * 2:(i + 1) * 2] for i in range(len(entry_ids))] == [e["picks"] for e in full["entries"]]
+
+        rows = client.get("/api/history/matrix", params={"season_year": 2025, "limit": 3}).json()
+        assert [e["entry_id"] for e in rows["entries"]] == ids["entries"][:3]
+        assert rows["next_after_entry_id"] == ids["entries"][2] and rows["version"] > 0
+        assert client.get("/api/history/matrix", params={"limit": 0}).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_since_version_returns_only_changed_cells():
+    Session, ids = _seed()
+    client = _client(Session)
+    try:
+        version = client.get("/api/history/matrix", params={"season_year": 2025, "format": "columnar"}).json()["version"]
+        empty = client.get("/api/history/matrix", params={"season_year": 2025, "since_version": version}).json()
+        assert empty["changes"]["entry_ids"] == [] and empty["version"] == version
+
+        time.sleep(0.01)
+        from app.services.picks import update_pick
+
+        db = Session()
+        pick_id = db.query(Pick.id).filter(Pick.entry_id == ids["entries"][4], Pick.week_id == ids["w1"]).scalar()
+        user_id = db.query(User.id).scalar()
+        update_pick(db, user_id, pick_id, ids["teams"][4])
+        db.close()
+
+        delta = client.get("/api/history/matrix", params={"season_year": 2025, "since_version": version}).json()
+        assert delta["version"] > version
+        assert delta["changes"] == {
+            "entry_ids": [ids["entries"][4]],
+            "entry_names": ["E4"],
+            "week_indexes": [0],
+            "team_ids": [ids["teams"][4]],
+        }
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_versions_come_from_the_commit_ordered_clock():
+    Session, ids = _seed()
+    from app.models.history_matrix_row import HistoryMatrixClock, HistoryMatrixRow
+    from app.services.history import get_history_delta
+    from app.services.picks import update_pick
+
+    db = Session()
+    try:
+        fresh = [Team(abbreviation=f"C{i}", name=f"Clock {i}") for i in range(2)]
+        db.add_all(fresh)
+        db.commit()
+        before = db.get(HistoryMatrixClock, 1).version
+        user_id = db.query(User.id).scalar()
+        for entry_id, team in zip(ids["entries"][:2], fresh):
+            pick_id = db.query(Pick.id).filter(Pick.entry_id == entry_id, Pick.week_id == ids["w1"]).scalar()
+            update_pick(db, user_id, pick_id, team.id)
+        db.expire_all()
+        # One clock tick per writing transaction, independent of wall-clock timestamps
+        assert [db.get(HistoryMatrixRow, e).version for e in ids["entries"][:2]] == [before + 1, before + 2]
+
+        delta = get_history_delta(db, before + 1, season_year=2025)
+        assert delta["version"] == before + 2
+        assert set(delta["changes"]["entry_ids"]) == {ids["entries"][1]}
+        # A version from before the clock (or a lagging replica) is ahead of the watermark
+        stale = get_history_delta(db, before + 1000, season_year=2025)
+        assert stale["version"] == before + 2
+        assert set(stale["changes"]["entry_ids"]) == set(ids["entries"])
+
+        plan = db.execute(
+            text("EXPLAIN QUERY PLAN SELECT entry_id FROM history_matrix_rows WHERE season_year = 2025 AND version > 0")
+        ).all()
+        assert any("ix_history_matrix_rows_season_version" in row[-1] for row in plan)
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401
+from app.models.base import Base
+from app.models.import_ledger import ImportChunk, ImportFile
+from app.models.user import User
+from app.services.import_ledger import ImportLedger
+from app.services.legacy_import import BulkImporter
+
+SOURCE = "gs://exports/users.json"
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def users(n, name="User"):
+    return [{"email": f"u{i}@example.com", "first_name": f"{name} {i}"} for i in range(n)]
+
+
+def failing_after(records, n):
+    for i, record in enumerate(records):
+        if i == n:
+            raise ConnectionError("stream reset")
+        yield record
+
+
+def run(db, records, fingerprint="sha256:v1", chunk_size=2):
+    ledger = ImportLedger(db, SOURCE, "users", chunk_size, fingerprint)
+    return BulkImporter(db, chunk_size=chunk_size, progress=None, ledger=ledger).import_records("users", records)
+
+
+def user_count(db):
+    return db.execute(select(func.count()).select_from(User)).scalar()
+
+
+def test_interrupted_import_resumes_after_the_last_applied_chunk(db):
+    with pytest.raises(ConnectionError):
+        run(db, failing_after(users(7), 5))
+    # Chunks 0 and 1 committed with their ledger rows; the half-read chunk 2 did not
+    assert user_count(db) == 4
+    assert db.get(ImportFile, SOURCE).status == "running"
+    assert not ImportLedger(db, SOURCE, "users", 2, "sha256:v1").is_current()
+
+    report = run(db, users(7))
+    assert (report["resumed"], report["created"], report["unchanged"]) == (4, 3, 0)
+    assert user_count(db) == 7
+    assert ImportLedger(db, SOURCE, "users", 2, "sha256:v1").is_current()
+    assert not ImportLedger(db, SOURCE, "users", 2, "sha256:v2").is_current()
+
+
+def test_changed_chunks_are_reapplied_and_stale_chunks_dropped(db):
+    run(db, users(6))
+    changed = users(6)
+    changed[3]["first_name"] = "Renamed"
+    report = run(db, changed[:5], fingerprint="sha256:v2")
+    # chunk 0 skipped by hash, chunk 1 re-staged (one real change), chunk 2 shrank to one record
+    assert (report["resumed"], report["updated"], report["unchanged"]) == (2, 1, 2)
+    assert db.execute(select(User.first_name).where(User.email == "u3@example.com")).scalar() == "Renamed"
+    assert db.execute(select(ImportChunk.chunk_index).order_by(ImportChunk.chunk_index)).scalars().all() == [0, 1, 2]
+
+    report = run(db, changed[:4], fingerprint="sha256:v3")
+    assert report["resumed"] == 4
+    assert db.execute(select(ImportChunk.chunk_index)).scalars().all() == [0, 1]
+
+
+def test_chunk_size_change_starts_the_file_over(db):
+    run(db, users(4))
+    report = run(db, users(4), chunk_size=3)
+    assert (report["resumed"], report["unchanged"]) == (0, 4)
+    assert db.get(ImportFile, SOURCE).chunk_size == 3
+
+
+def test_chunks_with_unresolved_references_are_reapplied_later(db):
+    from app.models.entry import Entry
+
+    weeks = [{"season_year": 2025, "week_number": 1}]
+    BulkImporter(db, progress=None).import_records("weeks", weeks)
+    entries = [
+        {"user_email": "u0@example.com", "season_year": 2025, "week_number": 1, "name": "Early"},
+        {"user_email": "u1@example.com", "season_year": 2025, "week_number": 1, "name": "Late"},
+    ]
+    source = "gs://exports/entries.json"
+
+    def import_entries():
+        ledger = ImportLedger(db, source, "entries", 1, "sha256:e1")
+        return BulkImporter(db, chunk_size=1, progress=None, ledger=ledger).import_records("entries", entries)
+
+    BulkImporter(db, progress=None).import_records("users", users(1))
+    report = import_entries()
+    assert (report["created"], report["skipped"], report["unresolved"]) == (1, 1, 1)
+    # The resolved chunk is recorded; the one missing its user is not, and the file stays re-runnable
+    assert db.execute(select(ImportChunk.chunk_index).where(ImportChunk.source == source)).scalars().all() == [0]
+    assert db.get(ImportFile, source).status == "incomplete"
+    assert not ImportLedger(db, source, "entries", 1, "sha256:e1").is_current()
+
+    BulkImporter(db, progress=None).import_records("users", users(2))
+    report = import_entries()
+    assert (report["resumed"], report["created"], report["unresolved"]) == (1, 1, 0)
+    assert db.execute(select(func.count()).select_from(Entry)).scalar() == 2
+    assert ImportLedger(db, source, "entries", 1, "sha256:e1").is_current()
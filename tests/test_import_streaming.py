@@ -0,0 +1,62 @@
+import io
+import json
+import pathlib
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401
+from app.models.base import Base
+from app.models.pick import Pick
+from app.services.legacy_import import KINDS, BulkImporter
+from scripts import import_from_gcs as ig
+
+SAMPLES = pathlib.Path("scripts/samples").resolve()
+
+
+def test_file_sources_stream_into_the_bulk_importer():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    uris = [(SAMPLES / f"{kind}.json").as_uri() for kind in KINDS]
+
+    openers = [lambda uri=uri: ig.open_source(uri) for uri in uris]
+    for index, records in ig.stream_sources(openers, workers=2, chunk_size=1, depth=1):
+        report = BulkImporter(db, chunk_size=1, progress=None).import_records(KINDS[index], records)
+        assert report["created"] == 2
+    assert db.execute(select(func.count()).select_from(Pick)).scalar() == 2
+
+
+def test_sources_are_consumed_in_order_and_bounded():
+    opened = []
+
+    def source(n):
+        def open_file():
+            opened.append(n)
+            if n == 1:
+                return io.BytesIO(b'[{"email": "a@example.com"}, {"email": ')
+            return open(SAMPLES / "users.json", "rb")
+        return open_file
+
+    results = []
+    for index, records in ig.stream_sources([source(n) for n in range(4)], workers=1, chunk_size=1, depth=1):
+        try:
+            # Abandoning file 0 after one record must not stall the single reader thread
+            results.append((index, [next(iter(records))["email"]] if index == 0 else [r["email"] for r in records]))
+        except ValueError:
+            results.append((index, "error"))
+    assert [r[0] for r in results] == [0, 1, 2, 3]
+    assert results[1] == (1, "error")
+    assert results[2][1] == [u["email"] for u in json.loads((SAMPLES / "users.json").read_text())]
+    assert opened == [0, 1, 2, 3]
+    assert not [t for t in threading.enumerate() if t.name.startswith("import-read")]
+
+
+def test_open_source_rejects_unknown_schemes_and_bare_names_without_bucket():
+    with pytest.raises(ValueError):
+        ig.open_source("s3://bucket/teams.json")
+    with pytest.raises(ValueError):
+        ig.open_source("teams.json")
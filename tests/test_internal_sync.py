@@ -43,3 +43,27 @@ def test_sync_endpoint_success(mock_sync, mock_fetch):
 
     # clean up
     settings.INTERNAL_SYNC_TOKEN = None
+
+
+@patch("app.routes.internal_sync.backfill_weeks")
+def test_backfill_endpoint_transforms_in_the_process_pool(mock_backfill):
+    from concurrent.futures import ProcessPoolExecutor
+
+    from app.core.config import settings
+    from app.services.backfill import shutdown_transform_pool
+
+    async def fake_backfill(pairs, **kwargs):
+        return {"weeks": [], "ok": len(pairs), "failed": 0, "elapsed_ms": 0}
+
+    mock_backfill.side_effect = fake_backfill
+    settings.INTERNAL_SYNC_TOKEN = "backfill-token"
+    try:
+        resp = client.post(
+            "/internal/sync-games/backfill?year=2025&start_week=1&end_week=3",
+            headers={"X-Internal-Sync-Token": "backfill-token"},
+        )
+        assert resp.status_code == 200 and resp.json()["ok"] == 3
+        assert isinstance(mock_backfill.call_args.kwargs["executor"], ProcessPoolExecutor)
+    finally:
+        settings.INTERNAL_SYNC_TOKEN = None
+        shutdown_transform_pool()
@@ -0,0 +1,142 @@
+import json
+import pathlib
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401
+from app.models.base import Base
+from app.models.entry import Entry
+from app.models.game import Game
+from app.models.history_matrix_row import HistoryMatrixRow
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.used_team import UsedTeam
+from app.models.user import User
+from app.models.week import Week
+from app.services.legacy_import import KINDS, BulkImporter, kind_for_filename
+
+SAMPLES = pathlib.Path("scripts/samples")
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def load(kind):
+    return json.loads((SAMPLES / f"{kind}.json").read_text())
+
+
+def import_all(db, **kwargs):
+    return {kind: BulkImporter(db, progress=None, **kwargs).import_records(kind, load(kind)) for kind in KINDS}
+
+
+def test_import_samples_then_reimport_is_noop(engine):
+    db = sessionmaker(bind=engine)()
+    reports = import_all(db)
+    assert {k: r["created"] for k, r in reports.items()} == {k: 2 for k in KINDS}
+
+    jax = db.execute(select(Team.id).where(Team.abbreviation == "JAX")).scalar()
+    assert db.execute(select(User.first_name).where(User.email == "bob@example.com")).scalar() == "Bob"
+    assert db.execute(select(Game.home_team_id).order_by(Game.start_time)).scalars().first() == jax
+    assert db.execute(select(Entry.is_paid).where(Entry.name == "Alice Squad")).scalar() is True
+    alice_pick = db.execute(select(Pick.entry_id, Pick.team_id).where(Pick.team_abbr == "JAX")).one()
+    assert alice_pick.team_id == jax
+    # Derived tables are kept in step with the bulk writes
+    assert db.execute(select(HistoryMatrixRow.pick_count).where(HistoryMatrixRow.entry_id == alice_pick.entry_id)).scalar() == 1
+    assert db.execute(select(func.count()).select_from(UsedTeam)).scalar() == 2
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2].split()[0]))
+    again = import_all(db, chunk_size=1)
+    assert {k: (r["unchanged"], r["created"], r["updated"]) for k, r in again.items()} == {k: (2, 0, 0) for k in KINDS}
+    assert set(statements) == {"SELECT"}
+
+
+def test_changed_records_are_upserted(engine):
+    db = sessionmaker(bind=engine)()
+    import_all(db)
+    users = load("users")
+    users[0]["first_name"] = "Alicia"
+    users.append({"email": "carol@example.com", "first_name": "Carol"})
+    picks = load("picks")
+    picks[0]["team_abbr"] = "WAS"
+
+    u = BulkImporter(db, progress=None).import_records("users", users)
+    p = BulkImporter(db, progress=None).import_records("picks", picks)
+    assert (u["created"], u["updated"], u["unchanged"]) == (1, 1, 1)
+    assert (p["created"], p["updated"], p["unchanged"]) == (0, 1, 1)
+    assert db.execute(select(User.first_name, User.last_name).where(User.email == "alice@example.com")).one() == ("Alicia", "Smith")
+    was = db.execute(select(Team.id).where(Team.abbreviation == "WAS")).scalar()
+    assert db.execute(select(Pick.team_id).where(Pick.team_abbr == "WAS")).scalars().all() == [was, was]
+
+
+def test_unresolvable_records_are_skipped_and_failures_roll_back_the_file(engine):
+    db = sessionmaker(bind=engine)()
+    for kind in ("teams", "users", "weeks"):
+        BulkImporter(db, progress=None).import_records(kind, load(kind))
+
+    entries = load("entries") + [{"user_email": "nobody@example.com", "season_year": 2025, "week_number": 1, "name": "Ghost"}]
+    report = BulkImporter(db, progress=None).import_records("entries", entries)
+    assert (report["created"], report["skipped"]) == (2, 1)
+
+    def boom(kind, report):
+        raise RuntimeError("interrupted")
+
+    users = [{"email": f"late{i}@example.com"} for i in range(5)]
+    with pytest.raises(RuntimeError):
+        BulkImporter(db, chunk_size=2, progress=boom).import_records("users", users)
+    assert db.execute(select(func.count()).select_from(User)).scalar() == 2
+
+
+def test_dry_run_counts_without_touching_the_database():
+    report = BulkImporter(None, dry_run=True, progress=None).import_records("picks", load("picks") + [{"season_year": 2025}])
+    assert (report["created"], report["skipped"]) == (2, 1)
+    assert kind_for_filename("exports/picks_2025.json") == "picks"
+    assert kind_for_filename("standings.json") is None
+
+
+def test_rows_inserted_by_one_chunk_are_seen_by_the_next(engine):
+    db = sessionmaker(bind=engine)()
+    BulkImporter(db, progress=None).import_records("teams", load("teams"))
+    week = {"season_year": 2025, "week_number": 9}
+    weeks = BulkImporter(db, chunk_size=1, progress=None).import_records("weeks", [week, dict(week, lock_time="2025-11-02T17:00:00Z")])
+    assert (weeks["created"], weeks["updated"]) == (1, 1)
+
+    game = {"season_year": 2025, "week_number": 9, "start_time": "2025-11-02T18:00:00Z", "home_team_abbr": "JAX", "away_team_abbr": "WAS"}
+    games = BulkImporter(db, chunk_size=1, progress=None).import_records("games", [game, dict(game)])
+    assert (games["created"], games["unchanged"]) == (1, 1)
+    assert db.execute(select(func.count()).select_from(Week).where(Week.week_number == 9)).scalar() == 1
+    assert db.execute(select(func.count()).select_from(Game)).scalar() == 1
+
+
+def test_imported_entries_without_picks_appear_in_the_history_matrix(engine):
+    from fastapi.testclient import TestClient
+
+    from app.db import get_db
+
+    db = sessionmaker(bind=engine)()
+    for kind in ("teams", "users", "weeks"):
+        BulkImporter(db, progress=None).import_records(kind, load(kind))
+    entry = {"user_email": "bob@example.com", "season_year": 2025, "week_number": 1, "name": "Bob Spare"}
+    assert BulkImporter(db, progress=None).import_records("entries", [entry])["created"] == 1
+
+    def override_get_db():
+        session = sessionmaker(bind=engine)()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.main.app.dependency_overrides[get_db] = override_get_db
+    try:
+        resp = TestClient(app.main.app).get("/api/history/matrix", params={"season_year": 2025})
+    finally:
+        app.main.app.dependency_overrides.pop(get_db, None)
+    assert resp.status_code == 200
+    assert [row["entry_name"] for row in resp.json()["entries"]] == ["Bob Spare"]
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401  (registers every model mapper)
+from app.models.base import Base
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.entries import create_entry
+from app.services.lock_cutover import LockCutoverScheduler, cutover_due_weeks
+from app.services.picks import WeekLockedError, create_pick
+from app.services.reveal import get_latest_reveal_snapshot, get_reveal_snapshot_with_etag
+
+
+@pytest.fixture()
+def Session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _week(db, lock_time, number=1):
+    week = Week(season_year=2025, week_number=number, lock_time=lock_time)
+    db.add(week)
+    db.commit()
+    return week.id
+
+
+def test_cutover_flips_due_weeks_once_and_stores_the_reveal(Session):
+    db = Session()
+    now = datetime.now(timezone.utc)
+    due = _week(db, now - timedelta(seconds=1))
+    later = _week(db, now + timedelta(hours=2), number=2)
+    team = Team(abbreviation="LC1", name="Lock Team")
+    db.add(team)
+    db.commit()
+    db.add(Pick(entry_id=1, week_id=due, team_id=team.id))
+    db.commit()
+
+    results, next_lock = cutover_due_weeks(db, now)
+    assert results == [{"week_id": due, "flipped": True, "snapshot_version": 1}]
+    assert abs((next_lock - (now + timedelta(hours=2))).total_seconds()) < 1
+    assert db.get(Week, due).is_locked is True and db.get(Week, later).is_locked is False
+
+    snap = get_latest_reveal_snapshot(db, due)
+    assert snap.payload["locked"] is True and snap.payload["summary"]["total_entries"] == 1
+    # the reveal endpoint serves the pre-built row
+    assert get_reveal_snapshot_with_etag(db, due)[1] == snap.etag
+
+    # locked weeks are no longer candidates
+    assert cutover_due_weeks(db, now)[0] == []
+    db.close()
+
+
+def test_writes_are_rejected_on_the_flag_alone(Session):
+    db = Session()
+    week_id = _week(db, datetime.now(timezone.utc) + timedelta(hours=1))
+    user = User(email="cutover@example.com", hashed_password="x")
+    team = Team(abbreviation="LC2", name="Lock Team 2")
+    db.add_all([user, team])
+    db.commit()
+    entry = create_entry(db, user.id, week_id, picks=[], name="Cutover")
+
+    db.get(Week, week_id).is_locked = True
+    db.commit()
+    with pytest.raises(WeekLockedError):
+        create_pick(db, user.id, entry.id, week_id, team.id)
+    db.close()
+
+
+def test_scheduler_wakes_at_lock_time(Session):
+    db = Session()
+    week_id = _week(db, datetime.now(timezone.utc) + timedelta(milliseconds=300))
+    db.close()
+    scheduler = LockCutoverScheduler(session_factory=Session, max_sleep=30)
+
+    async def _run():
+        scheduler.start()
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.05)
+                if scheduler.status()["cutovers"]:
+                    break
+        finally:
+            await scheduler.stop()
+
+    asyncio.run(_run())
+    status = scheduler.status()
+    assert status["cutovers"] == 1 and status["last_cutover"]["week_id"] == week_id
+    assert status["running"] is False
+    db = Session()
+    assert db.get(Week, week_id).is_locked is True
+    db.close()
@@ -0,0 +1,109 @@
+import os
+import sys
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.core.config import settings  # noqa: E402
+from app.services import password_hashing  # noqa: E402
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    # Low cost keeps the tests fast; each test gets a pool built from its own settings
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    password_hashing.shutdown_password_pool()
+    yield monkeypatch
+    password_hashing.shutdown_password_pool()
+
+
+def test_process_pool_hashes_and_verifies(fresh_pool):
+    async def scenario():
+        hashed = await password_hashing.hash_password("secret")
+        return hashed, await password_hashing.verify_and_update_password("secret", hashed)
+
+    hashed, (valid, new_hash) = asyncio.run(scenario())
+    assert hashed.startswith("$2b$04$")
+    assert valid is True and new_hash is None
+    assert password_hashing.password_hash_stats()["pending"] == 0
+
+
+def test_queue_full_sheds_load(fresh_pool):
+    fresh_pool.setattr(settings, "PASSWORD_HASH_EXECUTOR", "thread")
+    fresh_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    fresh_pool.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 2)
+    before = password_hashing.password_hash_stats()["rejected"]
+
+    async def scenario():
+        return await asyncio.gather(*(password_hashing.hash_password("pw") for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    busy = [r for r in results if isinstance(r, password_hashing.PasswordHashBusyError)]
+    assert len(busy) == 2
+    assert all(isinstance(r, str) for r in results if r not in busy)
+    stats = password_hashing.password_hash_stats()
+    assert stats["rejected"] - before == 2 and stats["peak_pending"] >= 2 and stats["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_on_cost_change_and_returns_429_when_busy(tmp_path, fresh_pool):
+    fresh_pool.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    fresh_pool.setattr(settings, "PASSWORD_HASH_EXECUTOR", "thread")
+    from app.main import app
+    from app.models.base import Base
+    from app.models.user import User
+    from app.db import engine, SessionLocal
+
+    Base.metadata.create_all(bind=engine)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        assert (await ac.post("/api/auth/register", json={"email": "cost@example.com", "password": "secret"})).status_code == 200
+
+        fresh_pool.setattr(settings, "BCRYPT_ROUNDS", 5)
+        resp = await ac.post("/api/auth/login", json={"email": "cost@example.com", "password": "secret"})
+        assert resp.status_code == 200
+        db = SessionLocal()
+        try:
+            assert db.query(User.hashed_password).filter(User.email == "cost@example.com").scalar().startswith("$2b$05$")
+        finally:
+            db.close()
+
+        fresh_pool.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 0)
+        resp = await ac.post("/api/auth/login", json={"email": "cost@example.com", "password": "secret"})
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_job_finishes(fresh_pool):
+    import threading
+
+    fresh_pool.setattr(settings, "PASSWORD_HASH_EXECUTOR", "thread")
+    fresh_pool.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, rounds):
+        started.set()
+        release.wait(5)
+        return "hashed"
+
+    fresh_pool.setattr(password_hashing, "_hash", slow_hash)
+
+    async def scenario():
+        task = asyncio.ensure_future(password_hashing.hash_password("pw"))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The job is still running in the pool, so it still occupies the queue
+        assert password_hashing.password_hash_stats()["pending"] == 1
+        release.set()
+
+    asyncio.run(scenario())
+    # Waits for the job; its completion frees the slot
+    password_hashing._get_executor().shutdown(wait=True)
+    assert password_hashing.password_hash_stats()["pending"] == 0
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db import get_db
+from app.models.base import Base
+from app.models.game import Game
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.used_team import UsedTeam
+from app.models.user import User
+from app.models.week import Week
+from app.routes.auth import get_current_user
+from app.services.entries import create_entry, delete_entry
+from app.services.picks import PickConflict, create_pick, update_pick
+from app.services.principals import UserPrincipal
+from app.services.used_teams import rebuild_used_teams
+
+
+@pytest.fixture()
+def Session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _seed(db):
+    soon = datetime.now(timezone.utc) + timedelta(hours=1)
+    teams = [Team(abbreviation=f"E{i}", name=f"Elig {i}") for i in range(5)]
+    w1, w2 = Week(season_year=2025, week_number=1, lock_time=soon), Week(season_year=2025, week_number=2, lock_time=soon)
+    user = User(email="elig@example.com", hashed_password="x")
+    db.add_all(teams + [w1, w2, user])
+    db.commit()
+    e1 = create_entry(db, user.id, w1.id, picks=[], name="Elig 1")
+    e2 = create_entry(db, user.id, w2.id, picks=[], name="Elig 2")
+    return user.id, (w1.id, w2.id), (e1.id, e2.id), [t.id for t in teams]
+
+
+def test_used_teams_follow_pick_writes(Session):
+    db = Session()
+    user_id, (w1, w2), (e1, e2), t = _seed(db)
+    pick = create_pick(db, user_id, e1, w1, t[0])
+    assert db.execute(select(UsedTeam.team_id, UsedTeam.pick_id)).all() == [(t[0], pick.id)]
+
+    update_pick(db, user_id, pick.id, t[1])
+    assert db.execute(select(UsedTeam.team_id)).scalars().all() == [t[1]]
+    # the released team is free again; the held one is rejected by a key probe
+    create_pick(db, user_id, e2, w2, t[0])
+    with pytest.raises(PickConflict):
+        update_pick(db, user_id, pick.id, t[0])
+
+    # rebuild reproduces the maintained rows
+    before = sorted(db.execute(select(UsedTeam.team_id, UsedTeam.pick_id)).all())
+    assert rebuild_used_teams(db) == 2
+    assert sorted(db.execute(select(UsedTeam.team_id, UsedTeam.pick_id)).all()) == before
+
+    db.query(Pick).filter(Pick.entry_id == e1).delete()
+    db.commit()
+    delete_entry(db, e1, user_id)
+    assert db.execute(select(UsedTeam.team_id)).scalars().all() == [t[0]]
+    db.close()
+
+
+def test_eligibility_endpoint_merges_used_ineligible_and_locked_games(Session):
+    db = Session()
+    user_id, (w1, w2), (e1, e2), t = _seed(db)
+    create_pick(db, user_id, e1, w1, t[0])
+    game = Game(week_id=w2, start_time=datetime(2025, 9, 14, 17, 0), home_team_id=t[3], away_team_id=t[4])
+    db.add(game)
+    db.commit()
+    week = db.get(Week, w2)
+    week.set_ineligible_teams(["E2"])
+    week.set_locked_games([game.id])
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: UserPrincipal(id=user_id, email="elig@example.com", is_active=True, is_admin=False)
+    try:
+        client = TestClient(app)
+        statements = []
+        event.listen(Session.kw["bind"], "before_cursor_execute", lambda *args: statements.append(args[2]))
+        body = client.get(f"/api/entries/{e2}/eligibility").json()
+        # entry + week + current pick, used teams, locked games, teams
+        assert len(statements) == 4
+        assert body["week_id"] == w2 and body["week_locked"] is False and body["current_team_id"] is None
+        reasons = {team["team_id"]: (team["eligible"], team["reason"]) for team in body["teams"]}
+        assert reasons == {
+            t[0]: (False, "used"),
+            t[1]: (True, None),
+            t[2]: (False, "ineligible"),
+            t[3]: (False, "game_locked"),
+            t[4]: (False, "game_locked"),
+        }
+        assert next(x for x in body["teams"] if x["team_id"] == t[0])["used_in_week_id"] == w1
+
+        # an entry's own pick doesn't make its team ineligible for that entry
+        own = client.get(f"/api/entries/{e1}/eligibility").json()
+        assert own["current_team_id"] == t[0]
+        assert next(x for x in own["teams"] if x["team_id"] == t[0])["eligible"] is True
+
+        assert client.get("/api/entries/999999/eligibility").status_code == 404
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db import get_db
+from app.models.base import Base
+from app.models.history_matrix_row import HistoryMatrixRow
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.routes.auth import get_current_user
+from app.services.entries import create_entry
+from app.services.principals import UserPrincipal
+
+
+def _seed():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = Session()
+    soon = datetime.now(timezone.utc) + timedelta(hours=1)
+    teams = [Team(abbreviation=f"B{i}", name=f"Batch {i}") for i in range(6)]
+    open_weeks = [Week(season_year=2025, week_number=n, lock_time=soon) for n in (1, 3, 4)]
+    locked_week = Week(season_year=2025, week_number=2, lock_time=datetime.now(timezone.utc) - timedelta(hours=1))
+    user, other = User(email="batch@example.com", hashed_password="x"), User(email="other@example.com", hashed_password="x")
+    db.add_all(teams + open_weeks + [locked_week, user, other])
+    db.commit()
+    # create_entry keeps one entry per user/week, so each entry gets its own week
+    mine = [create_entry(db, user.id, wk.id, picks=[], name=f"Mine {i}").id for i, wk in enumerate(open_weeks)]
+    locked = create_entry(db, user.id, locked_week.id, picks=[], name="Locked").id
+    theirs = create_entry(db, other.id, open_weeks[0].id, picks=[], name="Theirs").id
+    ids = {
+        "user": user.id, "mine": mine, "locked": locked, "theirs": theirs,
+        "open": [wk.id for wk in open_weeks], "locked_week": locked_week.id, "teams": [t.id for t in teams],
+    }
+    db.close()
+    return Session, ids
+
+
+def _client(Session, user_id):
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: UserPrincipal(id=user_id, email="batch@example.com", is_active=True, is_admin=False)
+    return TestClient(app)
+
+
+def test_batch_reports_per_item_results_and_writes_once():
+    Session, ids = _seed()
+    client = _client(Session, ids["user"])
+    t, w = ids["teams"], ids["open"]
+    m = list(zip(ids["mine"], w))
+    try:
+        statements = []
+        bind = Session().get_bind()
+        event.listen(bind, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0].upper()))
+        r = client.post("/api/picks/batch", json={"picks": [
+            {"entry_id": m[0][0], "week_id": m[0][1], "team_id": t[0]},
+            {"entry_id": m[1][0], "week_id": m[1][1], "team_id": t[1]},
+            {"entry_id": m[2][0], "week_id": m[2][1], "team_id": t[0]},  # repeats an earlier item's team
+            {"entry_id": m[1][0], "week_id": m[1][1], "team_id": t[2]},  # same entry/week twice
+            {"entry_id": ids["locked"], "week_id": ids["locked_week"], "team_id": t[3]},
+            {"entry_id": ids["theirs"], "week_id": w[0], "team_id": t[4]},
+            {"entry_id": 999999, "week_id": w[0], "team_id": t[4]},
+        ]})
+        assert r.status_code == 200
+        body = r.json()
+        assert [(x["status"], x.get("code")) for x in body["results"]] == [
+            ("created", None), ("created", None), ("error", 409), ("error", 409), ("error", 403), ("error", 400), ("error", 400),
+        ]
+        assert (body["created"], body["updated"], body["error"]) == (2, 0, 5)
+        # three set-wise validation reads, one INSERT .. RETURNING for both picks
+        assert statements[:4] == ["SELECT", "SELECT", "SELECT", "INSERT"]
+
+        first = body["results"][0]["pick_id"]
+        r = client.post("/api/picks/batch", json={"picks": [
+            {"entry_id": m[0][0], "week_id": m[0][1], "team_id": t[5]},  # re-point; frees t[0]
+            {"entry_id": m[2][0], "week_id": m[2][1], "team_id": t[0]},
+            {"entry_id": m[1][0], "week_id": m[1][1], "team_id": t[1]},
+        ]}).json()
+        assert [x["status"] for x in r["results"]] == ["updated", "created", "unchanged"]
+        assert r["results"][0]["pick_id"] == first
+
+        db = Session()
+        picks = {(p.entry_id, p.team_id) for p in db.query(Pick)}
+        assert picks == {(ids["mine"][0], t[5]), (ids["mine"][1], t[1]), (ids["mine"][2], t[0])}
+        row = db.get(HistoryMatrixRow, ids["mine"][0])
+        assert row.picks == {str(w[0]): t[5]} and row.pick_count == 1
+        db.close()
+
+        assert client.post("/api/picks/batch", json={"picks": []}).status_code == 422
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
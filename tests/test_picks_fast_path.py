@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401  (registers every model mapper)
+from app.models.base import Base
+from app.models.pick import Pick
+from app.models.team import Team
+from app.models.user import User
+from app.models.week import Week
+from app.services.entries import create_entry
+from app.services.picks import PickConflict, create_pick, update_pick
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+def _seed(db):
+    teams = [Team(abbreviation=f"F{i}", name=f"Fast {i}") for i in range(3)]
+    w1 = Week(season_year=2025, week_number=1, lock_time=datetime.now(timezone.utc) + timedelta(hours=1))
+    w2 = Week(season_year=2025, week_number=2, lock_time=datetime.now(timezone.utc) + timedelta(hours=1))
+    user = User(email="fast@example.com", hashed_password="x")
+    db.add_all(teams + [w1, w2, user])
+    db.commit()
+    e1 = create_entry(db, user.id, w1.id, picks=[], name="Fast 1")
+    e2 = create_entry(db, user.id, w2.id, picks=[], name="Fast 2")
+    return user.id, (w1.id, w2.id), (e1.id, e2.id), [t.id for t in teams]
+
+
+def _record_sql(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2].split()[0].upper()))
+    return statements
+
+
+def test_create_pick_validates_in_one_select_and_returns_the_row(db):
+    user_id, (w1, _), (e1, _), teams = _seed(db)
+    statements = _record_sql(db)
+    pick = create_pick(db, user_id, e1, w1, teams[0])
+    # validation select, INSERT .. RETURNING, the used_teams claim, then the history matrix row
+    # and its clock tick; no refresh afterwards
+    assert statements == ["SELECT", "INSERT", "INSERT", "SELECT", "UPDATE", "UPDATE"]
+    assert pick.id is not None and pick.team_id == teams[0] and pick.created_at is not None
+
+    statements.clear()
+    # the loaded attributes survive commit without another round trip
+    assert pick.entry_id == e1 and statements == []
+
+
+def test_duplicate_and_season_repeat_map_to_conflicts(db):
+    user_id, (w1, w2), (e1, e2), teams = _seed(db)
+    first = create_pick(db, user_id, e1, w1, teams[0])
+
+    with pytest.raises(PickConflict, match="already exists"):
+        create_pick(db, user_id, e1, w1, teams[1])
+    with pytest.raises(PickConflict, match="already picked"):
+        create_pick(db, user_id, e2, w2, teams[0])
+
+    second = create_pick(db, user_id, e2, w2, teams[1])
+    with pytest.raises(PickConflict, match="already picked"):
+        update_pick(db, user_id, first.id, teams[1])
+    # re-picking the same team for the same pick is not a repeat
+    assert update_pick(db, user_id, second.id, teams[1]).team_id == teams[1]
+    updated = update_pick(db, user_id, first.id, teams[2])
+    assert updated.team_id == teams[2] and updated.updated_at is not None
+    assert db.query(Pick).count() == 2
+
+
+def test_only_a_missing_team_is_reported_as_team_not_found(db):
+    from sqlalchemy import text
+    from sqlalchemy.exc import IntegrityError
+
+    user_id, (w1, w2), (e1, e2), teams = _seed(db)
+    db.execute(text("PRAGMA foreign_keys=ON"))
+    with pytest.raises(ValueError, match="Team not found"):
+        create_pick(db, user_id, e1, w1, 9999)
+
+    # Any other constraint failure surfaces as-is instead of blaming the team
+    db.execute(text("CREATE TRIGGER reject_picks BEFORE INSERT ON picks BEGIN SELECT RAISE(ABORT, 'picks rejected'); END"))
+    db.commit()
+    with pytest.raises(IntegrityError, match="picks rejected"):
+        create_pick(db, user_id, e2, w2, teams[0])
@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+async def _setup(tmp_path, monkeypatch):
+    db_file = tmp_path / "test.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_file}")
+    from app.main import app
+    from app.models.base import Base
+    from app.db import engine
+    from app.services import principals
+
+    Base.metadata.create_all(bind=engine)
+    principals.clear_principal_cache()
+    return app
+
+
+async def _login(ac, email):
+    await ac.post("/api/auth/register", json={"email": email, "password": "secret"})
+    resp = await ac.post("/api/auth/login", json={"email": email, "password": "secret"})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached_and_invalidated_by_admin_patch(tmp_path, monkeypatch):
+    app = await _setup(tmp_path, monkeypatch)
+    from app.core.config import settings
+    from app.db import SessionLocal
+    from app.models.user import User
+    from app.services import principals
+    from app.services.admin import patch_user
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        headers = await _login(ac, "cache@example.com")
+        before = principals.principal_cache_stats()
+        assert (await ac.get("/api/auth/me", headers=headers)).json()["is_admin"] is False
+        assert (await ac.get("/api/auth/me", headers=headers)).json()["is_admin"] is False
+        after = principals.principal_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+        db = SessionLocal()
+        try:
+            user_id = db.query(User.id).filter(User.email == "cache@example.com").scalar()
+            patch_user(db, user_id, is_admin=True)
+        finally:
+            db.close()
+        # Invalidation makes the promotion visible immediately, not after the TTL
+        assert (await ac.get("/api/auth/me", headers=headers)).json()["is_admin"] is True
+
+        monkeypatch.setattr(settings, "INTERNAL_SYNC_TOKEN", "metrics-token")
+        resp = await ac.get("/internal/metrics", headers={"X-Internal-Sync-Token": "metrics-token"})
+        assert resp.status_code == 200
+        stats = resp.json()["user_principal_cache"]
+        assert stats["invalidations"] >= 1 and 0 < stats["hit_rate"] < 1
+
+
+@pytest.mark.asyncio
+async def test_token_claims_verify_without_db(tmp_path, monkeypatch):
+    app = await _setup(tmp_path, monkeypatch)
+    from app.core.config import settings
+    from app.services import principals
+
+    monkeypatch.setattr(settings, "AUTH_TOKEN_CLAIMS", True)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        headers = await _login(ac, "claims@example.com")
+        before = principals.principal_cache_stats()
+        resp = await ac.get("/api/auth/me", headers=headers)
+        assert resp.status_code == 200 and resp.json()["email"] == "claims@example.com"
+        after = principals.principal_cache_stats()
+        assert after["token_claims"] == before["token_claims"] + 1
+        assert after["misses"] == before["misses"]
+
+
+def test_cache_is_scoped_per_database():
+    from app.services import principals
+
+    principals.clear_principal_cache()
+    p = principals.UserPrincipal(id=1, email="a@example.com", is_active=True, is_admin=False)
+    principals.cache_principal("sqlite:///one.db", p)
+    assert principals.get_cached_principal("sqlite:///one.db", 1) == p
+    assert principals.get_cached_principal("sqlite:///two.db", 1) is None
+    principals.invalidate_user(1)
+    assert principals.get_cached_principal("sqlite:///one.db", 1) is None
+
+
+def test_invalidation_reaches_other_workers(tmp_path):
+    from app.services import principals
+    from app.services.cache import SQLiteCacheBackend, set_cache
+
+    # Two backends on one file stand in for two uvicorn worker processes
+    worker_a = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    worker_b = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    admin = principals.UserPrincipal(id=7, email="root@example.com", is_active=True, is_admin=True)
+    try:
+        set_cache(worker_b)
+        principals.cache_principal("sqlite:///one.db", admin)
+        assert principals.get_cached_principal("sqlite:///one.db", 7) == admin
+
+        # Deactivating the admin through worker A drops the principal worker B cached
+        set_cache(worker_a)
+        principals.invalidate_user(7)
+        set_cache(worker_b)
+        assert principals.get_cached_principal("sqlite:///one.db", 7) is None
+
+        principals.cache_principal("sqlite:///one.db", admin)
+        set_cache(worker_a)
+        principals.clear_principal_cache()
+        set_cache(worker_b)
+        assert principals.get_cached_principal("sqlite:///one.db", 7) is None
+    finally:
+        set_cache(None)
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import db as app_db
+from app.main import app
+from app.models.base import Base
+from app.models.entry import Entry
+from app.models.history_matrix_row import HistoryMatrixRow
+from app.models.reveal_snapshot import RevealSnapshot
+from app.models.user import User
+from app.models.week import Week
+
+
+@pytest.fixture()
+def databases(tmp_path, monkeypatch):
+    urls = {name: f"sqlite:///{tmp_path / name}.db" for name in ("primary", "replica")}
+    engines = {name: create_engine(url) for name, url in urls.items()}
+    for eng in engines.values():
+        Base.metadata.create_all(bind=eng)
+    monkeypatch.setenv("DATABASE_URL", urls["primary"])
+    monkeypatch.delenv("DATABASE_READ_URL", raising=False)
+    yield urls, {name: sessionmaker(bind=eng) for name, eng in engines.items()}
+    for eng in engines.values():
+        eng.dispose()
+
+
+def seed(Session, *rows):
+    with Session() as db:
+        db.add_all(rows)
+        db.commit()
+
+
+def _get(*paths):
+    async def go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            try:
+                return [await client.get(path) for path in paths]
+            finally:
+                await app_db.dispose_async_engine()
+
+    return asyncio.run(go())
+
+
+def test_reads_fall_back_to_the_primary_when_no_replica_is_configured(databases):
+    _urls, sessions = databases
+    seed(sessions["primary"], Week(id=1, season_year=2025, week_number=1))
+    assert app_db.read_replica_configured() is False
+    (resp,) = _get("/api/public/pre-reveal/1")
+    assert resp.json()["exists"] is True
+
+
+def test_public_reads_are_served_from_the_replica(databases, monkeypatch):
+    urls, sessions = databases
+    monkeypatch.setenv("DATABASE_READ_URL", urls["replica"])
+    # Only the replica knows this week, so a hit proves where the read went
+    seed(sessions["replica"], Week(id=1, season_year=2025, week_number=1))
+    app_db._read_pool_stats.reset()
+    app_db._async_read_pool_stats.reset()
+
+    (resp,) = _get("/api/public/pre-reveal/1")
+    assert resp.json()["exists"] is True
+    assert app_db._async_read_pool_stats.snapshot()["checkouts"] > 0
+    assert "read" in app_db.pool_stats()
+
+    db = next(app_db.get_read_db())
+    try:
+        with pytest.raises(OperationalError):
+            db.add(User(email="nope@example.com", hashed_password="x"))
+            db.commit()
+    finally:
+        db.close()
+
+
+def test_missing_snapshots_are_built_on_the_primary(databases, monkeypatch):
+    urls, sessions = databases
+    monkeypatch.setenv("DATABASE_READ_URL", urls["replica"])
+    locked = datetime.now(timezone.utc) - timedelta(hours=1)
+    for name in ("primary", "replica"):
+        seed(sessions[name], Week(id=1, season_year=2025, week_number=1, lock_time=locked))
+    # Replica-only matrix row: the history read stays on the replica
+    seed(sessions["replica"], User(id=1, email="lag@example.com", hashed_password="x"))
+    seed(sessions["replica"], Entry(id=1, user_id=1, week_id=1, name="Replica", season_year=2025, picks=[]))
+    seed(sessions["replica"], HistoryMatrixRow(entry_id=1, season_year=2025, entry_name="Replica", picks={}, pick_count=0, version=0))
+
+    snapshot, matrix = _get("/api/public/weeks/1/reveal-snapshot", "/api/history/matrix?season_year=2025")
+    assert snapshot.status_code == 200 and snapshot.headers["ETag"]
+    assert [e["entry_name"] for e in matrix.json()["entries"]] == ["Replica"]
+
+    count = select(func.count()).select_from(RevealSnapshot)
+    with sessions["primary"]() as db:
+        assert db.execute(count).scalar() == 1
+    with sessions["replica"]() as db:
+        assert db.execute(count).scalar() == 0
@@ -14,6 +14,7 @@ from app.models.week import Week
 from app.models.game import Game
 from app.models.team import Team
 from app.models.pick import Pick
+from app.services.reveal import get_latest_reveal_snapshot, refresh_reveal_snapshot
 
 
 client = TestClient(app)
@@ -107,3 +108,90 @@ def test_reveal_snapshot_nonexistent_week():
         assert j.get("exists") is False
     finally:
         teardown_db()
+
+
+def test_reveal_snapshot_is_stored_and_served_with_etag():
+    setup_db()
+    db = SessionLocal()
+    try:
+        week = Week(season_year=2025, week_number=2, lock_time=datetime.now(timezone.utc) - timedelta(minutes=1))
+        db.add(week)
+        db.commit()
+        db.refresh(week)
+
+        t1 = Team(abbreviation="E1", name="Etag 1")
+        t2 = Team(abbreviation="E2", name="Etag 2")
+        db.add_all([t1, t2])
+        db.commit()
+
+        g = Game(week_id=week.id, start_time=datetime.now(timezone.utc), home_team_abbr="E1", away_team_abbr="E2", status="in_progress")
+        db.add(g)
+        db.add_all([Pick(entry_id=1, week_id=week.id, team_id=t1.id), Pick(entry_id=2, week_id=week.id, team_id=t2.id)])
+        db.commit()
+
+        resp = client.get(f"/api/public/weeks/{week.id}/reveal-snapshot")
+        assert resp.status_code == 200
+        etag = resp.headers.get("etag")
+        assert etag
+        assert resp.json()["summary"]["losers"] == 0
+
+        # The first locked hit materializes version 1; revalidation is a bodyless 304
+        snap = get_latest_reveal_snapshot(db, week.id)
+        assert snap is not None and snap.version == 1
+        resp304 = client.get(f"/api/public/weeks/{week.id}/reveal-snapshot", headers={"If-None-Match": etag})
+        assert resp304.status_code == 304
+        assert resp304.content == b""
+
+        # Rebuilding without changes keeps the version; a result change bumps it
+        assert refresh_reveal_snapshot(db, week.id).version == 1
+        g.status = "final"
+        g.home_score = 10
+        g.away_score = 3
+        db.add(g)
+        refresh_reveal_snapshot(db, week.id)
+        db.commit()
+
+        resp2 = client.get(f"/api/public/weeks/{week.id}/reveal-snapshot", headers={"If-None-Match": etag})
+        assert resp2.status_code == 200
+        assert resp2.headers.get("etag") != etag
+        assert resp2.json()["summary"]["losers"] == 1
+        assert get_latest_reveal_snapshot(db, week.id).version == 2
+    finally:
+        db.close()
+        teardown_db()
+
+
+def test_reopened_week_does_not_serve_the_old_snapshot():
+    from app.routes.weeks import update_week
+    from app.schemas.weeks import WeekUpdate
+
+    def reschedule(week_id, lock_time):
+        update_week(week_id, WeekUpdate(lock_time=lock_time, ineligible_teams=None, locked_games=None, is_current=None), db=db, _admin=None)
+
+    setup_db()
+    db = SessionLocal()
+    try:
+        week = Week(season_year=2025, week_number=3, lock_time=datetime.now(timezone.utc) - timedelta(minutes=1), is_locked=True)
+        t1 = Team(abbreviation="R1", name="Reopen 1")
+        t2 = Team(abbreviation="R2", name="Reopen 2")
+        db.add_all([week, t1, t2])
+        db.commit()
+        db.add(Game(week_id=week.id, start_time=datetime.now(timezone.utc), home_team_abbr="R1", away_team_abbr="R2", status="scheduled"))
+        db.add(Pick(entry_id=1, week_id=week.id, team_id=t1.id))
+        db.commit()
+        first = client.get(f"/api/public/weeks/{week.id}/reveal-snapshot")
+        assert first.json()["summary"]["total_entries"] == 1
+
+        # Reopen, take another pick, then lock again
+        reschedule(week.id, datetime.now(timezone.utc) + timedelta(hours=1))
+        assert get_latest_reveal_snapshot(db, week.id) is None
+        db.add(Pick(entry_id=2, week_id=week.id, team_id=t2.id))
+        db.commit()
+        reschedule(week.id, datetime.now(timezone.utc) - timedelta(seconds=1))
+
+        again = client.get(f"/api/public/weeks/{week.id}/reveal-snapshot", headers={"If-None-Match": first.headers["etag"]})
+        assert again.status_code == 200
+        assert again.json()["summary"]["total_entries"] == 2
+    finally:
+        db.close()
+        teardown_db()
@@ -0,0 +1,141 @@
+import sys
+import os
+import uuid
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def use_temp_db(tmp_path):
+    """Set a unique DATABASE_URL per test to avoid locking and collisions."""
+    db_file = tmp_path / "test.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+    yield
+    os.environ.pop("DATABASE_URL", None)
+
+
+import app.models.user  # noqa: E402,F401
+import app.models.password_reset  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.entry import Entry  # noqa: E402
+from app.models.pick import Pick  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.week import Week  # noqa: E402
+from app.db import engine, SessionLocal  # noqa: E402
+from app.services.sync import transform_and_sync_games  # noqa: E402
+
+
+def _event(home, away, state, home_score=None, away_score=None, date="2025-09-14T17:00:00Z"):
+    return {
+        "date": date,
+        "status": {"type": {"state": state}},
+        "competitions": [{"competitors": [
+            {"homeAway": "away", "team": {"abbreviation": away}, "score": away_score},
+            {"homeAway": "home", "team": {"abbreviation": home}, "score": home_score},
+        ]}],
+    }
+
+
+def _seed(db):
+    Base.metadata.create_all(bind=engine)
+    week = Week(season_year=2025, week_number=3)
+    db.add(week)
+    db.commit()
+    abbrs = [f"Q{uuid.uuid4().hex[:3].upper()}" for _ in range(4)]
+    teams = [Team(abbreviation=a, name=a) for a in abbrs]
+    db.add_all(teams)
+    db.commit()
+    entries = [Entry(user_id=i, week_id=week.id, name=f"inc-{i}", season_year=2025, picks=[]) for i in range(4)]
+    db.add_all(entries)
+    db.commit()
+    picks = [Pick(entry_id=e.id, week_id=week.id, team_id=t.id) for e, t in zip(entries, teams)]
+    db.add_all(picks)
+    db.commit()
+    return week, teams, entries, picks
+
+
+def test_sync_resolves_only_games_that_went_final():
+    db = SessionLocal()
+    try:
+        week, teams, entries, picks = _seed(db)
+        a, b, c, d = [t.abbreviation for t in teams]
+
+        # Both games in progress: nothing resolved
+        raw = {"events": [_event(a, b, "in", 7, 3), _event(c, d, "in", 0, 0)]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert res["finalized_games"] == 0
+        assert all(db.get(Pick, p.id).result is None for p in picks)
+
+        # First game goes final: only its two picks are resolved
+        raw = {"events": [_event(a, b, "post", 21, 3), _event(c, d, "in", 0, 7)]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert res["finalized_games"] == 1
+        assert res["resolved_picks"] == 2
+        assert db.get(Pick, picks[0].id).result == "win"
+        assert db.get(Pick, picks[1].id).result == "loss"
+        assert db.get(Entry, entries[1].id).is_eliminated is True
+        assert db.get(Pick, picks[2].id).result is None
+        assert db.get(Entry, entries[2].id).is_eliminated is False
+
+        # Re-polling an already-final game does not resolve it again
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert res["finalized_games"] == 0
+
+        # Second game goes final
+        raw = {"events": [_event(a, b, "post", 21, 3), _event(c, d, "post", 10, 24)]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert res["finalized_games"] == 1
+        assert db.get(Pick, picks[2].id).result == "loss"
+        assert db.get(Pick, picks[3].id).result == "win"
+    finally:
+        db.close()
+
+
+def test_sync_can_skip_result_resolution():
+    db = SessionLocal()
+    try:
+        week, teams, entries, picks = _seed(db)
+        a, b = teams[0].abbreviation, teams[1].abbreviation
+        raw = {"events": [_event(a, b, "post", 21, 3)]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db, resolve_results=False)
+        assert res["finalized_games"] == 0
+        assert db.get(Pick, picks[0].id).result is None
+    finally:
+        db.close()
+
+
+def test_sync_upserts_by_natural_key_and_keeps_game_ids():
+    from app.models.game import Game
+
+    db = SessionLocal()
+    try:
+        week, teams, entries, picks = _seed(db)
+        a, b, c, d = [t.abbreviation for t in teams]
+
+        raw = {"events": [_event(a, b, "pre"), _event(c, d, "pre")]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert (res["created"], res["updated"], res["unchanged"], res["deleted"]) == (2, 0, 0, 0)
+        ids = {(g.home_team_abbr, g.away_team_abbr): g.id for g in db.query(Game).filter(Game.week_id == week.id)}
+        first = db.query(Game).filter(Game.id == ids[(a, b)]).one()
+        assert (first.home_team_id, first.away_team_id) == (teams[0].id, teams[1].id)
+
+        # Identical poll writes nothing
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert (res["created"], res["updated"], res["unchanged"], res["deleted"]) == (0, 0, 2, 0)
+
+        # A score change and a same-day kickoff move update in place
+        raw = {"events": [_event(a, b, "in", 7, 0), _event(c, d, "pre", date="2025-09-14T20:25:00Z")]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert (res["created"], res["updated"], res["unchanged"], res["deleted"]) == (0, 2, 0, 0)
+        after = {(g.home_team_abbr, g.away_team_abbr): g.id for g in db.query(Game).filter(Game.week_id == week.id)}
+        assert after == ids
+
+        # A game dropped from the feed is removed
+        raw = {"events": [_event(a, b, "in", 7, 0)]}
+        res = transform_and_sync_games(raw, year=2025, week=3, db=db)
+        assert (res["created"], res["updated"], res["unchanged"], res["deleted"]) == (0, 0, 1, 1)
+    finally:
+        db.close()
@@ -0,0 +1,154 @@
+import sys
+import os
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def use_temp_db(tmp_path):
+    """Set a unique DATABASE_URL per test to avoid locking and collisions."""
+    db_file = tmp_path / "test.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_file}"
+    yield
+    os.environ.pop("DATABASE_URL", None)
+
+
+from app.main import app  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.week import Week  # noqa: E402
+from app.db import engine, SessionLocal  # noqa: E402
+from app.services.espn_client import ScoreboardFetch  # noqa: E402
+from app.services.sync_scheduler import EspnPollScheduler, compute_poll_interval  # noqa: E402
+
+NOW = datetime(2025, 9, 14, 12, 0, tzinfo=timezone.utc)
+
+
+def test_interval_fast_inside_game_window():
+    games = [(NOW + timedelta(minutes=20), "scheduled"), (NOW + timedelta(hours=5), "scheduled")]
+    assert compute_poll_interval(games, NOW, 30, 900, 3600) == (30, "live")
+    assert compute_poll_interval([(NOW - timedelta(hours=6), "in_progress")], NOW, 30, 900, 3600) == (30, "live")
+
+
+def test_interval_waits_for_next_window_and_idles_when_final():
+    # Weekday: next kickoff days away -> slow cadence
+    assert compute_poll_interval([(NOW + timedelta(days=3), "scheduled")], NOW, 30, 900, 3600) == (900, "waiting")
+    # Window opens in 10 minutes -> wake up right when it does
+    interval, mode = compute_poll_interval([(NOW + timedelta(minutes=40), "scheduled")], NOW, 30, 900, 3600)
+    assert mode == "waiting" and interval == 600
+    # Everything final -> idle
+    assert compute_poll_interval([(NOW, "final"), (NOW, "final")], NOW, 30, 900, 3600) == (3600, "complete")
+    assert compute_poll_interval([], NOW, 30, 900, 3600) == (900, "no_games")
+
+
+def test_scheduler_polls_current_week_and_backs_off_on_errors():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    week = Week(season_year=2025, week_number=2, is_current=True)
+    db.add(week)
+    db.commit()
+    db.close()
+
+    calls = []
+    payload = {"events": [{
+        "date": "2025-09-14T17:00:00Z",
+        "status": {"type": {"state": "post"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "away", "team": {"abbreviation": "MIA"}, "score": 3},
+            {"homeAway": "home", "team": {"abbreviation": "NE"}, "score": 10},
+        ]}],
+    }]}
+
+    class FakeClient:
+        async def fetch_week(self, year, week):
+            calls.append((year, week))
+            if len(calls) == 1:
+                raise RuntimeError("espn down")
+            # Every poll after the first success reports an unchanged scoreboard
+            return ScoreboardFetch(payload, len(calls) == 2, 200, "h")
+
+        def commit(self, fetched):
+            pass
+
+        async def aclose(self):
+            pass
+
+    scheduler = EspnPollScheduler(client=FakeClient(), fast=0.01, slow=0.01, idle=0.01, max_backoff=0.01, jitter=0)
+
+    async def _run():
+        scheduler.start()
+        while scheduler.status()["skipped_unchanged"] < 1:
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    asyncio.run(_run())
+    status = scheduler.status()
+    assert calls[:3] == [(2025, 2)] * 3
+    assert status["running"] is False
+    assert status["mode"] == "complete"
+    assert status["last_result"]["created"] == 1
+    assert status["consecutive_failures"] == 0
+
+
+def test_failed_sync_is_retried_on_the_next_poll(monkeypatch):
+    import httpx
+
+    from app.services import sync_scheduler
+    from app.services.espn_client import AsyncEspnClient
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(Week(season_year=2025, week_number=3, is_current=True))
+    db.commit()
+    db.close()
+
+    def handler(request):
+        if request.headers.get("If-None-Match") == '"final"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"events": []}, headers={"ETag": '"final"'})
+
+    synced = []
+
+    def flaky_sync(raw, **kwargs):
+        synced.append(raw)
+        if len(synced) == 1:
+            raise RuntimeError("database is locked")
+        return {"created": 0}
+
+    monkeypatch.setattr(sync_scheduler, "transform_and_sync_games", flaky_sync)
+    client = AsyncEspnClient(base_url="http://espn.test/scoreboard", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    scheduler = EspnPollScheduler(client=client, fast=1, slow=1, idle=1)
+
+    async def _run():
+        with pytest.raises(RuntimeError):
+            await scheduler.poll_once()
+        # The failed sync left no validators behind, so this poll gets the full body again
+        await scheduler.poll_once()
+        # Now committed: ESPN answers 304 and the sync is skipped
+        await scheduler.poll_once()
+        await client.aclose()
+
+    asyncio.run(_run())
+    assert [json.loads(raw) for raw in synced] == [{"events": []}, {"events": []}]
+    assert scheduler.status()["skipped_unchanged"] == 1
+
+
+def test_status_endpoint_requires_token():
+    from app.core.config import settings
+
+    client = TestClient(app)
+    assert client.get("/internal/sync-games/status").status_code == 403
+    settings.INTERNAL_SYNC_TOKEN = "status-token"
+    try:
+        resp = client.get("/internal/sync-games/status", headers={"X-Internal-Sync-Token": "status-token"})
+        assert resp.status_code == 200
+        assert "mode" in resp.json() and "running" in resp.json()
+    finally:
+        settings.INTERNAL_SYNC_TOKEN = None
@@ -0,0 +1,95 @@
+import sys
+import os
+import io
+import json
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services.transformer import iter_games, transform_espn_response
+from app.utils.jsonstream import iter_array_items, iter_root_items
+
+
+def make_event(home_abbr, away_abbr, home_score=None, away_score=None, state="pre", note=""):
+    return {
+        "id": "401",
+        "name": f"{away_abbr} at {home_abbr} {note}",
+        "date": "2025-09-14T20:15:00Z",
+        "status": {"type": {"state": state, "completed": state == "post"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "away", "team": {"abbreviation": away_abbr}, "score": away_score},
+            {"homeAway": "home", "team": {"abbreviation": home_abbr}, "score": home_score},
+        ]}],
+    }
+
+
+def scoreboard():
+    return {
+        "leagues": [{"id": "28", "name": "National Football League", "season": {"year": 2025}}],
+        "week": {"number": 2},
+        "events": [
+            make_event("NE", "MIA", "10", "7", state="post", note="café — \U0001F3C8"),
+            {"date": "2025-09-14T20:15:00Z"},
+            make_event("wsh", "JAC", state="in"),
+            "not-an-event",
+            make_event("KC", "X"),
+        ],
+        "provider": {"name": "espn"},
+    }
+
+
+def test_streamed_bytes_match_decoded_dict_across_chunk_sizes():
+    raw = scoreboard()
+    body = json.dumps(raw, ensure_ascii=False).encode("utf-8")
+    expected = transform_espn_response(raw)
+    assert [(g["home_team_abbr"], g["away_team_abbr"], g["status"]) for g in expected] == [
+        ("NE", "MIA", "final"),
+        ("WAS", "JAX", "in_progress"),
+    ]
+    assert expected[0]["home_score"] == 10 and expected[0]["away_score"] == 7
+
+    assert transform_espn_response(body) == expected
+    assert transform_espn_response(body.decode("utf-8")) == expected
+    assert transform_espn_response(io.BytesIO(body)) == expected
+    # Tiny chunks split keys, numbers and multi-byte characters across boundaries
+    for size in (1, 3, 7, 64):
+        chunks = iter([body[i:i + size] for i in range(0, len(body), size)])
+        assert list(iter_games(chunks)) == expected
+
+
+def test_iter_array_items_is_lazy_and_ignores_trailing_keys():
+    body = b'{"events": [{"a": 1}, {"a": 2}] , "tail": ' + b"[" * 3
+    items = iter_array_items(body, "events", chunk_size=4)
+    assert next(items) == {"a": 1}
+    assert next(items) == {"a": 2}
+    with pytest.raises(StopIteration):
+        next(items)
+    assert list(iter_array_items(b'{"other": [1], "n": 12345}', "events", chunk_size=2)) == []
+    assert list(iter_array_items(b'{"events": {"x": 1}}', "events")) == []
+    assert list(iter_array_items(b"[1, 2]", "events")) == []
+
+
+def test_iter_root_items_streams_a_top_level_array():
+    body = json.dumps([{"email": "caf\u00e9@example.com"}, 12345, []], ensure_ascii=False).encode("utf-8")
+    for size in (1, 5, 64):
+        assert list(iter_root_items(io.BytesIO(body), chunk_size=size)) == [{"email": "caf\u00e9@example.com"}, 12345, []]
+    assert list(iter_root_items(b" [ ] ")) == []
+    for bad in (b'{"a": [1]}', b"[1, 2", b"[1] [2]"):
+        with pytest.raises(ValueError):
+            list(iter_root_items(bad))
+
+
+def test_truncated_payload_raises_instead_of_returning_no_games():
+    body = json.dumps(scoreboard()).encode("utf-8")
+    with pytest.raises(ValueError):
+        transform_espn_response(body[: len(body) // 2])
+    assert transform_espn_response(None) == []
+    assert transform_espn_response({"events": None}) == []
+
+
+def test_unhashable_state_falls_back_to_the_lenient_mapping():
+    raw = {"events": [make_event("NE", "MIA", state=["post"]), make_event("KC", "BUF", state={"name": "in"}), make_event("DAL", "NYG", state="POST")]}
+    assert [g["status"] for g in transform_espn_response(raw)] == ["scheduled", "scheduled", "final"]